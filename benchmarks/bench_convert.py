@@ -0,0 +1,88 @@
+"""
+Compare per-value literal conversion (`BindingsBase.convert_value`) with the bulk column conversion
+(`BindingsBase.convert_values`, `BindingSetFrame.convert`) on a binding set of double, decimal and dateTime values.
+
+    python benchmarks/bench_convert.py --rows 100000
+"""
+import argparse
+import os
+import sys
+import time
+from decimal import Decimal
+from typing import Optional
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+os.environ.setdefault("KE_KI_CONFIG_PATH", os.path.join(BENCH_DIR, "ke_config.yml"))
+os.environ.setdefault("KE_KNOWLEDGE_BASE_ID", "http://bench.example.org")
+
+from rdflib import URIRef, Literal  # noqa: E402
+
+from ke_client import configure_ki, ki_object, BindingsBase, BindingSetFrame  # noqa: E402
+
+XSD = "http://www.w3.org/2001/XMLSchema#"
+
+
+def binding_set(rows: int):
+    return [{"ts_uri": f"<http://example.org/ts/{i % 100}>",
+             "value": f'"{i * 0.25}"^^<{XSD}double>' if i % 50 else "<http://www.w3.org/1999/02/22-rdf-syntax-ns#nil>",
+             "price": f'"{i % 1000}.{i % 100:02d}"^^<{XSD}decimal>',
+             "timestamp": f'"2024-01-{1 + i % 28:02d}T{i % 24:02d}:{i % 60:02d}:00+00:00"^^<{XSD}dateTime>'}
+            for i in range(rows)]
+
+
+def timed(fn):
+    t = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - t
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100000)
+    args = parser.parse_args()
+    configure_ki()
+
+    @ki_object("dp-price")
+    class DataPoint(BindingsBase):
+        ts_uri: URIRef
+        value: Optional[Literal] = None
+        price: Literal
+        timestamp: Literal
+
+    rows = binding_set(args.rows)
+    objects = DataPoint.codec().from_wire_many(rows, validate=False)
+    frame = BindingSetFrame.from_binding_set(rows)
+    convert_value = BindingsBase.convert_value
+
+    cases = [
+        ("value", "python", lambda: [convert_value(o.value, float) for o in objects]),
+        ("price", "decimal", lambda: [convert_value(o.price, Decimal) for o in objects]),
+        ("timestamp", "python", lambda: [convert_value(o.timestamp, lambda v: v) for o in objects]),
+    ]
+    try:
+        import numpy as np
+        cases += [
+            ("value", "float64", lambda: np.array([convert_value(o.value, float) for o in objects], dtype=np.float64)),
+            ("timestamp", "datetime64", lambda: np.array([convert_value(o.timestamp, lambda v: v.replace(tzinfo=None))
+                                                          for o in objects], dtype="datetime64[us]")),
+        ]
+    except ImportError:
+        print("numpy not installed, skipping float64/datetime64")
+
+    print(f"{args.rows} rows, throughput in rows/s")
+    print(f"{'column':<10} {'to':<11} {'convert_value':>14} {'convert_values':>15} {'frame.convert':>14}")
+    for attr, to, per_value in cases:
+        expected, t_per_value = timed(per_value)
+        bulk, t_bulk = timed(lambda: BindingsBase.convert_values(objects, attr, to))
+        columnar, t_frame = timed(lambda: frame.convert(attr, to))
+        if to in ("float64", "datetime64"):
+            assert np.array_equal(bulk, expected, equal_nan=True) and np.array_equal(columnar, expected, equal_nan=True)
+        else:
+            assert bulk == expected and columnar == expected, attr
+        print(f"{attr:<10} {to:<11} {args.rows / t_per_value:>14.0f} {args.rows / t_bulk:>15.0f} "
+              f"{args.rows / t_frame:>14.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Measure `configure_ki` on a generated pattern repository (main config including many pattern files): full YAML
+pipeline with sequential and concurrent include loading (`ki_config_load_workers`) vs. the compiled snapshot
+(`ki_config_cache_dir`).
+
+    python benchmarks/bench_ki_config.py --includes 50 --patterns 20
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("KE_KNOWLEDGE_BASE_ID", "http://bench.example.org")
+
+import ke_client  # noqa: E402
+
+PREFIXES = """  prefixes:
+    kb: "${KB_ID}/"
+    s4ener: "https://saref.etsi.org/saref4ener/"
+    saref: "https://saref.etsi.org/core/"
+"""
+
+
+def write_repository(root: str, includes: int, patterns: int) -> str:
+    include_files = []
+    for i in range(includes):
+        path = os.path.join(root, f"patterns-{i}.yml")
+        lines = ["knowledge_engine:", '  kb_name: "bench"', '  kb_description: ""', PREFIXES.rstrip(),
+                 "  graph_patterns:"]
+        for j in range(patterns):
+            name = f"gp-{i}-{j}"
+            lines += [f"    {name}:", f'      name: "{name}"', "      pattern:",
+                      "        - ' ?ts_uri rdf:type s4ener:TimeSeries ; saref:hasValue ?value ; '",
+                      "        - ' saref:hasTimestamp ?timestamp ; s4ener:producedBy <${KB_ID}> . '",
+                      "      result_pattern:",
+                      "        - ' ?ts_uri s4ener:hasUsage ?ts_usage ; s4ener:hasCreationTime ?time_create . '"]
+        with open(path, "w") as f:
+            f.write("\n".join(lines) + "\n")
+        include_files.append(path)
+    main_path = os.path.join(root, "ke_config.yml")
+    with open(main_path, "w") as f:
+        f.write("knowledge_engine:\n  kb_name: \"bench\"\n  kb_description: \"\"\n" + PREFIXES + "  include:\n" +
+                "".join(f"    - \"{p}\"\n" for p in include_files))
+    return main_path
+
+
+def timed_configure(runs: int) -> float:
+    best = None
+    for _ in range(runs):
+        t = time.perf_counter()
+        conf = ke_client.configure_ki()
+        for gp in conf.graph_patterns.values():
+            # derived values used by the decorators
+            _ = gp.pattern_var_set, gp.result_pattern_var_set, gp.pattern_triples
+        elapsed = time.perf_counter() - t
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--includes", type=int, default=50)
+    parser.add_argument("--patterns", type=int, default=20, help="graph patterns per included file")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=4, help="concurrent include loading workers")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        ke_client.ke_settings.ki_config_path = write_repository(root, args.includes, args.patterns)
+        ke_client.ke_settings.ki_config_cache_dir = None
+        ke_client.ke_settings.ki_config_load_workers = 1
+        t_full = timed_configure(args.runs)
+        ke_client.ke_settings.ki_config_load_workers = args.workers
+        t_concurrent = timed_configure(args.runs)
+        slowest = sorted(ke_client.ki_conf_load_timings.items(), key=lambda item: -item[1])[:3]
+        ke_client.ke_settings.ki_config_cache_dir = os.path.join(root, "cache")
+        # first run writes the snapshot
+        t_cold = timed_configure(1)
+        t_snapshot = timed_configure(args.runs)
+
+    total = args.includes * args.patterns
+    print(f"{args.includes} included files, {total} graph patterns, best of {args.runs} in ms")
+    print(f"{'full':>10} {f'{args.workers} workers':>10} {'snapshot write':>15} {'snapshot':>10}")
+    print(f"{t_full * 1000:>10.1f} {t_concurrent * 1000:>10.1f} {t_cold * 1000:>15.1f} {t_snapshot * 1000:>10.1f}")
+    print("slowest files: " + ", ".join(f"{os.path.basename(p)} {t * 1000:.1f} ms" for p, t in slowest))
+
+
+if __name__ == "__main__":
+    main()
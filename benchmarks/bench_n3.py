@@ -0,0 +1,62 @@
+"""
+Compare the KE N3 parser/formatter (`parse_n3`, `format_n3`) with rdflib (`from_n3`, `Node.n3()`)
+on the binding value shapes exchanged with the KE.
+
+    python benchmarks/bench_n3.py --values 100000
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rdflib.util import from_n3  # noqa: E402
+
+from ke_client import parse_n3, format_n3  # noqa: E402
+
+XSD = "http://www.w3.org/2001/XMLSchema#"
+
+SHAPES = {
+    "iri": lambda i: f"<http://example.org/ts/{i}>",
+    "double": lambda i: f'"{i * 0.25}"^^<{XSD}double>',
+    "dateTime": lambda i: f'"2024-01-01T{i % 24:02d}:{i % 60:02d}:00+00:00"^^<{XSD}dateTime>',
+    "integer": lambda i: f'"{i}"^^<{XSD}integer>',
+    "string": lambda i: f'"value {i}"',
+    "lang": lambda i: f'"value {i}"@en',
+    "rdf:nil": lambda i: "rdf:nil",
+}
+
+
+def timed(fn, values) -> float:
+    t = time.perf_counter()
+    for v in values:
+        fn(v)
+    return time.perf_counter() - t
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--values", type=int, default=50000, help="values per shape")
+    args = parser.parse_args()
+
+    print(f"{args.values} values per shape, times in ms")
+    print(f"{'shape':<10} {'from_n3':>9} {'parse_n3':>9} {'speedup':>8} {'n3()':>9} {'format_n3':>10} {'speedup':>8}")
+    for shape, make in SHAPES.items():
+        values = [make(i) for i in range(args.values)]
+        nodes = [from_n3(v) for v in values]
+        # same terms and the same wire format as rdflib
+        assert [parse_n3(v) for v in values] == nodes, shape
+        assert all(type(a) is type(b) for a, b in zip(map(parse_n3, values), nodes)), shape
+        assert [format_n3(node) for node in nodes] == [node.n3() for node in nodes], shape
+
+        t_from_n3 = timed(from_n3, values)
+        t_parse_n3 = timed(parse_n3, values)
+        t_n3 = timed(lambda node: node.n3(), nodes)
+        t_format_n3 = timed(format_n3, nodes)
+        print(f"{shape:<10} {t_from_n3 * 1000:>9.1f} {t_parse_n3 * 1000:>9.1f} {t_from_n3 / t_parse_n3:>7.1f}x "
+              f"{t_n3 * 1000:>9.1f} {t_format_n3 * 1000:>10.1f} {t_n3 / t_format_n3:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Compare the per-call `ki_split_uri` parse/build path (pattern string matched with `re.match`, fields converted with
+`convert`, validated constructor, `string.Template` build) with the compiled `UriTemplate` (`parse_many`,
+`build_many`, LRU cache) on datapoint URIs.
+
+    python benchmarks/bench_split_uri.py --uris 100000
+"""
+import argparse
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ke_client import SplitURIBase, ki_split_uri  # noqa: E402
+from ke_client.client._split_uri import convert  # noqa: E402
+
+PREFIX = "http://bench.example.org"
+
+
+@ki_split_uri(uri_template="ts/${range_id}/${ts}/${period_minutes}/${idx}")
+class DataPointURI(SplitURIBase):
+    range_id: int
+    ts: int
+    period_minutes: int
+    idx: int
+
+
+@ki_split_uri(uri_template="ts/${range_id}/${ts}/${period_minutes}/${idx}", cache_size=10000)
+class CachedDataPointURI(SplitURIBase):
+    range_id: int
+    ts: int
+    period_minutes: int
+    idx: int
+
+
+def per_call_parse(parser, uri: str, prefix: str):
+    # parse path before the template was compiled
+    prefix = prefix + "/"
+    uri = str(uri)[len(prefix):]
+    matched_args = re.match(parser.__uri_pattern__, uri)
+    kwargs = {k: convert(v, parser.__obj_attr__[k]) for k, v in matched_args.groupdict().items()
+              if k in parser.__obj_attr_keys__}
+    return parser.__uri_obj_class__(uri=uri, uri_template=parser.uri_template, prefix=prefix, **kwargs)
+
+
+def per_call_build(parser, obj, prefix: str) -> str:
+    uri_dict = {k: v for k, v in vars(obj).items() if k in parser.__partial_uri_keys__}
+    for k, v in uri_dict.items():
+        if "/" in str(v):
+            raise ValueError(k)
+    return prefix + parser.__uri_builder__(uri_dict)
+
+
+def timed(fn):
+    t = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - t
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--uris", type=int, default=100000)
+    parser.add_argument("--distinct", type=int, default=1000, help="distinct URIs (repeated for the cached parse)")
+    args = parser.parse_args()
+
+    uris = [f"{PREFIX}/ts/1/{2765186582000 + (i % args.distinct) * 60000}/60/{i % 4}" for i in range(args.uris)]
+    template = DataPointURI.__uri_template_parser__
+
+    expected, t_per_call = timed(lambda: [per_call_parse(template, uri, PREFIX) for uri in uris])
+    parsed, t_many = timed(lambda: DataPointURI.parse_many(uris, prefix=PREFIX))
+    cached, t_cached = timed(lambda: CachedDataPointURI.parse_many(uris, prefix=PREFIX))
+    assert parsed == expected and [o.model_dump() for o in cached] == [o.model_dump() for o in expected]
+
+    prefix = PREFIX + "/"
+    built_expected, t_build_per_call = timed(lambda: [per_call_build(template, obj, prefix) for obj in parsed])
+    built, t_build_many = timed(lambda: DataPointURI.build_many(parsed))
+    assert built == built_expected == uris
+
+    print(f"{args.uris} URIs ({args.distinct} distinct), throughput in URIs/s")
+    print(f"{'op':<6} {'per call':>10} {'*_many':>10} {'cached':>10}")
+    print(f"{'parse':<6} {args.uris / t_per_call:>10.0f} {args.uris / t_many:>10.0f} {args.uris / t_cached:>10.0f}")
+    print(f"{'build':<6} {args.uris / t_build_per_call:>10.0f} {args.uris / t_build_many:>10.0f} {'-':>10}")
+    print(f"cache: {CachedDataPointURI.__uri_template_parser__.cache_stats()}")
+
+
+if __name__ == "__main__":
+    main()
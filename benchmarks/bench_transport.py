@@ -0,0 +1,98 @@
+"""
+Compare HTTP transports of KEClient against the stand-in KE server (`ke_stub.py`):
+sequential ASK latency and concurrent ASK throughput (`ask_many`).
+
+    python benchmarks/bench_transport.py --requests 500 --rows 100
+"""
+import argparse
+import logging
+import os
+import statistics
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+
+import ke_stub  # noqa: E402
+
+
+def build_client(endpoint: str, transport_name: str, kb_suffix: str):
+    from ke_client import KEClient, configure_ki, build_transport
+    ki = configure_ki()
+    client = KEClient(kb_id=f"http://bench.example.org/{kb_suffix}", kb_name=ki.kb_name, ke_rest_endpoint=endpoint,
+                      kb_description=ki.kb_description, prefixes=ki.prefixes,
+                      transport=build_transport(transport_name, pool_size=32))
+
+    @client.ask("dp")
+    def ask_dp(ts_uri: str):
+        return [{"ts_uri": f"<{ts_uri}>"}]
+
+    client.register()
+    client.start()
+    return client, ask_dp
+
+
+def run(transport_name: str, endpoint: str, n_requests: int, concurrency: int):
+    client, ask_dp = build_client(endpoint=endpoint, transport_name=transport_name,
+                                  kb_suffix=transport_name.replace("-", "_"))
+    try:
+        for _ in range(20):
+            ask_dp("http://example.org/ts/1")
+        latencies = []
+        for _ in range(n_requests):
+            t = time.perf_counter()
+            ask_dp("http://example.org/ts/1")
+            latencies.append((time.perf_counter() - t) * 1000.0)
+        bindings = [[{"ts_uri": f"<http://example.org/ts/{i}>"}] for i in range(n_requests)]
+        t = time.perf_counter()
+        results = client.ask_many("dp", bindings, max_concurrency=concurrency)
+        elapsed = time.perf_counter() - t
+        failed = sum(1 for r in results if not r.ok)
+        latencies.sort()
+        return {
+            "p50_ms": statistics.median(latencies),
+            "p99_ms": latencies[int(len(latencies) * 0.99) - 1],
+            "seq_rps": n_requests / (sum(latencies) / 1000.0),
+            "conc_rps": n_requests / elapsed,
+            "failed": failed,
+        }
+    finally:
+        client.stop()
+        client.transport.close()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--rows", type=int, default=10, help="bindings returned by each ASK")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--transports", default="requests,urllib3,httpx,httpx-http2")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+
+    server, state = ke_stub.serve()
+    state.ask_rows = args.rows
+    endpoint = f"http://127.0.0.1:{server.server_address[1]}/rest/"
+    os.environ["KE_KI_CONFIG_PATH"] = os.path.join(BENCH_DIR, "ke_config.yml")
+    os.environ["KE_KNOWLEDGE_BASE_ID"] = "http://bench.example.org"
+    os.environ["KE_REST_ENDPOINT"] = endpoint
+
+    print(f"{args.requests} ASK requests, {args.rows} rows, concurrency {args.concurrency}")
+    print(f"{'transport':<12} {'p50 ms':>8} {'p99 ms':>8} {'seq req/s':>10} {'conc req/s':>11} {'failed':>7}")
+    for transport_name in args.transports.split(","):
+        try:
+            result = run(transport_name=transport_name, endpoint=endpoint, n_requests=args.requests,
+                         concurrency=args.concurrency)
+        except ImportError as err:
+            print(f"{transport_name:<12} skipped: {err}")
+            continue
+        print(f"{transport_name:<12} {result['p50_ms']:>8.2f} {result['p99_ms']:>8.2f} {result['seq_rps']:>10.0f} "
+              f"{result['conc_rps']:>11.0f} {result['failed']:>7}")
+    server.shutdown()
+    # the stub speaks HTTP/1.1, `httpx-http2` falls back to HTTP/1.1 against it (multiplexing needs a TLS/h2 server)
+
+
+if __name__ == "__main__":
+    main()
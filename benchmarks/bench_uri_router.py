@@ -0,0 +1,72 @@
+"""
+Compare routing URIs to their `@ki_split_uri` class by trying `parse` of each class (catching `ValueError`) with
+`SplitURIRouter.route_many` on a registry of hundreds of templates.
+
+    python benchmarks/bench_uri_router.py --templates 300 --uris 20000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ke_client import SplitURIBase, SplitURIRouter, ki_split_uri  # noqa: E402
+
+PREFIX = "http://bench.example.org"
+KINDS = ["ts", "interval", "tou", "market", "offer"]
+
+
+def uri_classes(templates: int):
+    classes = []
+    for i in range(templates):
+        kind = KINDS[i % len(KINDS)]
+        fields = ["range_id", "ts", "period_minutes", "idx"][:1 + i % 4]
+        template = f"{kind}/v{i}/" + "/".join("${" + f + "}" for f in fields)
+        cls = type(f"URI{i}", (SplitURIBase,), {"__annotations__": {f: int for f in fields}})
+        classes.append(ki_split_uri(uri_template=template)(cls))
+    return classes
+
+
+def try_each(classes, uri: str, prefix: str):
+    for cls in classes:
+        try:
+            return cls.parse(uri, prefix=prefix)
+        except ValueError:
+            continue
+    raise ValueError(uri)
+
+
+def timed(fn):
+    t = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - t
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--templates", type=int, default=300)
+    parser.add_argument("--uris", type=int, default=20000)
+    args = parser.parse_args()
+
+    classes = uri_classes(args.templates)
+    router = SplitURIRouter(classes)
+    rnd = random.Random(1)
+    uris = []
+    for _ in range(args.uris):
+        cls = rnd.choice(classes)
+        values = {k: rnd.randrange(1, 2765186582000) for k in cls.model_fields}
+        uris.append(cls(prefix=PREFIX, **values).uri)
+
+    expected, t_each = timed(lambda: [try_each(classes, uri, PREFIX) for uri in uris])
+    routed, t_router = timed(lambda: router.route_many(uris, prefix=PREFIX))
+    assert [type(o) for o in routed] == [type(o) for o in expected] and routed == expected
+
+    print(f"{args.templates} templates, {args.uris} URIs, throughput in URIs/s")
+    print(f"{'try parse':>10} {'router':>10}")
+    print(f"{args.uris / t_each:>10.0f} {args.uris / t_router:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""
+Stand-in KE server for the benchmarks: in-memory smart connectors and knowledge interactions,
+ASK/POST return generated bindings, `sc/handle` serves queued handle requests.
+
+    python benchmarks/ke_stub.py --port 8280
+"""
+import argparse
+import json
+import queue
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+XSD = "http://www.w3.org/2001/XMLSchema#"
+
+
+class KEStubState:
+    def __init__(self):
+        self.kbs = {}
+        # kb_id -> {ki_id: registration body}
+        self.kis = {}
+        self.handle_queues = {}
+        self.counter = 0
+        self.lock = threading.Lock()
+        # rows returned by `sc/ask`
+        self.ask_rows = 3
+        # server delay of ASK/POST requests in seconds
+        self.delay = 0.0
+        self.handled = []
+        self._ask_cache = {}
+
+    def ask_body(self) -> bytes:
+        rows = self.ask_rows
+        if rows not in self._ask_cache:
+            binding_set = [{"ts_uri": f"<http://example.org/ts/1/{i}>",
+                            "value": f'"{i}.5"^^<{XSD}double>',
+                            "timestamp": f'"2025-01-01T00:{i % 60:02d}:00+00:00"^^<{XSD}dateTime>'}
+                           for i in range(rows)]
+            self._ask_cache = {rows: json.dumps({"bindingSet": [], "exchangeInfo": [
+                {"bindingSet": binding_set, "knowledgeBaseId": "http://other.example.org",
+                 "knowledgeInteractionId": "http://other.example.org/interaction/answer-dp",
+                 "exchangeStart": "2025-12-18T18:23:24.574+00:00", "exchangeEnd": "2025-12-18T18:23:24.584+00:00",
+                 "status": "SUCCEEDED", "initiator": "knowledgeBase"}]}).encode()}
+        return self._ask_cache[rows]
+
+
+class KEStubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # headers and body are written separately, avoid Nagle/delayed ACK stalls
+    disable_nagle_algorithm = True
+    state: KEStubState
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, code, obj=None, body: bytes = None):
+        if body is None:
+            body = b"" if obj is None else json.dumps(obj).encode()
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _body(self):
+        n = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(n)) if n else None
+
+    def _path(self):
+        return self.path.split("/rest/", 1)[1].rstrip("/")
+
+    def do_GET(self):
+        state = self.state
+        kb = self.headers.get("Knowledge-Base-Id")
+        path = self._path()
+        if path == "sc/ki":
+            if kb not in state.kbs:
+                return self._send(404, {"message": "Smart connector not found, because its ID is unknown."})
+            return self._send(200, [dict(knowledgeInteractionId=k, communicativeAct={}, **v)
+                                    for k, v in state.kis[kb].items()])
+        if path == "sc":
+            return self._send(200, [{"knowledgeBaseId": k, "knowledgeBaseName": v["knowledgeBaseName"],
+                                     "reasonerLevel": 1} for k, v in state.kbs.items()])
+        if path == "sc/handle":
+            try:
+                item = state.handle_queues.setdefault(kb, queue.Queue()).get(timeout=0.5)
+            except queue.Empty:
+                return self._send(202, {"message": "repoll"})
+            return self._send(200, item)
+        self._send(404, {"message": f"Unknown path: {path}"})
+
+    def do_PUT(self):
+        kb = self.headers.get("Knowledge-Base-Id")
+        if self._path() == "sc/lease/renew":
+            if kb not in self.state.kbs:
+                return self._send(404, {"message": "Smart connector not found, because its ID is unknown."})
+            return self._send(200, {"knowledgeBaseId": kb, "expires": "2030-01-01T00:00:00Z"})
+        self._send(404, {"message": f"Unknown path: {self._path()}"})
+
+    def do_DELETE(self):
+        kb = self.headers.get("Knowledge-Base-Id")
+        if self._path() == "sc":
+            self.state.kbs.pop(kb, None)
+            self.state.kis.pop(kb, None)
+            return self._send(200)
+        ki_id = self.headers.get("Knowledge-Interaction-Id")
+        self.state.kis.get(kb, {}).pop(ki_id, None)
+        self._send(200)
+
+    def do_POST(self):
+        state = self.state
+        kb = self.headers.get("Knowledge-Base-Id")
+        path = self._path()
+        body = self._body()
+        if path == "sc":
+            state.kbs[body["knowledgeBaseId"]] = body
+            state.kis[body["knowledgeBaseId"]] = {}
+            return self._send(200)
+        if path == "sc/ki":
+            with state.lock:
+                state.counter += 1
+                ki_id = f"{kb}/interaction/{body['knowledgeInteractionName']}-{state.counter}"
+            state.kis[kb][ki_id] = body
+            return self._send(200, {"knowledgeInteractionId": ki_id})
+        if state.delay:
+            time.sleep(state.delay)
+        if path == "sc/ask":
+            return self._send(200, body=state.ask_body())
+        if path == "sc/post":
+            binding_set = body["bindingSet"] if isinstance(body, dict) else body
+            return self._send(200, {"resultBindingSet": [], "exchangeInfo": [
+                {"argumentBindingSet": binding_set, "resultBindingSet": [], "knowledgeBaseId": "http://other.example.org",
+                 "knowledgeInteractionId": "http://other.example.org/interaction/react-dp",
+                 "exchangeStart": "2025-12-18T18:23:24.574+00:00", "status": "SUCCEEDED"}]})
+        if path == "sc/handle":
+            state.handled.append(body)
+            return self._send(200)
+        self._send(404, {"message": f"Unknown path: {path}"})
+
+
+def serve(port: int = 0, state: KEStubState = None):
+    """
+    start the stub server in a background thread
+    :return: (server, state), REST endpoint: f"http://127.0.0.1:{server.server_address[1]}/rest/"
+    """
+    state = KEStubState() if state is None else state
+    handler = type("Handler", (KEStubHandler,), {"state": state})
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, state
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=8280)
+    parser.add_argument("--ask-rows", type=int, default=3)
+    args = parser.parse_args()
+    _server, _state = serve(port=args.port)
+    _state.ask_rows = args.ask_rows
+    print(f"KE stub: http://127.0.0.1:{args.port}/rest/")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        _server.shutdown()
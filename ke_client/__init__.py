@@ -3,11 +3,17 @@ from typing import Dict, Optional
 from .utils import load_yml_obj
 from .client import ki_object, SplitURIBase, ki_split_uri, rdf_nil, is_nil, BindingsBase, KITypeError, KIError, \
     KESettings, KnowledgeInteractionConfig, KEClient, OptionalLiteral, OptionalURIRef, KIHolder, TargetedBindings, \
-    KERestClient
+    KERestClient, KEHttpPool, AsyncKEClient, AsyncKIHolder, KIBatchResult, KIChunkedPostResponse, PostChunking, \
+    BindingSetView, RetryPolicy, CircuitBreaker, CircuitOpenError, KETransport, RequestsTransport, Urllib3Transport, \
+    HttpxTransport, build_transport, KELeaseRenewer, LeaseLostError, BindingsCodec, BindingSetFrame, \
+    N3TermCache, get_term_cache, parse_n3, format_n3, convert_literals, \
+    KIValidationPlan, BindingsMismatchCheck, SplitURIRouter, get_split_uri_router
 from .gp_ext import is_uri_default
 
 ke_settings = KESettings()
 ki_conf: Optional[KnowledgeInteractionConfig] = None
+# load time in seconds of the KI config files read by the last `configure_ki`, empty if loaded from the snapshot
+ki_conf_load_timings: Dict[str, float] = {}
 
 
 def configure_ke_client(yml_config_path: str):
@@ -31,6 +37,7 @@ def configure_ki():
     import ke_client.ke_vars as ke_vars
     global ki_conf
     global ke_settings
+    global ki_conf_load_timings
 
     ki_conf_file = ke_settings.ki_config_path if ke_settings.ki_config_path is not None else ke_vars.KI_CONFIG_PATH
     import os
@@ -40,46 +47,27 @@ def configure_ki():
             f"KI config file: '{ki_conf_file}' does not exist. " +
             "Set ke_client.KI_CONFIG_PATH or KI_CONFIG_PATH env variable ")
 
-    _ki_conf = load_yml_obj(ki_conf_file, section=KnowledgeInteractionConfig.__SECTION__, settings_constructor=dict,
-                            file_vars=ke_settings.get_ki_vars())
-    ki_conf = KnowledgeInteractionConfig.model_validate(_ki_conf)
-    if "include" in _ki_conf:
-        from ke_client.ki_model import GraphPattern
-        graph_patterns: Dict[str, GraphPattern] = {}
-        prefixes = {}
+    file_vars = ke_settings.get_ki_vars()
+    config_cache = None
+    cache_key = None
+    if ke_settings.ki_config_cache_dir is not None:
+        from .client._ki_config_cache import KIConfigCache
+        config_cache = KIConfigCache(cache_dir=ke_settings.ki_config_cache_dir)
+        cache_key = config_cache.key(ki_conf_file, file_vars=file_vars)
+        cached_ki_conf = config_cache.load(cache_key)
+        if cached_ki_conf is not None:
+            ki_conf = cached_ki_conf
+            # no config file read
+            ki_conf_load_timings = {}
+            return ki_conf
 
-        # ki_vars
-        def include(include_file_path: str):
-            included_yml = load_yml_obj(include_file_path, section=KnowledgeInteractionConfig.__SECTION__,
-                                        settings_constructor=dict, file_vars=ke_settings.get_ki_vars())
-            included_conf = KnowledgeInteractionConfig.model_validate(included_yml)
-            for k in included_conf.graph_patterns_safe().keys():
-                if k in graph_patterns.keys():
-                    raise Exception(f"Duplicate graph pattern key: '{k}'.")
-            graph_patterns.update(included_conf.graph_patterns_safe())
-            prefixes.update(included_conf.prefixes_safe())
-
-        if type(_ki_conf["include"]) is list:
-            for include_file in _ki_conf["include"]:
-                include(include_file)
-                # included_yml = load_yml_obj(include_file, section=KnowledgeInteractionConfig.__SECTION__,
-                #                             settings_constructor=dict, file_vars=ke_settings.get_ki_vars())
-                # included_conf = KnowledgeInteractionConfig.model_validate(included_yml)
-                # graph_patterns.update(included_conf.graph_patterns_safe())
-                # prefixes.update(included_conf.prefixes_safe())
-        else:
-            include(_ki_conf["include"])
-            # included_yml = load_yml_obj(_ki_conf["include"], section=KnowledgeInteractionConfig.__SECTION__,
-            #                             settings_constructor=dict, file_vars=ke_settings.get_ki_vars())
-            # included_conf = KnowledgeInteractionConfig.model_validate(included_yml)
-            # graph_patterns.update(included_conf.graph_patterns_safe())
-            # prefixes.update(included_conf.prefixes_safe())
-        if len(prefixes) > 0:
-            prefixes.update(ki_conf.prefixes_safe())
-            ki_conf.prefixes = prefixes
-        if len(graph_patterns) > 0:
-            graph_patterns.update(ki_conf.graph_patterns_safe())
-            ki_conf.graph_patterns = graph_patterns
+    from .client._ki_config_loader import KIConfigLoader
+    config_loader = KIConfigLoader(file_vars=file_vars, workers=ke_settings.ki_config_load_workers)
+    ki_conf = config_loader.load(ki_conf_file)
+    ki_conf_load_timings = config_loader.timings
     for gp in ki_conf.graph_patterns.values():
         gp.set_default_prefix(default_prefixes=ki_conf.prefixes)
+        gp.freeze()
+    if config_cache is not None:
+        config_cache.save(cache_key, ki_conf, include_files=config_loader.include_files)
     return ki_conf
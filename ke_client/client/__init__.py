@@ -1,9 +1,25 @@
 from ._ki_utils import ki_object
 from ._split_uri import SplitURIBase, ki_split_uri
+from ._uri_router import SplitURIRouter, get_split_uri_router
 from ._rdf_utils import rdf_nil, is_nil
 from ._ki_exceptions import KITypeError, KIError, PatternError
-from ._ki_bindings import BindingsBase, TargetedBindings
+from ._ki_bindings import BindingsBase, TargetedBindings, BindingSetView
+from ._ki_codec import BindingsCodec
+from ._ki_frame import BindingSetFrame
+from ._ki_convert import convert_literals
+from ._ki_validation import KIValidationPlan
+from ._ki_mismatch import BindingsMismatchCheck
+from ._term_cache import N3TermCache, get_term_cache
+from ._n3 import parse_n3, format_n3
 from ._ke_properties import KESettings, KnowledgeInteractionConfig
 from ._client import KEClient, OptionalLiteral, OptionalURIRef
 from ._ki_holder import KIHolder
+from ._async_ki_holder import AsyncKIHolder
+from ._async_client import AsyncKEClient
 from ._rest_client import KERestClient
+from ._http_pool import KEHttpPool
+from ._batch import KIBatchResult
+from ._post_chunks import KIChunkedPostResponse, PostChunking
+from ._retry import RetryPolicy, CircuitBreaker, CircuitOpenError
+from ._lease import KELeaseRenewer, LeaseLostError
+from ._transport import KETransport, RequestsTransport, Urllib3Transport, HttpxTransport, build_transport
@@ -0,0 +1,364 @@
+import asyncio
+import logging
+from typing import Optional, Set, Any, Callable, Awaitable, Dict, Sequence, Union, List
+
+from ke_client.client._async_ki_holder import AsyncKIHolder, _await_if_needed
+from ke_client.client._batch import KIBatchResult, run_batch_async
+from ke_client.client._client import KEClient, KIBindings
+from ke_client.client._ke_request_client import KERequest
+from ke_client.client._ki_bindings import TargetedBindings
+from ke_client.client._ki_holder import KIHolder
+from ke_client.client._transport import httpx_connection_errors
+from ke_client.ki_model import KIPostResponse, KIAskResponse, KnowledgeInteractionType
+from ke_client.utils.enum_utils import EnumItem
+
+
+class AsyncKEClient(AsyncKIHolder, KEClient):
+    """
+    asyncio KE client: ASK/POST are coroutines, the `sc/handle` long-poll loop runs as an asyncio task and
+    REACT/ANSWER handlers can be defined with `async def`. Requires `httpx` (`pip install ke_client[async]`).
+
+    Registration (`register()`) is inherited from KEClient, call `await register_async()` from the event loop.
+    """
+    # region fields
+    _loop_: Optional[asyncio.AbstractEventLoop] = None
+    # client loop
+    _handler_task_: Optional[asyncio.Task] = None
+    # handle requests being processed
+    _pending_handles_: Optional[Set[asyncio.Task]] = None
+    _handle_slots_: Optional[asyncio.Semaphore] = None
+    # max. number of concurrently processed handle requests, polling is paused when all slots are taken
+    _max_pending_handles_: int = 256
+    # httpx.AsyncClient for request/response traffic and for the `sc/handle` long-poll
+    _http_client_: Any = None
+    _handle_http_client_: Any = None
+
+    # endregion
+
+    # region KEHolder
+    def include(self, ki_holder: KIHolder):
+        if not isinstance(ki_holder, AsyncKIHolder):
+            raise TypeError(f"AsyncKEClient accepts only {AsyncKIHolder.__name__}, got: {type(ki_holder)}")
+        super().include(ki_holder)
+
+    # endregion
+
+    # region http
+    def _init_http_clients_(self):
+        if self._http_client_ is None:
+            try:
+                import httpx
+            except ImportError as err:
+                raise ImportError("AsyncKEClient requires 'httpx', install: `pip install ke_client[async]`") from err
+            timeout = httpx.Timeout(self._http_timeout[1], connect=self._http_timeout[0])
+            self._http_client_ = httpx.AsyncClient(
+                verify=self._verify_cert_, timeout=timeout,
+                limits=httpx.Limits(max_connections=None, max_keepalive_connections=self._http_pool_.pool_size))
+            self._handle_http_client_ = httpx.AsyncClient(
+                verify=self._verify_cert_, timeout=timeout,
+                limits=httpx.Limits(max_connections=None,
+                                    max_keepalive_connections=self._http_pool_.handle_pool_size))
+        return self._http_client_
+
+    async def _api_post_request_async_(self, endpoint: str, headers: Dict, ke_request: KERequest, register=False,
+                                       timeout: Optional[float] = None):
+        """
+        :param timeout: read timeout in seconds, None - client's default
+        """
+        client = self._init_http_clients_()
+        request_kwargs = {} if timeout is None else {"timeout": timeout}
+        content = self._encode_ke_request_(ke_request)
+        headers = {**headers, "Content-Type": "application/json"}
+        return await self._async_http_request_wrapper_(
+            send_request=lambda: client.post(endpoint, headers=headers, content=content, **request_kwargs),
+            endpoint=endpoint, register=register)
+
+    async def _api_get_request_async_(self, endpoint: str, headers: Dict, register=False, long_poll=False):
+        self._init_http_clients_()
+        client = self._handle_http_client_ if long_poll else self._http_client_
+        return await self._async_http_request_wrapper_(
+            send_request=lambda: client.get(endpoint, headers=headers),
+            endpoint=endpoint, register=register)
+
+    async def _async_http_request_wrapper_(self, send_request: Callable[[], Awaitable[Any]], endpoint: str,
+                                           register: bool):
+        if not register:
+            self._assert_client_state_()
+        connection_errors = httpx_connection_errors()
+        try:
+            return await self._retry_policy_.run_async(send_request=send_request, retry_on=connection_errors,
+                                                       breaker=None if register else self._circuit_breaker_,
+                                                       ctx=endpoint, logger=self.logger)
+        except connection_errors as err:
+            self.logger.error(f"can't connect to {endpoint}: {err}")
+            # don't block the event loop, reconnect in the background
+            self.reconnect(bg=True)
+            raise ConnectionError(f"can't connect to {endpoint}") from err
+
+    # endregion
+
+    # region KERequestClient
+    async def ask_ke(self, bindings: KERequest, ki_id: str, ki_name: str,
+                     timeout: Optional[float] = None) -> KIAskResponse:
+        """
+        ASK for knowledge with query bindings to receive bindings for an ASK knowledge interaction.
+        :param timeout: HTTP read timeout in seconds, None - client's default
+        """
+        logging.info(f"ASK REQUEST={ki_id} ")
+        response = await self._api_post_request_async_(endpoint=self.ke_rest_endpoint + "sc/ask",
+                                                       headers={"Knowledge-Base-Id": self.kb_id,
+                                                                "Knowledge-Interaction-Id": ki_id},
+                                                       ke_request=bindings, timeout=timeout)
+
+        return self._assert_response_(response, ki_name=ki_name, response_model=KIAskResponse)
+
+    async def post_ke(self, bindings: KERequest, ki_id: str, ki_name: str,
+                      timeout: Optional[float] = None) -> KIPostResponse:
+        """
+        POST knowledge interactions - post bindings for defined graph pattern
+        :param timeout: HTTP read timeout in seconds, None - client's default
+        """
+        ki_name = self._registered_ki_[ki_id].graph_pattern.name
+        logging.info(f"POST REQUEST={ki_id}")
+        response = await self._api_post_request_async_(endpoint=self.ke_rest_endpoint + "sc/post",
+                                                       headers={"Knowledge-Base-Id": self.kb_id,
+                                                                "Knowledge-Interaction-Id": ki_id},
+                                                       ke_request=bindings, timeout=timeout)
+
+        return self._assert_response_(response, ki_name=ki_name, response_model=KIPostResponse)
+
+    # endregion
+
+    # region batch
+    async def ask_many(self, name: str, bindings_list: Sequence[Union[KIBindings, TargetedBindings]],
+                       max_concurrency: int = 8,
+                       timeout: Optional[float] = None) -> List[KIBatchResult[KIAskResponse]]:
+        """
+        run ASK KI `name` concurrently, once per bindings set
+        :param name: graph pattern name of the declared ASK KI
+        :param bindings_list: ASK bindings, one item per request
+        :param max_concurrency: max. number of requests sent at the same time
+        :param timeout: per-request timeout in seconds
+        :return: results in the order of `bindings_list`, errors are captured per request
+        """
+        return await run_batch_async(self._batch_calls_(name=name, ki_type=KnowledgeInteractionType.ASK,
+                                                        bindings_list=bindings_list, timeout=timeout),
+                                     max_concurrency=max_concurrency, timeout=timeout)
+
+    async def post_many(self, name: str, bindings_list: Sequence[Union[KIBindings, TargetedBindings]],
+                        max_concurrency: int = 8,
+                        timeout: Optional[float] = None) -> List[KIBatchResult[KIPostResponse]]:
+        """
+        run POST KI `name` concurrently, once per bindings set
+        :param name: graph pattern name of the declared POST KI
+        :param bindings_list: POST bindings, one item per request
+        :param max_concurrency: max. number of requests sent at the same time
+        :param timeout: per-request timeout in seconds
+        :return: results in the order of `bindings_list`, errors are captured per request
+        """
+        return await run_batch_async(self._batch_calls_(name=name, ki_type=KnowledgeInteractionType.POST,
+                                                        bindings_list=bindings_list, timeout=timeout),
+                                     max_concurrency=max_concurrency, timeout=timeout)
+
+    async def gather(self, calls: Sequence[Union[Callable[[], Awaitable[Any]], Awaitable[Any]]],
+                     max_concurrency: int = 8, timeout: Optional[float] = None) -> List[KIBatchResult]:
+        """
+        await decorated ASK/POST coroutines concurrently, e.g.
+        `await ki_client.gather([ask_market(market) for market in markets])`
+        :param calls: coroutine functions without arguments or awaitables
+        :param max_concurrency: max. number of calls awaited at the same time
+        :param timeout: per-call timeout in seconds, timed-out calls are cancelled
+        :return: results in the order of `calls`, errors are captured per call
+        """
+        return await run_batch_async(calls, max_concurrency=max_concurrency, timeout=timeout)
+
+    # endregion
+
+    # region client's main loop
+    async def _handle_response_async_(self, response):
+        ki_id: Optional[str] = None
+        try:
+            handle_request = self._parse_handle_request_(response)
+            ki_id = handle_request.knowledgeInteractionId
+            handle_request_id = handle_request.handleRequestId
+            bindings = handle_request.bindingSet
+            ki = self._registered_ki_[ki_id]
+
+            # slow handlers are logged by the KI handler wrapper (`_set_ki_`)
+            result_bindings = await _await_if_needed(ki.handler(ki_id, bindings))
+            await self._handle_async_(bindings=result_bindings, ki_id=ki_id, handle_request_id=handle_request_id,
+                                      ki_type=ki.ki_type)
+            return ki_id
+        except Exception as ex:
+            self.logger.error(
+                f"Error occurred in handle_response kb_id:{self.kb_id} ki_id:{ki_id}, "
+                f"status_code: {response.status_code} : {ex}")
+
+    async def _handle_async_(self, bindings: KERequest, ki_id: str, handle_request_id, ki_type: EnumItem):
+        """
+        REACT/ANSWER knowledge interactions handler, triggered by KE
+        """
+        ki_name = self._registered_ki_[ki_id].ki_name
+        logging.info(f"HANDLE REQUEST={ki_id}:{ki_name}")
+        post_json = self._handle_request_body_(bindings=bindings, handle_request_id=handle_request_id,
+                                               ki_type=ki_type)
+        response = await self._api_post_request_async_(endpoint=self.ke_rest_endpoint + "sc/handle",
+                                                       headers={"Knowledge-Base-Id": self.kb_id,
+                                                                "Knowledge-Interaction-Id": ki_id, },
+                                                       ke_request=post_json, )
+        self._assert_response_(response, ki_name=ki_name)
+
+    def _on_handle_done_(self, task: asyncio.Task):
+        self._pending_handles_.discard(task)
+        self._handle_slots_.release()
+
+    async def _poll_backoff_async_(self):
+        delay = max(self._retry_policy_.backoff(self._poll_failures_), self._circuit_breaker_.retry_after())
+        self._poll_failures_ += 1
+        self.logger.info(f"Re-polling in {delay:.2f} s")
+        await asyncio.sleep(delay)
+
+    async def _handler_loop_tick_async_(self) -> bool:
+        import httpx
+        try:
+            response = await self._api_get_request_async_(self.ke_rest_endpoint + "sc/handle",
+                                                          headers={"Knowledge-Base-Id": self.kb_id}, long_poll=True)
+        except (ConnectionError, httpx.TimeoutException, *httpx_connection_errors()) as err:
+            # includes CircuitOpenError and dropped long-poll connections, reconnect is triggered by the request
+            # wrapper
+            self.logger.warning(f"sc/handle poll failed: {err}")
+            await self._poll_backoff_async_()
+            return True
+        if response.status_code in (200, 202):
+            self._poll_failures_ = 0
+        if response.status_code == 200:
+            # 200 means: we receive bindings that we need to handle, then re-poll asap.
+            # wait for a free slot, polling is paused while all slots are taken
+            await self._handle_slots_.acquire()
+            task = asyncio.create_task(self._handle_response_async_(response=response))
+            self._pending_handles_.add(task)
+            task.add_done_callback(self._on_handle_done_)
+            return True
+        elif response.status_code == 202:
+            # 202 means: re poll (heartbeat)
+            return True
+        elif response.status_code == 410:
+            # 410 means: KE has stopped, so terminate
+            self.logger.warning(f"Received{response.status_code}")
+            await self._poll_backoff_async_()
+            return False
+        else:
+            self.logger.warning(f"received unexpected status {response.status_code}")
+            self.logger.warning(response.text)
+            await self._poll_backoff_async_()
+            return True
+
+    async def _handler_loop_async_(self):
+        self.logger.info("Start handler loop")
+        self._is_running_ = True
+        try:
+            while True:
+                if not await self._handler_loop_tick_async_():
+                    break
+        except asyncio.CancelledError:
+            raise
+        except Exception as ex:
+            self.logger.error(f"Handler loop stopped kb_id:{self.kb_id}: {ex}")
+        finally:
+            self._is_running_ = False
+
+    # endregion
+
+    # region client control
+    async def register_async(self):
+        """
+        register KB and KIs without blocking the event loop
+        """
+        await asyncio.to_thread(self.register)
+
+    def _start_task_(self):
+        self._resume_()
+        if self._pending_handles_ is None:
+            self._pending_handles_ = set()
+            self._handle_slots_ = asyncio.Semaphore(self._max_pending_handles_)
+        self._handler_task_ = self._loop_.create_task(self._handler_loop_async_())
+
+    def _in_loop_thread_(self) -> bool:
+        try:
+            return asyncio.get_running_loop() is self._loop_
+        except RuntimeError:
+            return False
+
+    def start(self):
+        """
+        start the `sc/handle` long-poll loop as an asyncio task. First call must be made from the running event loop,
+        later calls (e.g. after reconnect) can be made from other threads.
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        if loop is not None:
+            self._loop_ = loop
+            self._start_task_()
+        elif self._loop_ is not None:
+            self._loop_.call_soon_threadsafe(self._start_task_)
+        else:
+            raise RuntimeError("AsyncKEClient.start() must be called from the running event loop")
+
+    async def run(self):
+        """
+        run the `sc/handle` long-poll loop in the current task
+        """
+        if self._handler_task_ is not None:
+            raise RuntimeError("Client has already started  in background")
+        self._loop_ = asyncio.get_running_loop()
+        self._resume_()
+        if self._pending_handles_ is None:
+            self._pending_handles_ = set()
+            self._handle_slots_ = asyncio.Semaphore(self._max_pending_handles_)
+        await self._handler_loop_async_()
+
+    def start_sync(self):
+        raise RuntimeError("AsyncKEClient doesn't support blocking loop, use `await run()`")
+
+    def stop(self):
+        """
+        stop the long-poll loop and the lease renewal, handle requests being processed are not cancelled
+        (see `stop_async`)
+        """
+        task = self._handler_task_
+        self._handler_task_ = None
+        if task is not None and not task.done():
+            if self._in_loop_thread_():
+                task.cancel()
+            else:
+                self._loop_.call_soon_threadsafe(task.cancel)
+        if self._handle_dispatcher_ is not None:
+            self._handle_dispatcher_.shutdown(wait=False)
+        if self._lease_renewer_ is not None:
+            # don't block the event loop, the renewal thread exits after the renewal in progress
+            self._lease_renewer_.stop(wait=False)
+
+    async def stop_async(self):
+        """
+        stop the long-poll loop, wait for pending handle requests and close HTTP connections
+        """
+        task = self._handler_task_
+        self.stop()
+        if task is not None:
+            await asyncio.gather(task, return_exceptions=True)
+        if self._pending_handles_:
+            await asyncio.gather(*self._pending_handles_, return_exceptions=True)
+        if self._http_client_ is not None:
+            await self._http_client_.aclose()
+            await self._handle_http_client_.aclose()
+            self._http_client_ = None
+            self._handle_http_client_ = None
+
+    def state(self) -> bool:
+        task = self._handler_task_
+        if task is not None:
+            return not task.done() and (self._is_registered or self._is_reconnecting_)
+        return self._is_running_ and (self._is_registered or self._is_reconnecting_)
+    # endregion
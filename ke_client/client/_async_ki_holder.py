@@ -0,0 +1,227 @@
+import inspect
+import logging
+from functools import wraps, partial
+from typing import Callable, Optional, List, Dict, Union, Awaitable
+
+from ke_client.client._batch import run_batch_async
+from ke_client.client._ki_bindings import BindingsBase
+from ke_client.client._ki_exceptions import KIError
+from ke_client.client._ki_holder import KIHolder, KIBindings, _InvocationPlan
+from ke_client.client._ki_utils import verify_in_bindings_ki, verify_out_bindings_ki, \
+    prepare_ke_request
+from ke_client.client._post_chunks import PostChunking, merge_chunk_results
+from ke_client.ki_model import KnowledgeInteractionType, KIPostResponse, KIAskResponse, KnowledgeInteraction
+from ke_client.utils import time_utils
+
+
+async def _await_if_needed(result):
+    if inspect.isawaitable(result):
+        return await result
+    return result
+
+
+class AsyncKIHolder(KIHolder):
+    """
+    KIHolder variant for the `AsyncKEClient`, decorated ASK/POST functions become coroutines and REACT/ANSWER handlers
+    can be defined with `async def`. Decorated functions returning bindings can be either sync or `async def`.
+    """
+
+    async def _post_chunks_async_(self, chunking: PostChunking, bindings, ki: KnowledgeInteraction, ki_id: str,
+                                  call_ctx: str) -> KIPostResponse:
+        bodies = chunking.prepare(bindings=bindings, ki=ki, call_ctx=call_ctx)
+        if len(bodies) == 1:
+            return await self._client.post_ke(bindings=bodies[0], ki_id=ki_id, ki_name=ki.ki_name)
+        logging.info(f"POST {ki_id}: {len(bodies)} chunks")
+        results = await run_batch_async([partial(self._client.post_ke, bindings=body, ki_id=ki_id, ki_name=ki.ki_name)
+                                         for body in bodies], max_concurrency=chunking.max_concurrency)
+        return merge_chunk_results(results, ki_name=ki.ki_name)
+
+    # region deco
+    def post(self, name: str, chunk_bindings: Optional[int] = None, chunk_bytes: Optional[int] = None,
+             chunk_concurrency: int = 4) -> \
+            Callable[
+                [
+                    [Callable[..., Union[KIBindings, Awaitable[KIBindings]]]],
+                ], Callable[..., Awaitable[KIPostResponse]]]:
+        """
+        :param name: graph pattern name
+        :param chunk_bindings: split the bindings into requests with max. `chunk_bindings` bindings, None - no limit
+        :param chunk_bytes: split the bindings into requests with max. `chunk_bytes` JSON body, None - no limit
+        :param chunk_concurrency: max. number of chunks sent at the same time. The responses of multiple chunks are
+         merged into a `KIChunkedPostResponse`.
+        """
+        call_ctx = self._deco_ctx()
+        chunking = PostChunking(max_bindings=chunk_bindings, max_bytes=chunk_bytes,
+                                max_concurrency=chunk_concurrency) \
+            if chunk_bindings is not None or chunk_bytes is not None else None
+
+        def deco(func: Callable[..., Union[KIBindings, Awaitable[KIBindings]]]) \
+                -> Callable[..., Awaitable[KIPostResponse]]:
+            ki: KnowledgeInteraction = self._set_ki_(gp_name=name, handler=func,
+                                                     ki_type=KnowledgeInteractionType.POST, call_ctx=call_ctx)
+            func_sig = inspect.signature(func)
+            verify_out_bindings_ki(gp_name=name, bindings_annotation=func_sig.return_annotation,
+                                   call_ctx=call_ctx)
+
+            @wraps(func)
+            async def wrapper(*wrapper_args, **kwargs) -> KIPostResponse:
+                ki_id = self._client_ki[ki.ki_name].ki_id
+                if ki_id is None:
+                    raise KIError(
+                        message=f"Empty 'ki_id' for graph pattern: {ki.ki_name}. Is graph pattern registered? ",
+                        ctx=call_ctx)
+                current_ts = time_utils.current_timestamp()
+                logging.info(f"POST init bindings: {ki_id}")
+                post_bindings = await _await_if_needed(func(*wrapper_args, **kwargs))
+
+                if chunking is not None:
+                    ki_post_response = await self._post_chunks_async_(chunking=chunking, bindings=post_bindings,
+                                                                      ki=ki, ki_id=ki_id, call_ctx=call_ctx)
+                else:
+                    ke_request_json = prepare_ke_request(bindings=post_bindings, ki=ki, call_ctx=call_ctx)
+                    ki_post_response: KIPostResponse = await self._client.post_ke(bindings=ke_request_json,
+                                                                                  ki_id=ki_id, ki_name=ki.ki_name)
+
+                t = time_utils.current_timestamp() - current_ts
+                if t > 5000:
+                    logging.warning(
+                        f"Long ({t} ms) KI {ki_id}, [{len(post_bindings)}] -> "
+                        f"[{len(ki_post_response.result_binding_set)}]")
+                return ki_post_response
+
+            return wrapper
+
+        return deco
+
+    def ask(self, name: str) -> \
+            Callable[
+                [
+                    [Callable[..., Union[KIBindings, Awaitable[KIBindings]]]],
+                ], Callable[..., Awaitable[KIAskResponse]]]:
+        call_ctx = self._deco_ctx()
+
+        def deco(func: Callable[..., Union[KIBindings, Awaitable[KIBindings]]]) \
+                -> Callable[..., Awaitable[KIAskResponse]]:
+            func_sig = inspect.signature(func)
+            verify_out_bindings_ki(gp_name=name, bindings_annotation=func_sig.return_annotation,
+                                   call_ctx=call_ctx)
+            ki: KnowledgeInteraction = self._set_ki_(gp_name=name, handler=func,
+                                                     ki_type=KnowledgeInteractionType.ASK,
+                                                     call_ctx=call_ctx)
+
+            @wraps(func)
+            async def wrapper(*wrapper_args, **kwargs) -> KIAskResponse:
+                ki_id = self._client_ki[ki.ki_name].ki_id
+                if ki_id is None:
+                    raise KIError(
+                        message=f"Empty 'ki_id' for graph pattern: {ki.ki_name}. Is graph pattern registered? ",
+                        ctx=call_ctx)
+
+                logging.info(f"ASK init bindings: {ki_id}")
+                current_ts = time_utils.current_timestamp()
+
+                ask_bindings = await _await_if_needed(func(*wrapper_args, **kwargs))
+                ke_request_json = prepare_ke_request(bindings=ask_bindings, ki=ki, call_ctx=call_ctx)
+
+                result_bindings: KIAskResponse = await self._client.ask_ke(bindings=ke_request_json, ki_id=ki_id,
+                                                                           ki_name=ki.ki_name)
+
+                t = time_utils.current_timestamp() - current_ts
+                if t > 5000:
+                    logging.warning(
+                        f"Long ({t} ms) KI {ki_id}, [{len(ask_bindings)}] -> [{len(result_bindings.binding_set)}]")
+                if logging.getLogger().isEnabledFor(logging.DEBUG):
+                    # str() of a large response is expensive
+                    logging.debug(f"ASK-{ki_id}-result: {str(result_bindings)[:1024]}")
+                return result_bindings
+
+            return wrapper
+
+        return deco
+
+    def react(self, name: str, mismatch_check: Optional[str] = None) -> \
+            Callable[[Callable[..., Union[KIBindings, Awaitable[KIBindings]]]],
+                     Callable[[str, Optional[KIBindings]], Awaitable[KIBindings]]]:
+        """
+        :param name: graph pattern name
+        :param mismatch_check: check that the output bindings keep the input values: `full`, `sampled`, `off`,
+         None - client's default
+        """
+        call_ctx = self._deco_ctx()
+
+        def deco(func: Callable[..., Union[KIBindings, Awaitable[KIBindings]]]) -> \
+                Callable[[str, Optional[KIBindings]], Awaitable[KIBindings]]:
+            func_sig = inspect.signature(func)
+            params = {k: param for k, param in func_sig.parameters.items() if
+                      param.kind == inspect.Parameter.POSITIONAL_OR_KEYWORD}
+            # verify schema
+            verify_in_bindings_ki(gp_name=name, params=params, call_ctx=call_ctx)
+            verify_out_bindings_ki(gp_name=name, bindings_annotation=func_sig.return_annotation,
+                                   call_ctx=call_ctx)
+
+            invocation_plan = _InvocationPlan(params)
+            ki: KnowledgeInteraction
+
+            @wraps(func)
+            async def wrapper(*wrapper_args) -> KIBindings:
+                _kwargs = invocation_plan.kwargs(wrapper_args)
+                ki_id = wrapper_args[0]
+                post_input_bindings = _kwargs["bindings"] if "bindings" in _kwargs else None
+                logging.info(f"REACT init bindings: {ki_id}")
+                react_bindings: Union[List[Dict], List[BindingsBase]] = await _await_if_needed(func(**_kwargs))
+                if react_bindings is None:
+                    logging.warning(f"Undefined react_bindings for {ki_id}, setting empty list")
+                    react_bindings = []
+                ki.mismatch_checker.check(ki_id, post_input_bindings, react_bindings)
+                ke_request_json = prepare_ke_request(bindings=react_bindings, ki=ki, call_ctx=call_ctx)
+                return ke_request_json
+
+            wrapper.__name__ = wrapper.__name__ + "_" + func.__name__
+            ki: KnowledgeInteraction = self._set_ki_(gp_name=name, handler=wrapper,
+                                                     ki_type=KnowledgeInteractionType.REACT, call_ctx=call_ctx,
+                                                     mismatch_check=mismatch_check)
+            return wrapper
+
+        return deco
+
+    def answer(self, name: str, mismatch_check: Optional[str] = None):
+        """
+        :param name: graph pattern name
+        :param mismatch_check: check that the output bindings keep the input values: `full`, `sampled`, `off`,
+         None - client's default
+        """
+        call_ctx = self._deco_ctx()
+
+        def deco(func: Callable[..., Union[KIBindings, Awaitable[KIBindings]]]):
+            func_sig = inspect.signature(func)
+            params = {k: param for k, param in func_sig.parameters.items() if
+                      param.kind == inspect.Parameter.POSITIONAL_OR_KEYWORD}
+            verify_in_bindings_ki(gp_name=name, params=params, call_ctx=call_ctx)
+            verify_out_bindings_ki(gp_name=name, bindings_annotation=func_sig.return_annotation, call_ctx=call_ctx)
+            invocation_plan = _InvocationPlan(params)
+            ki: KnowledgeInteraction
+
+            @wraps(func)
+            async def wrapper(*wrapper_args):
+                _kwargs = invocation_plan.kwargs(wrapper_args)
+                ki_id = wrapper_args[0]
+                input_bindings: List[Union[dict, BindingsBase]] = _kwargs["bindings"] if "bindings" in _kwargs else None
+
+                logging.info(f"ANSWER init bindings: {ki_id}")
+                logging.debug(f"ANSWER init bindings: {ki_id} :{input_bindings}")
+                ki.validation_plan.verify_required(ki_bindings=input_bindings, call_ctx=call_ctx)
+
+                answer_bindings = await _await_if_needed(func(**_kwargs))
+                ki.mismatch_checker.check(ki_id, input_bindings, answer_bindings)
+                ke_request_json = prepare_ke_request(bindings=answer_bindings, ki=ki, call_ctx=call_ctx)
+                return ke_request_json
+
+            wrapper.__name__ = wrapper.__name__ + "_" + func.__name__
+            ki: KnowledgeInteraction = self._set_ki_(gp_name=name, handler=wrapper,
+                                                     ki_type=KnowledgeInteractionType.ANSWER, call_ctx=call_ctx,
+                                                     mismatch_check=mismatch_check)
+
+            return wrapper
+
+        return deco
+    # endregion
@@ -0,0 +1,140 @@
+import asyncio
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from threading import Event
+from typing import TypeVar, Generic, Optional, Callable, Sequence, List, Awaitable, Union
+
+T = TypeVar("T")
+
+
+class KIBatchResult(Generic[T]):
+    """
+    result of a single call in a batch: `response` or captured `error`
+    """
+    index: int
+    response: Optional[T] = None
+    error: Optional[BaseException] = None
+    elapsed_ms: int = 0
+
+    def __init__(self, index: int, response: Optional[T] = None, error: Optional[BaseException] = None,
+                 elapsed_ms: int = 0):
+        self.index = index
+        self.response = response
+        self.error = error
+        self.elapsed_ms = elapsed_ms
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def unwrap(self) -> T:
+        """
+        :return: response, raise captured error if the call failed
+        """
+        if self.error is not None:
+            raise self.error
+        return self.response
+
+    def __repr__(self):
+        if self.error is not None:
+            return f"KIBatchResult({self.index}, error={self.error!r})"
+        return f"KIBatchResult({self.index}, response={type(self.response).__name__})"
+
+
+class _BatchCall:
+    def __init__(self, call: Callable[[], T]):
+        self.call = call
+        self.started = Event()
+        self.start_ts: float = 0.0
+
+    def __call__(self) -> T:
+        self.start_ts = time.monotonic()
+        self.started.set()
+        return self.call()
+
+
+def run_batch(calls: Sequence[Callable[[], T]], max_concurrency: int = 8, timeout: Optional[float] = None) \
+        -> List[KIBatchResult[T]]:
+    """
+    run calls concurrently
+    :param calls: zero-argument callables, e.g. `functools.partial(ask_decorated_function, arg)`
+    :param max_concurrency: max. number of calls running at the same time
+    :param timeout: per-call timeout in seconds, counted from the start of the call (not from queuing).
+     A timed-out call is reported with `TimeoutError`, it's not interrupted and keeps its worker until it returns.
+     Calls not started before the batch time limit (`timeout` * number of call waves) because the workers are held
+     by timed-out calls are cancelled and reported with `TimeoutError`.
+    :return: results in the order of `calls`, errors are captured per call
+    """
+    if max_concurrency < 1:
+        raise ValueError(f"Invalid max_concurrency: {max_concurrency}")
+    if len(calls) == 0:
+        return []
+    batch_calls = [_BatchCall(call) for call in calls]
+    workers = min(max_concurrency, len(batch_calls))
+    # every call starts before the deadline unless a timed-out call holds its worker
+    batch_deadline = None if timeout is None else \
+        time.monotonic() + math.ceil(len(batch_calls) / workers) * timeout
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ke-batch")
+    try:
+        futures = [executor.submit(batch_call) for batch_call in batch_calls]
+        results: List[KIBatchResult[T]] = []
+        for i, (batch_call, future) in enumerate(zip(batch_calls, futures)):
+            try:
+                if timeout is None:
+                    response = future.result()
+                else:
+                    if not batch_call.started.wait(max(batch_deadline - time.monotonic(), 0.0)):
+                        if future.cancel():
+                            results.append(KIBatchResult(index=i, error=TimeoutError(
+                                f"Batch call {i} not started, workers held by timed-out calls ({timeout}s)")))
+                            continue
+                        # started meanwhile
+                        batch_call.started.wait()
+                    remaining = batch_call.start_ts + timeout - time.monotonic()
+                    response = future.result(timeout=max(remaining, 0.0))
+                results.append(KIBatchResult(index=i, response=response,
+                                             elapsed_ms=int((time.monotonic() - batch_call.start_ts) * 1000)))
+            except FutureTimeoutError:
+                results.append(KIBatchResult(index=i, error=TimeoutError(f"Batch call {i} timed out ({timeout}s)"),
+                                             elapsed_ms=int((time.monotonic() - batch_call.start_ts) * 1000)))
+            except Exception as ex:
+                results.append(KIBatchResult(index=i, error=ex,
+                                             elapsed_ms=int((time.monotonic() - batch_call.start_ts) * 1000)))
+        return results
+    finally:
+        # don't wait for timed-out calls
+        executor.shutdown(wait=False)
+
+
+async def run_batch_async(calls: Sequence[Union[Callable[[], Awaitable[T]], Awaitable[T]]], max_concurrency: int = 8,
+                          timeout: Optional[float] = None) -> List[KIBatchResult[T]]:
+    """
+    asyncio version of `run_batch`, timed-out calls are cancelled
+    :param calls: coroutine functions without arguments or awaitables
+    :param max_concurrency: max. number of calls awaited at the same time
+    :param timeout: per-call timeout in seconds, counted from the start of the call
+    :return: results in the order of `calls`, errors are captured per call
+    """
+    if max_concurrency < 1:
+        raise ValueError(f"Invalid max_concurrency: {max_concurrency}")
+    slots = asyncio.Semaphore(max_concurrency)
+
+    async def run(index: int, call) -> KIBatchResult[T]:
+        async with slots:
+            start_ts = time.monotonic()
+            try:
+                awaitable = call() if callable(call) else call
+                if timeout is None:
+                    response = await awaitable
+                else:
+                    response = await asyncio.wait_for(awaitable, timeout=timeout)
+                return KIBatchResult(index=index, response=response,
+                                     elapsed_ms=int((time.monotonic() - start_ts) * 1000))
+            except asyncio.TimeoutError:
+                return KIBatchResult(index=index, error=TimeoutError(f"Batch call {index} timed out ({timeout}s)"),
+                                     elapsed_ms=int((time.monotonic() - start_ts) * 1000))
+            except Exception as ex:
+                return KIBatchResult(index=index, error=ex, elapsed_ms=int((time.monotonic() - start_ts) * 1000))
+
+    return list(await asyncio.gather(*[run(i, call) for i, call in enumerate(calls)]))
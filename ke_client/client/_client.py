@@ -1,19 +1,28 @@
 import logging.config
 import threading
 import time
+from functools import partial
 from logging import Logger
-from typing import Union, Optional, List, Dict, Any, TypeAlias
+from typing import Union, Optional, List, Dict, Any, TypeAlias, Sequence, Callable
 
 from rdflib import URIRef, Literal
 
 import ke_client.ke_vars as ke_vars
+from ke_client.client._batch import KIBatchResult, run_batch
 from ke_client.client._ke_request_client import KERequestClient, KERequest
-from ke_client.client._ki_bindings import BindingsBase
+from ke_client.client._ki_bindings import BindingsBase, TargetedBindings
+from ke_client.client._ki_exceptions import KIError
+from ke_client.client._ki_utils import prepare_ke_request, require_graph_pattern
 
 from ke_client.client._client_base import KEClientBase
+from ke_client.client._http_pool import KEHttpPool
+from ke_client.client._handle_dispatcher import KIHandleDispatcher
 from ke_client.client._ki_holder import KIHolder
-from ke_client.ki_model import KIPostResponse, KIAskResponse, KnowledgeInteraction
-from ke_client.utils import validate_kb_id, time_utils
+from ke_client.client._retry import RetryPolicy, CircuitBreaker, CircuitOpenError
+from ke_client.client._transport import KETransport, build_transport
+from ke_client.ki_model import KIPostResponse, KIAskResponse, KnowledgeInteraction, KnowledgeInteractionType
+from ke_client.utils import validate_kb_id
+from ke_client.utils.enum_utils import EnumItem
 
 KIBindings: TypeAlias = List[Union[Dict[str, Any], BindingsBase]]
 OptionalLiteral: TypeAlias = Union[Literal, URIRef, None]
@@ -34,6 +43,10 @@ class KEClient(KEClientBase, KERequestClient, KIHolder):
     _handler_loop_thread_: Optional[threading.Thread] = None
     # stop event for the client loop
     _stop_event_: Optional[threading.Event] = None
+    # worker pool for handle requests, None - requests are processed in the client loop
+    _handle_dispatcher_: Optional[KIHandleDispatcher] = None
+    # consecutive failed `sc/handle` polls, sets the backoff delay
+    _poll_failures_: int = 0
 
     # endregion
 
@@ -52,11 +65,31 @@ class KEClient(KEClientBase, KERequestClient, KIHolder):
 
         return cls(kb_id=kb_id, ke_rest_endpoint=ke_settings.rest_endpoint, kb_name=ki.kb_name,
                    kb_description=ki.kb_description, logger=logger, prefixes=ki.prefixes,
-                   partial_ki=ke_settings.allow_partial_ki, reasoner_level=ke_settings.reasoner_level)
+                   partial_ki=ke_settings.allow_partial_ki, reasoner_level=ke_settings.reasoner_level,
+                   handle_workers=ke_settings.handle_workers, handle_queue_size=ke_settings.handle_queue_size,
+                   handle_ordered=ke_settings.handle_ordered,
+                   retry_policy=RetryPolicy(max_attempts=ke_settings.retry_max_attempts,
+                                            base_delay=ke_settings.retry_base_delay,
+                                            max_delay=ke_settings.retry_max_delay, jitter=ke_settings.retry_jitter,
+                                            deadline=ke_settings.retry_deadline),
+                   circuit_breaker=CircuitBreaker(failure_threshold=ke_settings.circuit_failure_threshold,
+                                                  reset_timeout=ke_settings.circuit_reset_timeout),
+                   lease_renewal_time=ke_settings.lease_renewal_time,
+                   lease_renew_interval=ke_settings.lease_renew_interval,
+                   registration_workers=ke_settings.registration_workers,
+                   # default `requests` transport uses the shared HTTP pool
+                   transport=None if ke_settings.http_transport == "requests" else build_transport(
+                       ke_settings.http_transport, pool_size=ke_settings.http_pool_size,
+                       handle_pool_size=ke_settings.http_handle_pool_size))
 
     def __init__(self, kb_id: str, kb_name: str, ke_rest_endpoint: str, kb_description: str,
                  verify_cert: bool = ke_vars.VERIFY_SERVER_CERT, logger: Optional[Logger] = None,
-                 prefixes: Optional[dict] = None, partial_ki: bool = False, reasoner_level: int = 1):
+                 prefixes: Optional[dict] = None, partial_ki: bool = False, reasoner_level: int = 1,
+                 http_pool: Optional[KEHttpPool] = None, handle_workers: int = 0, handle_queue_size: int = 0,
+                 handle_ordered: bool = True, retry_policy: Optional[RetryPolicy] = None,
+                 circuit_breaker: Optional[CircuitBreaker] = None, transport: Optional[KETransport] = None,
+                 lease_renewal_time: Optional[int] = None, lease_renew_interval: Optional[float] = None,
+                 registration_workers: int = 8):
         """
 
         :param kb_id: knowledge base URI
@@ -66,6 +99,17 @@ class KEClient(KEClientBase, KERequestClient, KIHolder):
         :param verify_cert:
         :param logger:
         :param prefixes:
+        :param http_pool: pooled HTTP sessions, shared pool (`get_http_pool()`) is used if None
+        :param handle_workers: number of threads processing handle requests, 0 - process in the client loop
+        :param handle_queue_size: max. number of queued handle requests before polling is paused,
+         0 - 4 * handle_workers
+        :param handle_ordered: default execution mode for REACT/ANSWER KIs, True - in arrival order per KI
+        :param retry_policy: retries of requests failed with connection errors, default: `RetryPolicy()`
+        :param circuit_breaker: fail fast while the KE server is down, default: `CircuitBreaker()`
+        :param transport: HTTP backend, default: `RequestsTransport` over `http_pool`
+        :param lease_renewal_time: smart connector lease in seconds, renewed in the background, None - no lease
+        :param lease_renew_interval: seconds between lease renewals, default: 1/3 of `lease_renewal_time`
+        :param registration_workers: max. number of concurrent KI registration requests
         """
         kb_id = validate_kb_id(kb_id)
         if not ke_rest_endpoint.endswith("/"):
@@ -81,10 +125,16 @@ class KEClient(KEClientBase, KERequestClient, KIHolder):
         if reasoner_level not in [1, 2, 3, 4]:
             raise ValueError(f"Invalid reasoner level value : {reasoner_level}. Valid options: 1,2,3,4 ")
         super().__init__(kb_id=kb_id, kb_name=kb_name, ke_rest_endpoint=ke_rest_endpoint, kb_description=kb_description,
-                         prefixes=prefixes, partial_ki=partial_ki, reasoner_level=reasoner_level)
+                         prefixes=prefixes, partial_ki=partial_ki, reasoner_level=reasoner_level,
+                         http_pool=http_pool, retry_policy=retry_policy, circuit_breaker=circuit_breaker,
+                         transport=transport, lease_renewal_time=lease_renewal_time,
+                         lease_renew_interval=lease_renew_interval, registration_workers=registration_workers)
 
         self._verify_cert_ = verify_cert
         self._logger_ = logging.getLogger() if logger is None else logger
+        if handle_workers > 0:
+            self._handle_dispatcher_ = KIHandleDispatcher(workers=handle_workers, max_queue=handle_queue_size,
+                                                          ordered=handle_ordered, logger=self._logger_)
         self._logger_.info(f"Initialized client to {ke_rest_endpoint}")
 
     # region KEHolder
@@ -105,9 +155,10 @@ class KEClient(KEClientBase, KERequestClient, KIHolder):
 
     # endregion
     # region KERequestClient
-    def ask_ke(self, bindings: KERequest, ki_id: str, ki_name: str) -> KIAskResponse:
+    def ask_ke(self, bindings: KERequest, ki_id: str, ki_name: str, timeout: Optional[float] = None) -> KIAskResponse:
         """
         ASK for knowledge with query bindings to receive bindings for an ASK knowledge interaction.
+        :param timeout: HTTP read timeout in seconds, None - client's default
         """
         # ki_name = self._registered_ki_[ki_id].name
         # logging.info(f"ASK REQUEST={ki_id}:{ki_name}")
@@ -115,17 +166,18 @@ class KEClient(KEClientBase, KERequestClient, KIHolder):
         # self._assert_client_state_()
         response = self._api_post_request_(endpoint=self.ke_rest_endpoint + "sc/ask",
                                            headers={"Knowledge-Base-Id": self.kb_id, "Knowledge-Interaction-Id": ki_id},
-                                           ke_request=bindings)
+                                           ke_request=bindings, timeout=timeout)
 
-        self._assert_response_(response, ki_name=ki_name)
-        ask_response = KIAskResponse.model_validate(response.json())
+        ask_response: KIAskResponse = self._assert_response_(response, ki_name=ki_name, response_model=KIAskResponse)
 
         # return response.json()["bindingSet"]
         return ask_response
 
-    def post_ke(self, bindings: KERequest, ki_id: str, ki_name: str) -> KIPostResponse:
+    def post_ke(self, bindings: KERequest, ki_id: str, ki_name: str,
+                timeout: Optional[float] = None) -> KIPostResponse:
         """
         POST knowledge interactions - post bindings for defined graph pattern
+        :param timeout: HTTP read timeout in seconds, None - client's default
         """
         gp = self._registered_ki_[ki_id].graph_pattern
         ki_name = gp.name
@@ -134,10 +186,10 @@ class KEClient(KEClientBase, KERequestClient, KIHolder):
         # self._assert_client_state_()
         response = self._api_post_request_(endpoint=self.ke_rest_endpoint + "sc/post",
                                            headers={"Knowledge-Base-Id": self.kb_id, "Knowledge-Interaction-Id": ki_id},
-                                           ke_request=bindings)
+                                           ke_request=bindings, timeout=timeout)
 
-        self._assert_response_(response, ki_name=ki_name)
-        post_response = KIPostResponse.model_validate(response.json())
+        post_response: KIPostResponse = self._assert_response_(response, ki_name=ki_name,
+                                                               response_model=KIPostResponse)
 
         # result_binding_set = response.json()["resultBindingSet"]
         # result_binding_set = post_response.resultBindingSet
@@ -156,22 +208,107 @@ class KEClient(KEClientBase, KERequestClient, KIHolder):
 
     # endregion
 
+    # region batch
+    def _batch_calls_(self, name: str, ki_type: EnumItem,
+                      bindings_list: Sequence[Union[KIBindings, TargetedBindings]],
+                      timeout: Optional[float] = None) -> List[Callable]:
+        """
+        :return: ASK/POST calls of a declared KI, one call per bindings set
+        """
+        ki_name = require_graph_pattern(name).ki_name(ki_type=ki_type)
+        call_ctx = f"{ki_name} (batch)"
+        if ki_name not in self._client_ki:
+            raise KIError(message=f"Knowledge interaction {ki_name} is not declared", ctx=call_ctx)
+        ki = self._client_ki[ki_name]
+        send_request = self.ask_ke if ki_type == KnowledgeInteractionType.ASK else self.post_ke
+
+        def call(bindings: Union[KIBindings, TargetedBindings]):
+            if ki.ki_id is None:
+                raise KIError(message=f"Empty 'ki_id' for graph pattern: {ki_name}. Is graph pattern registered? ",
+                              ctx=call_ctx)
+            ke_request_json = prepare_ke_request(bindings=bindings, ki=ki, call_ctx=call_ctx)
+            return send_request(bindings=ke_request_json, ki_id=ki.ki_id, ki_name=ki_name, timeout=timeout)
+
+        return [partial(call, bindings) for bindings in bindings_list]
+
+    def ask_many(self, name: str, bindings_list: Sequence[Union[KIBindings, TargetedBindings]],
+                 max_concurrency: int = 8, timeout: Optional[float] = None) -> List[KIBatchResult[KIAskResponse]]:
+        """
+        run ASK KI `name` concurrently, once per bindings set
+        :param name: graph pattern name of the declared ASK KI
+        :param bindings_list: ASK bindings, one item per request
+        :param max_concurrency: max. number of requests sent at the same time
+        :param timeout: per-request timeout in seconds
+        :return: results in the order of `bindings_list`, errors are captured per request
+        """
+        return run_batch(self._batch_calls_(name=name, ki_type=KnowledgeInteractionType.ASK,
+                                            bindings_list=bindings_list, timeout=timeout),
+                         max_concurrency=max_concurrency, timeout=timeout)
+
+    def post_many(self, name: str, bindings_list: Sequence[Union[KIBindings, TargetedBindings]],
+                  max_concurrency: int = 8, timeout: Optional[float] = None) -> List[KIBatchResult[KIPostResponse]]:
+        """
+        run POST KI `name` concurrently, once per bindings set
+        :param name: graph pattern name of the declared POST KI
+        :param bindings_list: POST bindings, one item per request
+        :param max_concurrency: max. number of requests sent at the same time
+        :param timeout: per-request timeout in seconds
+        :return: results in the order of `bindings_list`, errors are captured per request
+        """
+        return run_batch(self._batch_calls_(name=name, ki_type=KnowledgeInteractionType.POST,
+                                            bindings_list=bindings_list, timeout=timeout),
+                         max_concurrency=max_concurrency, timeout=timeout)
+
+    def gather(self, calls: Sequence[Callable[[], Any]], max_concurrency: int = 8,
+               timeout: Optional[float] = None) -> List[KIBatchResult]:
+        """
+        run decorated ASK/POST functions concurrently, e.g.
+        `ki_client.gather([partial(ask_market, market) for market in markets])`
+        :param calls: zero-argument callables
+        :param max_concurrency: max. number of calls running at the same time
+        :param timeout: per-call timeout in seconds, timed-out calls are not interrupted
+        :return: results in the order of `calls`, errors are captured per call
+        """
+        return run_batch(calls, max_concurrency=max_concurrency, timeout=timeout)
+
+    # endregion
+
     # experimental client merge
     # def _include_client(self, ki_client: 'KEClientBase'):
     #     for ki in ki_client.list_ki():
     #         self._set_ki_(gp_name=ki.graph_pattern.name, handler=ki.handler, ki_type=ki.ki_type)
 
     # region client's main loop
+    def _poll_backoff_(self):
+        """
+        wait before the next `sc/handle` poll after a failure, interrupted by `stop()`
+        """
+        delay = max(self._retry_policy_.backoff(self._poll_failures_), self._circuit_breaker_.retry_after())
+        self._poll_failures_ += 1
+        self.logger.info(f"Re-polling in {delay:.2f} s")
+        if self._stop_event_ is not None:
+            self._stop_event_.wait(delay)
+        else:
+            time.sleep(delay)
+
     def _handler_loop_tick_(self):
-        response = self._api_get_request_(self.ke_rest_endpoint + "sc/handle",
-                                          headers={"Knowledge-Base-Id": self.kb_id})
+        try:
+            response = self._api_get_request_(self.ke_rest_endpoint + "sc/handle",
+                                              headers={"Knowledge-Base-Id": self.kb_id}, long_poll=True)
+        except (*self._transport_.connection_errors, *self._transport_.timeout_errors, CircuitOpenError) as err:
+            # reconnect is triggered by the request wrapper
+            self.logger.warning(f"sc/handle poll failed: {err}")
+            self._poll_backoff_()
+            return True
+        if response.status_code in (200, 202):
+            self._poll_failures_ = 0
         if response.status_code == 200:
             # 200 means: we receive bindings that we need to handle, then re-poll asap.
-            current_ts = time_utils.current_timestamp()
-            ki_id = self._handle_response_(response=response)
-            t = time_utils.current_timestamp() - current_ts
-            if t > 2000:
-                logging.warning(f"Slow ({t} ms) KI handler: {ki_id}")
+            if self._handle_dispatcher_ is not None:
+                self._dispatch_response_(response=response)
+                return True
+            # slow handlers are logged by the KI handler wrapper (`_set_ki_`)
+            self._handle_response_(response=response)
             return True
         elif response.status_code == 202:
             # 202 means: re poll (heartbeat)
@@ -181,16 +318,46 @@ class KEClient(KEClientBase, KERequestClient, KIHolder):
             # 410 means: KE has stopped, so terminate  # TODO catch error /self.logger
             # break
             self.logger.warning(f"Received{response.status_code}")
-            time.sleep(30)
+            self._poll_backoff_()
             return False
         else:
             self.logger.warning(f"received unexpected status {response.status_code}")
             self.logger.warning(response.text)
-            self.logger.info("Re-polling after a short timeout")
-            time.sleep(15)
+            self._poll_backoff_()
             return True
             # continue
 
+    def _dispatch_response_(self, response):
+        """
+        pass the handle request to the worker pool, blocks while the pool is saturated
+        """
+        ki_id: Optional[str] = None
+        try:
+            handle_request = self._parse_handle_request_(response)
+            ki_id = handle_request.knowledgeInteractionId
+            handle_request_id = handle_request.handleRequestId
+            bindings = handle_request.bindingSet
+            ki = self._registered_ki_[ki_id]
+        except Exception as ex:
+            self.logger.error(
+                f"Error occurred in handle_response kb_id:{self.kb_id} ki_id:{ki_id}, "
+                f"status_code: {response.status_code} : {ex}")
+            return
+
+        def process():
+            # slow handlers are logged by the KI handler wrapper (`_set_ki_`)
+            try:
+                self._process_handle_request_(ki_id=ki_id, handle_request_id=handle_request_id, bindings=bindings)
+            except Exception as err:
+                self.logger.error(f"Error occurred in handle_response kb_id:{self.kb_id} ki_id:{ki_id}: {err}")
+                raise
+
+        self._handle_dispatcher_.submit(ki_id=ki_id, task=process, ordered=ki.ordered)
+
+    @property
+    def handle_dispatcher(self) -> Optional[KIHandleDispatcher]:
+        return self._handle_dispatcher_
+
     def _handler_loop_worker_(self, stop_event: threading.Event):
         self.logger.info("Start handler loop")
 
@@ -212,6 +379,7 @@ class KEClient(KEClientBase, KERequestClient, KIHolder):
 
     def start(self):
         # TODO: move to client_base
+        self._resume_()
         self._stop_event_ = threading.Event()
 
         # Create and start thread
@@ -222,12 +390,28 @@ class KEClient(KEClientBase, KERequestClient, KIHolder):
         # TODO: move to client_base
         if self._handler_loop_thread_ is not None or self._stop_event_ is not None:
             raise RuntimeError("Client has already started  in background")
+        self._resume_()
         try:
             self._handler_loop_()
         finally:
             self._is_running_ = False
 
+    def _resume_(self):
+        """
+        restart the parts stopped by `stop()`: new handle worker pool with the same settings, lease renewal of the
+        registered smart connector
+        """
+        dispatcher = self._handle_dispatcher_
+        if dispatcher is not None and dispatcher.closed:
+            self._handle_dispatcher_ = KIHandleDispatcher(workers=dispatcher.workers, max_queue=dispatcher.max_queue,
+                                                          ordered=dispatcher.ordered, logger=self._logger_)
+        if self._lease_renewer_ is not None and self._is_registered:
+            self._lease_renewer_.start()
+
     def stop(self):
+        """
+        stop the poll loop and the lease renewal. Running handle requests are finished, queued ones are dropped.
+        """
         # TODO: move to client_base
         if self._stop_event_ is not None:
             self._stop_event_.set()
@@ -235,6 +419,10 @@ class KEClient(KEClientBase, KERequestClient, KIHolder):
                 self._handler_loop_thread_.join()
             self._stop_event_ = None
             self._handler_loop_thread_ = None
+        if self._handle_dispatcher_ is not None:
+            self._handle_dispatcher_.shutdown(wait=True)
+        if self._lease_renewer_ is not None:
+            self._lease_renewer_.stop()
 
     def state(self) -> bool:
         # TODO: move to client_base
@@ -1,8 +1,10 @@
 import logging
+from functools import partial
 from logging import Logger
 from threading import Thread, RLock
-from typing import Union, Callable, Dict, Optional, Any, List
+from typing import Union, Callable, Dict, Optional, Any, List, Type, TypeVar, Sequence
 from http import HTTPStatus
+import orjson
 import requests
 import time
 
@@ -12,9 +14,18 @@ from pydantic import BaseModel, PrivateAttr
 from requests import Response
 
 import ke_client.client._ke_rest_response_errors as response_errors
-from ke_client.ki_model import KnowledgeInteractionType, KnowledgeInteraction, ExchangeInfoStatus
+from ke_client.client._batch import run_batch
+from ke_client.client._http_pool import KEHttpPool, get_http_pool
+from ke_client.client._transport import KETransport, RequestsTransport
+from ke_client.client._retry import RetryPolicy, CircuitBreaker, CircuitOpenError
+from ke_client.client._lease import KELeaseRenewer, LeaseLostError
+from ke_client.client._ke_request_client import KERequest
+from ke_client.ki_model import KnowledgeInteractionType, KnowledgeInteraction, ExchangeInfoStatus, ExchangeInfoBase, \
+    KIAskResponse, KIPostResponse, KIHandleRequest, SmartConnectorLease
 import ke_client.ke_vars as ke_vars
 
+M = TypeVar("M", bound=BaseModel)
+
 
 class KEClientBase(BaseModel):
 
@@ -38,17 +49,47 @@ class KEClientBase(BaseModel):
     _http_timeout = (15, 180)
     _lock: RLock
     _registration_pending: bool = False
+    # pooled keep-alive HTTP sessions
+    _http_pool_: Optional[KEHttpPool] = None
+    # HTTP backend, default: `requests` over `_http_pool_`
+    _transport_: Optional[KETransport] = None
+    # retries of the failed connections and fail-fast while the KE server is down
+    _retry_policy_: Optional[RetryPolicy] = None
+    _circuit_breaker_: Optional[CircuitBreaker] = None
+    # smart connector lease time in seconds (`leaseRenewalTime`), None - registered without lease
+    _lease_renewal_time_: Optional[int] = None
+    _lease_renew_interval_: Optional[float] = None
+    _lease_renewer_: Optional[KELeaseRenewer] = None
+    # max. number of concurrent KI registration requests
+    _registration_workers_: int = 8
 
     # endregion
 
     def __init__(self, partial_ki: bool = False,
-                 verify_cert: bool = ke_vars.VERIFY_SERVER_CERT, logger: Optional[Logger] = None, **kwargs):
+                 verify_cert: bool = ke_vars.VERIFY_SERVER_CERT, logger: Optional[Logger] = None,
+                 http_pool: Optional[KEHttpPool] = None, retry_policy: Optional[RetryPolicy] = None,
+                 circuit_breaker: Optional[CircuitBreaker] = None, transport: Optional[KETransport] = None,
+                 lease_renewal_time: Optional[int] = None, lease_renew_interval: Optional[float] = None,
+                 registration_workers: int = 8, **kwargs):
         super().__init__(**kwargs)
         self._partial_ki = partial_ki
         self._verify_cert_ = verify_cert
         self._logger_ = logging.getLogger() if logger is None else logger
         self._client_ki = {}
         self._lock = RLock()
+        self._http_pool_ = get_http_pool() if http_pool is None else http_pool
+        self._transport_ = RequestsTransport(http_pool=self._http_pool_) if transport is None else transport
+        self._retry_policy_ = RetryPolicy() if retry_policy is None else retry_policy
+        self._circuit_breaker_ = CircuitBreaker() if circuit_breaker is None else circuit_breaker
+        if registration_workers < 1:
+            raise ValueError(f"Invalid registration_workers: {registration_workers}")
+        self._registration_workers_ = registration_workers
+        if lease_renewal_time is not None and lease_renewal_time > 0:
+            self._lease_renewal_time_ = lease_renewal_time
+            self._lease_renew_interval_ = lease_renew_interval
+            self._lease_renewer_ = KELeaseRenewer(renew=self._renew_lease_, lease_time=lease_renewal_time,
+                                                  interval=lease_renew_interval, on_lost=self._on_lease_lost_,
+                                                  logger=self._logger_)
 
     # region ki meta
 
@@ -56,6 +97,38 @@ class KEClientBase(BaseModel):
     def logger(self):
         return self._logger_
 
+    @property
+    def http_pool(self) -> KEHttpPool:
+        return self._http_pool_
+
+    @property
+    def transport(self) -> KETransport:
+        return self._transport_
+
+    @property
+    def retry_policy(self) -> RetryPolicy:
+        return self._retry_policy_
+
+    @property
+    def circuit_breaker(self) -> CircuitBreaker:
+        return self._circuit_breaker_
+
+    def retry_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        :return: retry counters and circuit breaker state
+        """
+        return {"retry": self._retry_policy_.stats(), "circuit_breaker": self._circuit_breaker_.stats()}
+
+    @property
+    def lease_renewer(self) -> Optional[KELeaseRenewer]:
+        return self._lease_renewer_
+
+    def lease_stats(self) -> Optional[Dict[str, Any]]:
+        """
+        :return: lease renewal counters and expiry, None if the smart connector is registered without lease
+        """
+        return self._lease_renewer_.stats() if self._lease_renewer_ is not None else None
+
     @property
     def is_registered(self):
         return self._is_registered and self._is_ki_registered
@@ -69,39 +142,47 @@ class KEClientBase(BaseModel):
     # endregion
 
     # region interaction utils
-    def _assert_response_(self, response: requests.Response, ki_name: Optional[str] = None):
+    def _assert_response_(self, response: Union[requests.Response, Any], ki_name: Optional[str] = None,
+                          response_model: Optional[Type[M]] = None) -> Union[M, Dict, None]:
         """
-        check if the response from the knowledge engine is correct
-        :param response: response from KE
+        check if the response from the knowledge engine is correct, the body is decoded once
+        :param response: response from KE (`requests` or `httpx` response)
         :param ki_name: name of the method sending request to the KE
-        :return:
+        :param response_model: model validated directly from the raw body (e.g. KIAskResponse)
+        :return: parsed body: `response_model` instance, or dict/list if `response_model` is None
         """
         ki_name = ki_name if ki_name is not None else "<none_gp_name>"
-        if not response.ok:
+        response_ok = response.status_code < 400
+        if not response_ok:
             err = f"Invalid response for {ki_name}: {response.status_code}"
-            # resp_content = None
             try:
-                resp_content = response.json()
+                resp_content = orjson.loads(response.content)
             except Exception as err:
                 self.logger.warning(f"{err}:  Error content is not JSON: {response.text}")
                 raise Exception("Invalid response")
-            # if resp_content is not None:
-            if response.status_code == 404 and response.json()["message"] in [response_errors.INACTIVITY_404_ERROR,
-                                                                              response_errors.REGISTER_404_ERROR]:
-                self.logger.error(f"{err}: {response.json()["message"]}")
-                # self.register()
+            message = resp_content.get("message") if type(resp_content) is dict else None
+            if response.status_code == 404 and message in [response_errors.INACTIVITY_404_ERROR,
+                                                           response_errors.REGISTER_404_ERROR]:
+                self.logger.error(f"{err}: {message}")
                 self.reconnect(bg=True)
-                raise Exception(f"KE error: {response.json()["message"]}")
+                raise Exception(f"KE error: {message}")
             else:
                 self.logger.error(f"Unknown {err}: {resp_content} ")
 
-        assert response.ok
+        assert response_ok
+        content = response.content
+        if response_model is not None and len(content) > 0:
+            parsed = response_model.model_validate_json(content)
+            if isinstance(parsed, (KIAskResponse, KIPostResponse)):
+                self._check_exchange_info_(exchange_info_list=parsed.exchangeInfo, ki_name=ki_name)
+            return parsed
         try:
-            resp_content = response.json()
+            resp_content = orjson.loads(content)
         except Exception as err:
-            if response.text == "":
-                if ((response.url.startswith(self.ke_rest_endpoint))
-                        and response.url[len(self.ke_rest_endpoint):] == 'sc/handle'):
+            if len(content) == 0:
+                response_url = str(response.url)
+                if ((response_url.startswith(self.ke_rest_endpoint))
+                        and response_url[len(self.ke_rest_endpoint):] == 'sc/handle'):
                     # this is ok
                     pass
                 else:
@@ -113,31 +194,40 @@ class KEClientBase(BaseModel):
                 self.logger.warning(
                     f"{err}:  content is not JSON: {response.text}, ki: {ki_name}, url: {response.url} ")
             resp_content = {}
-        if "exchangeInfo" in resp_content:
+        if response_model is not None:
+            # empty body
+            return response_model.model_validate(resp_content)
+        if type(resp_content) is dict and "exchangeInfo" in resp_content:
             exchange_info_list = resp_content["exchangeInfo"]
             if type(exchange_info_list) is not list:
                 raise Exception(
                     f"Failed KI ({ki_name}) expected 'exchangeInfo' type is 'list' not '{type(exchange_info_list)}' ")
-            has_success = False
-            for exchange_info in exchange_info_list:
-                kb_id = exchange_info["knowledgeBaseId"]
-                if ExchangeInfoStatus.parse(exchange_info["status"]) == ExchangeInfoStatus.SUCCEEDED:
-                    has_success = True
-                if ExchangeInfoStatus.parse(exchange_info["status"]) == ExchangeInfoStatus.FAILED:
-                    bindings = exchange_info["bindings"] if "bindings" in exchange_info else None
-                    if not self._partial_ki:
-                        raise Exception(
-                            f"Failed KI({ki_name}, from: {kb_id}, status: {exchange_info["status"]}): " +
-                            f"{exchange_info["failedMessage"]}, bindings:{bindings}")
-                    else:
-                        self.logger.error(
-                            f"Failed KI({ki_name}, from: {kb_id}, status: {exchange_info["status"]}): " +
-                            f"{exchange_info["failedMessage"]}, bindings:{bindings}")
-            if not has_success and len(exchange_info_list) > 0:
-                raise Exception(
-                    f"Failed KI({ki_name},all exchanges have status: {ExchangeInfoStatus.FAILED}).  " +
-                    f"From: {",".join([f'{exchange_info["knowledgeBaseId"]}:{exchange_info["failedMessage"]}'
-                                       for exchange_info in exchange_info_list])}")
+            self._check_exchange_info_(exchange_info_list=[ExchangeInfoBase.model_validate(exchange_info)
+                                                           for exchange_info in exchange_info_list],
+                                       ki_name=ki_name)
+        return resp_content
+
+    def _check_exchange_info_(self, exchange_info_list: Sequence[ExchangeInfoBase], ki_name: str):
+        """
+        raise exception if all exchanges failed, or any exchange failed and partial KI is not allowed
+        """
+        has_success = False
+        for exchange_info in exchange_info_list:
+            exchange_status = exchange_info.exchange_status
+            if exchange_status == ExchangeInfoStatus.SUCCEEDED:
+                has_success = True
+            elif exchange_status == ExchangeInfoStatus.FAILED:
+                failed_message = (f"Failed KI({ki_name}, from: {exchange_info.knowledgeBaseId}, "
+                                  f"status: {exchange_info.status}): {exchange_info.failedMessage}")
+                if not self._partial_ki:
+                    raise Exception(failed_message)
+                else:
+                    self.logger.error(failed_message)
+        if not has_success and len(exchange_info_list) > 0:
+            raise Exception(
+                f"Failed KI({ki_name},all exchanges have status: {ExchangeInfoStatus.FAILED}).  " +
+                "From: " + ",".join([f"{exchange_info.knowledgeBaseId}:{exchange_info.failedMessage}"
+                                     for exchange_info in exchange_info_list]))
 
     # endregion
 
@@ -146,8 +236,12 @@ class KEClientBase(BaseModel):
         try:
             self._is_ki_registered = False
             self._register_knowledge_base_()
-            self._delete_registered_ki_()
+            self._reconcile_registered_ki_()
             self._is_ki_registered = True
+            # KE server is reachable
+            self._circuit_breaker_.reset()
+            if self._lease_renewer_ is not None:
+                self._lease_renewer_.start()
         finally:
             self._registration_pending = False
 
@@ -168,8 +262,11 @@ class KEClientBase(BaseModel):
             # self._is_ki_registered = True
 
     def _reconnect(self, timeout_s: int):
+        """
+        :param timeout_s: delay of the first attempt, next attempts wait at least 5 s
+        """
         self._is_reconnecting_ = True
-        self._current_wait_timeout_ = max(timeout_s, 5)
+        self._current_wait_timeout_ = max(timeout_s, 0)
 
         max_attempts = 5  # TODO: configurable
         i = 0
@@ -182,7 +279,7 @@ class KEClientBase(BaseModel):
                 self._reconnect_procedure_()
             except Exception as err:
                 self.logger.error(f"Failed to reconnect {err}")
-            self._current_wait_timeout_ = min(int(self._current_wait_timeout_ * 1.5), 600)
+            self._current_wait_timeout_ = min(max(int(self._current_wait_timeout_ * 1.5), 5), 600)
 
             is_connected = self._is_registered
         if is_connected:
@@ -199,15 +296,18 @@ class KEClientBase(BaseModel):
                 return
             logging.info("Prepare reconnect")
             self._is_reconnecting_ = True
-            logging.info("Trying to stop current client")
-            self.stop()
             if bg:
                 def reconnect_wrapper():
+                    # stop in the background, reconnect can be triggered from the client loop thread
+                    logging.info("Trying to stop current client")
+                    self.stop()
                     self._reconnect(timeout_s)
 
                 t = Thread(target=reconnect_wrapper)
                 t.start()
             else:
+                logging.info("Trying to stop current client")
+                self.stop()
                 self._reconnect(timeout_s=timeout_s)
         finally:
 
@@ -221,9 +321,7 @@ class KEClientBase(BaseModel):
         if not self.state():
             raise RuntimeError("Client is not running")
 
-    def _register_knowledge_interaction_(self, ki: KnowledgeInteraction) -> str:
-        if not self._is_registered:
-            raise RuntimeError("Client is not registered")
+    def _ki_registration_body_(self, ki: KnowledgeInteraction) -> Dict[str, Any]:
         gp = ki.graph_pattern
 
         if ki.ki_type in [KnowledgeInteractionType.ASK, KnowledgeInteractionType.ANSWER]:
@@ -239,9 +337,33 @@ class KEClientBase(BaseModel):
         }
         if gp.result_pattern is not None:
             body["resultGraphPattern"] = gp.result_pattern_value
-        response = requests.post(
-            self.ke_rest_endpoint + "sc/ki/",
-            json=body,
+        return body
+
+    @staticmethod
+    def _is_same_ki_(body: Dict[str, Any], registered: Dict[str, Any]) -> bool:
+        """
+        compare local KI registration body with the KI listed by `GET sc/ki` (name, type, graph patterns, prefixes)
+        """
+        for key in ("knowledgeInteractionName", "knowledgeInteractionType"):
+            if body.get(key) != registered.get(key):
+                return False
+        for key in ("graphPattern", "argumentGraphPattern", "resultGraphPattern"):
+            local_pattern, registered_pattern = body.get(key), registered.get(key)
+            if local_pattern is None or registered_pattern is None:
+                if local_pattern != registered_pattern:
+                    return False
+            elif " ".join(local_pattern.split()) != " ".join(registered_pattern.split()):
+                return False
+        # prefixes are compared if the server lists them
+        registered_prefixes = registered.get("prefixes")
+        return registered_prefixes is None or registered_prefixes == body["prefixes"]
+
+    def _register_knowledge_interaction_(self, ki: KnowledgeInteraction) -> str:
+        if not self._is_registered:
+            raise RuntimeError("Client is not registered")
+        response = self._transport_.request(
+            "POST", self.ke_rest_endpoint + "sc/ki/",
+            json=self._ki_registration_body_(ki),
             headers={"Knowledge-Base-Id": self.kb_id},
             verify=self._verify_cert_, timeout=self._http_timeout
         )
@@ -262,47 +384,67 @@ class KEClientBase(BaseModel):
         #     self.stop()
         # except Exception as ex:
         #     self._logger_.error(f"Stop error: {ex}")
+        if self._lease_renewer_ is not None:
+            self._lease_renewer_.stop()
         self._registered_ki_ = None
         self._is_registered = False
         self.register(bg=False)
 
-    def _delete_registered_ki_(self):
-        if self._registered_ki_ is None:
-            'knowledgeInteractionName'
-            # response = self._get_(endpoint=self.ke_rest_endpoint + "sc/ki/",
-            # headers={"Knowledge-Base-Id": self.kb_id},     register=True)
-            response = requests.get(
-                self.ke_rest_endpoint + "sc/ki/",
-                headers={"Knowledge-Base-Id": self.kb_id},
-                verify=self._verify_cert_,
-                timeout=self._http_timeout
-            )
-            if response.status_code == 200:
-                for ki in response.json():
-                    ki_name = ki["knowledgeInteractionName"]
-                    ki_id = ki["knowledgeInteractionId"]
-                    if ki_name in self._client_ki:
-                        # TODO: optional override instead deleting and re registering
-                        response = requests.delete(
-                            self.ke_rest_endpoint + "sc/ki/",
-                            headers={"Knowledge-Base-Id": self.kb_id, "Knowledge-Interaction-Id": ki_id},
-                            verify=self._verify_cert_
-                        )
-                        assert response.ok
-                    else:
-                        # delete interactions which don't exist in current config
-                        response = requests.delete(
-                            self.ke_rest_endpoint + "sc/ki/",
-                            headers={"Knowledge-Base-Id": self.kb_id, "Knowledge-Interaction-Id": ki_id},
-                            verify=self._verify_cert_
-                        )
-                        assert response.ok
-                self._registered_ki_ = {}
-                for ki in self._client_ki.values():
-                    self._register_knowledge_interaction_(ki)
+    def _delete_knowledge_interaction_(self, ki_id: str):
+        response = self._transport_.request(
+            "DELETE", self.ke_rest_endpoint + "sc/ki/",
+            headers={"Knowledge-Base-Id": self.kb_id, "Knowledge-Interaction-Id": ki_id},
+            verify=self._verify_cert_, timeout=self._http_timeout
+        )
+        assert response.status_code < 400
+
+    def _reconcile_registered_ki_(self):
+        """
+        sync KIs registered in the KE server with the local KIs: unchanged KIs keep their ki_id, changed and unknown
+        KIs are deleted, new and changed KIs are registered. REST calls run concurrently (`registration_workers`).
+        """
+        if self._registered_ki_ is not None:
+            return
+        response = self._transport_.request(
+            "GET", self.ke_rest_endpoint + "sc/ki/",
+            headers={"Knowledge-Base-Id": self.kb_id},
+            verify=self._verify_cert_,
+            timeout=self._http_timeout
+        )
+        if response.status_code != 200:
+            raise Exception(f"Can't check registered interactions, response: {response.status_code}")
+        registered_ki: Dict[str, KnowledgeInteraction] = {}
+        kept_names = set()
+        delete_ki_ids: List[str] = []
+        for sc_ki in response.json():
+            ki_name = sc_ki["knowledgeInteractionName"]
+            ki_id = sc_ki["knowledgeInteractionId"]
+            ki = self._client_ki.get(ki_name)
+            if (ki is not None and ki_name not in kept_names
+                    and self._is_same_ki_(self._ki_registration_body_(ki), sc_ki)):
+                ki.ki_id = ki_id
+                registered_ki[ki_id] = ki
+                kept_names.add(ki_name)
             else:
-                raise Exception(f"Can't check registered interactions, response: {response.status_code}")
-                # self.logger.error("Can't check registered interactions")
+                # changed, duplicated or not in the current config
+                delete_ki_ids.append(ki_id)
+        new_ki = [ki for ki in self._client_ki.values() if ki.ki_name not in kept_names]
+        self._registered_ki_ = registered_ki
+
+        def run(calls: List[Callable[[], Any]]):
+            for result in run_batch(calls, max_concurrency=self._registration_workers_):
+                result.unwrap()
+
+        try:
+            # delete first, KI names must be unique
+            run([partial(self._delete_knowledge_interaction_, ki_id) for ki_id in delete_ki_ids])
+            run([partial(self._register_knowledge_interaction_, ki) for ki in new_ki])
+        except Exception:
+            # registration is repeated from scratch
+            self._registered_ki_ = None
+            raise
+        self.logger.info(f"KIs registered, kept: {len(kept_names)}, deleted: {len(delete_ki_ids)}, "
+                         f"registered: {len(new_ki)}")
 
     def _register_knowledge_base_(self):
         """
@@ -314,39 +456,86 @@ class KEClientBase(BaseModel):
 
         self.logger.info(f"Start register KB: {self.kb_id} - {self.kb_name}")
         # response = self._get_(endpoint=self.ke_rest_endpoint + "sc/ki/", headers={"Knowledge-Base-Id": self.kb_id})
-        response = requests.get(
-            self.ke_rest_endpoint + "sc/ki/", headers={"Knowledge-Base-Id": self.kb_id},
+        response = self._transport_.request(
+            "GET", self.ke_rest_endpoint + "sc/ki/", headers={"Knowledge-Base-Id": self.kb_id},
             verify=self._verify_cert_,
             timeout=self._http_timeout
         )
         if response.status_code == HTTPStatus.NOT_FOUND:
             self.logger.info(f"KB not registered:  {self.kb_id} - {self.kb_name}")
-
-            response = requests.post(
-                self.ke_rest_endpoint + "sc/",
-                json={
-                    "knowledgeBaseId": self.kb_id,
-                    "knowledgeBaseName": self.kb_name,
-                    "knowledgeBaseDescription": self.kb_description,
-                    # "reasonerLevel": 4,
-                    "reasonerLevel": self.reasoner_level,
-                    # "reasonerEnabled":True
-                },
-                verify=self._verify_cert_, timeout=self._http_timeout
-
-            )
-            # TODO handler error in response
-            assert response.ok
-            self.logger.info(f"KB registered:  {self.kb_id} - {self.kb_name}")
-            self._is_registered = True
+            self._post_knowledge_base_()
         elif response.status_code == HTTPStatus.BAD_REQUEST:
             raise Exception(f"KB registration {HTTPStatus.BAD_REQUEST}")
         elif response.status_code == HTTPStatus.OK:
+            if self._lease_renewal_time_ is not None and not self._has_lease_():
+                # registered without lease (or by a client with different settings), the lease is set only
+                # when the smart connector is created
+                self.logger.info(f"KB is registered without lease, re-creating smart connector: {self.kb_id}")
+                response = self._transport_.request(
+                    "DELETE", self.ke_rest_endpoint + "sc/", headers={"Knowledge-Base-Id": self.kb_id},
+                    verify=self._verify_cert_, timeout=self._http_timeout
+                )
+                assert response.status_code < 400
+                self._post_knowledge_base_()
+                return
             self.logger.info(f"KB is registered:  {self.kb_id} - {self.kb_name}")
             self._is_registered = True
         else:
             pass
 
+    def _post_knowledge_base_(self):
+        body = {
+            "knowledgeBaseId": self.kb_id,
+            "knowledgeBaseName": self.kb_name,
+            "knowledgeBaseDescription": self.kb_description,
+            # "reasonerLevel": 4,
+            "reasonerLevel": self.reasoner_level,
+            # "reasonerEnabled":True
+        }
+        if self._lease_renewal_time_ is not None:
+            body["leaseRenewalTime"] = self._lease_renewal_time_
+        response = self._transport_.request(
+            "POST", self.ke_rest_endpoint + "sc/",
+            json=body,
+            verify=self._verify_cert_, timeout=self._http_timeout
+
+        )
+        # TODO handler error in response
+        assert response.status_code < 400
+        self.logger.info(f"KB registered:  {self.kb_id} - {self.kb_name}")
+        self._is_registered = True
+
+    # endregion
+
+    # region lease
+
+    def _renew_lease_(self) -> SmartConnectorLease:
+        """
+        extend the smart connector lease by `leaseRenewalTime`
+        :raise LeaseLostError: if the smart connector is unknown or has no lease
+        """
+        response = self._transport_.request(
+            "PUT", self.ke_rest_endpoint + "sc/lease/renew", headers={"Knowledge-Base-Id": self.kb_id},
+            verify=self._verify_cert_, timeout=self._http_timeout
+        )
+        if response.status_code == HTTPStatus.NOT_FOUND:
+            raise LeaseLostError(f"KB: {self.kb_id}, response: {response.text}")
+        if response.status_code >= 400:
+            raise Exception(f"Lease renewal failed, status_code: {response.status_code}, response: {response.text}")
+        return SmartConnectorLease.model_validate_json(response.content)
+
+    def _has_lease_(self) -> bool:
+        try:
+            self._renew_lease_()
+            return True
+        except LeaseLostError:
+            return False
+
+    def _on_lease_lost_(self, reason: str):
+        # re-register immediately, before the next user request fails
+        self._is_registered = False
+        self.reconnect(timeout_s=0, bg=True)
+
     # endregion
 
     # endregion
@@ -366,67 +555,98 @@ class KEClientBase(BaseModel):
     def _handle_response_(self, response: requests.Response, ):
         ki_id: Optional[None] = None
         try:
-            handle_request = response.json()
-            ki_id: str = handle_request["knowledgeInteractionId"]
-            # requestingKnowledgeBaseId: str = handle_request["requestingKnowledgeBaseId"]
-            handle_request_id = handle_request["handleRequestId"]
-            bindings: list[Dict[str, Any]] = handle_request["bindingSet"]
-            ki = self._registered_ki_[ki_id]
-
-            result_bindings = ki.handler(ki_id, bindings)
-            self._handle_(bindings=result_bindings, ki_id=ki_id, handle_request_id=handle_request_id,
-                          ki_type=ki.ki_type)
+            handle_request = self._parse_handle_request_(response)
+            ki_id = handle_request.knowledgeInteractionId
+            self._process_handle_request_(ki_id=ki_id, handle_request_id=handle_request.handleRequestId,
+                                          bindings=handle_request.bindingSet)
             return ki_id
         except Exception as ex:
             self.logger.error(
                 f"Error occurred in handle_response kb_id:{self.kb_id} ki_id:{ki_id}, "
                 f"status_code: {response.status_code} : {ex}")
 
-    def _api_post_request_(self, endpoint: str, headers: Dict, ke_request: Union[Dict, List[dict[str, str]]],
-                           register=False) -> Response:
+    @staticmethod
+    def _parse_handle_request_(response) -> KIHandleRequest:
+        """
+        decode the `sc/handle` request from the raw body
+        """
+        return KIHandleRequest.model_validate_json(response.content)
+
+    def _process_handle_request_(self, ki_id: str, handle_request_id, bindings: list[Dict[str, Any]]):
+        """
+        run KI handler and send the result bindings to the KE
+        """
+        ki = self._registered_ki_[ki_id]
+        result_bindings = ki.handler(ki_id, bindings)
+        self._handle_(bindings=result_bindings, ki_id=ki_id, handle_request_id=handle_request_id,
+                      ki_type=ki.ki_type)
 
+    def _api_post_request_(self, endpoint: str, headers: Dict, ke_request: KERequest,
+                           register=False, timeout: Optional[float] = None) -> Response:
+        """
+        :param ke_request: JSON body, encoded once (retries send the same bytes)
+        :param timeout: read timeout in seconds, None - default `_http_timeout`
+        """
+        http_timeout = self._http_timeout if timeout is None else (min(self._http_timeout[0], timeout), timeout)
+        content = self._encode_ke_request_(ke_request)
         return self._http_request_wrapper(
-            send_request=lambda: requests.post(endpoint, headers=headers, json=ke_request, verify=self._verify_cert_,
-                                               timeout=self._http_timeout),
+            send_request=lambda: self._transport_.request("POST", endpoint, headers=headers, content=content,
+                                                          verify=self._verify_cert_, timeout=http_timeout),
             endpoint=endpoint, register=register)
 
-    def _api_get_request_(self, endpoint: str, headers: Dict, register=False) -> Response:
+    def _api_get_request_(self, endpoint: str, headers: Dict, register=False, long_poll=False) -> Response:
+        """
+        :param long_poll: True for the `sc/handle` long-poll request, it's sent through the separate connection pool
+        """
         return self._http_request_wrapper(
-            send_request=lambda: requests.get(endpoint, headers=headers, verify=self._verify_cert_,
-                                              timeout=self._http_timeout),
+            send_request=lambda: self._transport_.request("GET", endpoint, headers=headers, verify=self._verify_cert_,
+                                                          timeout=self._http_timeout, long_poll=long_poll),
             endpoint=endpoint, register=register)
 
     def _http_request_wrapper(self, send_request: Callable[[], Response], endpoint: str, register: bool):
+        """
+        send request with the retry policy, registration requests bypass the circuit breaker
+        """
+        if not register:
+            self._assert_client_state_()
+        connection_errors = self._transport_.connection_errors
         try:
+            return self._retry_policy_.run(send_request=send_request, retry_on=connection_errors,
+                                           breaker=None if register else self._circuit_breaker_, ctx=endpoint,
+                                           logger=self.logger)
+        except CircuitOpenError:
+            raise
+        except connection_errors as err:
+            self.logger.error(f"can't connect to {endpoint}: {err}")
             if not register:
-                self._assert_client_state_()
-            return send_request()
-        except requests.ConnectionError as err:
-            self.logger.error(f"can't connect to {endpoint}: {err}. Next attempt in 30 seconds")
-            try:
-                #     timeout configure TODO:
-                time.sleep(30)
-                return send_request()
-            except requests.ConnectionError as err:
-                self.logger.error(f"can't connect to {endpoint}: {err}")
+                # don't block the caller, registration procedure retries on its own
+                self.reconnect(bg=True)
+            raise
 
-            # TODO: if self._reconnect_=True
-            self.reconnect()
-            # what in case of an error ?
-            return send_request()
+    @staticmethod
+    def _encode_ke_request_(ke_request: KERequest) -> bytes:
+        return ke_request if type(ke_request) is bytes else orjson.dumps(ke_request)
 
-    def _handle_(self, bindings: list[dict[str, str]], ki_id: str, handle_request_id, ki_type: EnumItem):
+    @staticmethod
+    def _handle_request_body_(bindings: KERequest, handle_request_id, ki_type: EnumItem) -> bytes:
+        """
+        :param bindings: encoded binding set (`prepare_ke_request`) or N3 bindings
+        :return: `sc/handle` JSON body, the encoded binding set is embedded without re-encoding
+        """
+        binding_set = KEClientBase._encode_ke_request_(bindings)
+        body = b'{"handleRequestId":' + orjson.dumps(handle_request_id) + b',"bindingSet":' + binding_set
+        if ki_type == KnowledgeInteractionType.REACT:
+            body += b',"resultBindingSet":' + binding_set
+        return body + b'}'
+
+    def _handle_(self, bindings: KERequest, ki_id: str, handle_request_id, ki_type: EnumItem):
         """
         REACT/ANSWER knowledge interactions handler, triggered by KE
         """
         ki_name = self._registered_ki_[ki_id].ki_name
         logging.info(f"HANDLE REQUEST={ki_id}:{ki_name}")
-        post_json: dict
-        if ki_type == KnowledgeInteractionType.REACT:
-            post_json = {"handleRequestId": handle_request_id, "bindingSet": bindings, "resultBindingSet": bindings, }
-        else:
-
-            post_json = {"handleRequestId": handle_request_id, "bindingSet": bindings, }
+        post_json = self._handle_request_body_(bindings=bindings, handle_request_id=handle_request_id,
+                                               ki_type=ki_type)
 
         response = self._api_post_request_(endpoint=self.ke_rest_endpoint + "sc/handle",
                                            headers={"Knowledge-Base-Id": self.kb_id,
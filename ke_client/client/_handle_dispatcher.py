@@ -0,0 +1,180 @@
+import logging
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from logging import Logger
+from threading import Lock, BoundedSemaphore
+from typing import Callable, Any, Dict, Deque, Tuple, Optional
+
+_Job = Tuple[Callable[[], Any], float]
+
+
+class KIHandleDispatcher:
+    """
+    Bounded worker pool for the REACT/ANSWER handle requests received from `sc/handle`.
+    The poll loop submits requests and re-polls immediately, `submit` blocks (pauses polling) while `max_queue`
+    requests are queued or running.
+    Ordered KIs run their requests one at a time in arrival order, unordered KIs run them concurrently.
+    `shutdown` (client stop) drops the queued requests, running requests are finished.
+    """
+    workers: int
+    max_queue: int
+    ordered: bool
+    _executor_: ThreadPoolExecutor
+    _slots_: BoundedSemaphore
+    # pending requests of the ordered KIs which are currently processed: ki_id -> requests
+    _ki_queues_: Dict[str, Deque[_Job]]
+    _lock: Lock
+    _logger_: Logger
+
+    def __init__(self, workers: int, max_queue: Optional[int] = None, ordered: bool = True,
+                 logger: Optional[Logger] = None):
+        """
+
+        :param workers: number of worker threads
+        :param max_queue: max. number of queued and running requests, polling is paused when it's reached.
+         Default: 4 * workers
+        :param ordered: default execution mode for KIs without `ordered` flag
+        :param logger:
+        """
+        if workers < 1:
+            raise ValueError(f"Invalid number of handle workers: {workers}")
+        if max_queue is None or max_queue <= 0:
+            max_queue = 4 * workers
+        self.workers = workers
+        self.max_queue = max(max_queue, workers)
+        self.ordered = ordered
+        self._executor_ = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ke-handle")
+        self._slots_ = BoundedSemaphore(self.max_queue)
+        self._ki_queues_ = {}
+        self._lock = Lock()
+        self._logger_ = logging.getLogger() if logger is None else logger
+        # set by `shutdown`, queued requests are dropped
+        self._closed_ = False
+        # region stats
+        self._submitted = 0
+        self._completed = 0
+        self._failed = 0
+        self._dropped = 0
+        self._in_flight = 0
+        self._saturated = 0
+        self._queue_wait_total_ms = 0.0
+        self._queue_wait_max_ms = 0.0
+        # endregion
+
+    def submit(self, ki_id: str, task: Callable[[], Any], ordered: Optional[bool] = None):
+        """
+        queue handle request, blocks while the pool is saturated
+        :param ki_id: knowledge interaction id
+        :param task: request processing
+        :param ordered: run requests of the KI in arrival order, `None` - dispatcher's default
+        :return:
+        :raise RuntimeError: if the dispatcher is shut down, requests submitted while the dispatcher is being shut down
+         are dropped
+        """
+        if self._closed_:
+            raise RuntimeError("Handle dispatcher is shut down")
+        if not self._slots_.acquire(blocking=False):
+            with self._lock:
+                self._saturated += 1
+            self._logger_.warning(f"Handle worker pool saturated ({self.max_queue}), polling paused")
+            self._slots_.acquire()
+        job: _Job = (task, time.monotonic())
+        ordered = ordered if ordered is not None else self.ordered
+        with self._lock:
+            self._submitted += 1
+            self._in_flight += 1
+            if ordered:
+                if ki_id in self._ki_queues_:
+                    # the KI is being processed, the request runs after the previous ones
+                    self._ki_queues_[ki_id].append(job)
+                    return
+                self._ki_queues_[ki_id] = deque()
+                run: Callable = lambda: self._run_ordered(ki_id=ki_id, job=job)
+            else:
+                run = lambda: self._run(job=job)
+        try:
+            self._executor_.submit(run)
+        except RuntimeError as ex:
+            # shut down while waiting for a slot
+            self._drop_unsubmitted(ki_id=ki_id if ordered else None)
+            self._logger_.warning(f"Handle request of {ki_id} dropped: {ex}")
+
+    def _drop_unsubmitted(self, ki_id: Optional[str]):
+        """
+        release the slot of a request rejected by the executor, and of the requests queued after it (ordered KI)
+        :param ki_id: ordered KI, None - unordered request
+        """
+        with self._lock:
+            ki_queue = self._ki_queues_.pop(ki_id, None) if ki_id is not None else None
+            dropped = 1 + (len(ki_queue) if ki_queue is not None else 0)
+            self._in_flight -= dropped
+            self._dropped += dropped
+        for _ in range(dropped):
+            self._slots_.release()
+
+    def _run(self, job: _Job):
+        task, enqueued = job
+        wait_ms = (time.monotonic() - enqueued) * 1000.0
+        if self._closed_:
+            # queued before shutdown, the client is stopped and doesn't answer anymore
+            with self._lock:
+                self._in_flight -= 1
+                self._dropped += 1
+            self._slots_.release()
+            return
+        failed = False
+        try:
+            task()
+        except Exception as ex:
+            failed = True
+            self._logger_.error(f"Handle request failed: {ex}")
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+                self._completed += 1
+                if failed:
+                    self._failed += 1
+                self._queue_wait_total_ms += wait_ms
+                self._queue_wait_max_ms = max(self._queue_wait_max_ms, wait_ms)
+            self._slots_.release()
+
+    def _run_ordered(self, ki_id: str, job: Optional[_Job]):
+        while job is not None:
+            self._run(job=job)
+            with self._lock:
+                ki_queue = self._ki_queues_[ki_id]
+                if len(ki_queue) > 0:
+                    job = ki_queue.popleft()
+                else:
+                    del self._ki_queues_[ki_id]
+                    job = None
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        :return: request counters and queue wait time (time between receiving the request and start of the handler)
+        """
+        with self._lock:
+            return {
+                "submitted": self._submitted,
+                "completed": self._completed,
+                "failed": self._failed,
+                "dropped": self._dropped,
+                "in_flight": self._in_flight,
+                "saturated": self._saturated,
+                "queue_wait_avg_ms": self._queue_wait_total_ms / self._completed if self._completed > 0 else 0.0,
+                "queue_wait_max_ms": self._queue_wait_max_ms,
+            }
+
+    @property
+    def closed(self) -> bool:
+        return self._closed_
+
+    def shutdown(self, wait: bool = True):
+        """
+        stop the worker pool: running requests are finished, queued requests are dropped (not passed to the handlers,
+        the KE server doesn't get their results)
+        :param wait: wait for the running requests
+        """
+        self._closed_ = True
+        self._executor_.shutdown(wait=wait)
@@ -0,0 +1,112 @@
+from threading import RLock, Lock
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class KEHttpPool:
+    """
+    Pooled keep-alive HTTP sessions shared by the KE clients.
+    Request/response traffic (ASK, POST, registration, ...) and the long-poll `sc/handle` connections use separate
+    sessions, so a pending long-poll never holds a connection needed by other requests.
+    """
+    pool_size: int
+    handle_pool_size: int
+    _request_session_: requests.Session
+    _handle_session_: requests.Session
+    _lock: RLock
+
+    def __init__(self, pool_size: int = 10, handle_pool_size: int = 2, max_hosts: int = 4):
+        """
+
+        :param pool_size: max. number of keep-alive connections kept per host for the request/response traffic
+        :param handle_pool_size: max. number of keep-alive connections kept per host for the `sc/handle` long-poll
+        :param max_hosts: number of hosts (KE servers) with cached connection pools
+        """
+        if pool_size < 1 or handle_pool_size < 1:
+            raise ValueError(f"Invalid pool size: {pool_size}/{handle_pool_size}. Pool size must be >= 1")
+        self.pool_size = pool_size
+        self.handle_pool_size = handle_pool_size
+        self._lock = RLock()
+        self._request_session_ = self._init_session(pool_size=pool_size, max_hosts=max_hosts)
+        self._handle_session_ = self._init_session(pool_size=handle_pool_size, max_hosts=max_hosts)
+
+    @staticmethod
+    def _init_session(pool_size: int, max_hosts: int) -> requests.Session:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=max_hosts, pool_maxsize=pool_size)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def session(self, long_poll: bool = False) -> requests.Session:
+        """
+        :param long_poll: True for the `sc/handle` long-poll requests
+        :return: pooled session
+        """
+        return self._handle_session_ if long_poll else self._request_session_
+
+    @staticmethod
+    def _session_stats(session: requests.Session) -> Dict[str, int]:
+        stats = {"requests": 0, "connections": 0, "reused": 0}
+        for adapter in {id(a): a for a in session.adapters.values()}.values():
+            if not isinstance(adapter, HTTPAdapter):
+                continue
+            for k, v in pool_manager_stats(adapter.poolmanager).items():
+                stats[k] += v
+        return stats
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        connection reuse counters
+        :return: number of sent requests, opened connections and requests sent over reused connections,
+         for the request/response (`request`) and the long-poll (`handle`) pools
+        """
+        with self._lock:
+            return {"request": self._session_stats(self._request_session_),
+                    "handle": self._session_stats(self._handle_session_)}
+
+    def close(self):
+        with self._lock:
+            self._request_session_.close()
+            self._handle_session_.close()
+
+
+def pool_manager_stats(pool_manager) -> Dict[str, int]:
+    """
+    :param pool_manager: urllib3.PoolManager
+    :return: number of sent requests, opened connections and requests sent over reused connections
+    """
+    num_requests = 0
+    num_connections = 0
+    pools = pool_manager.pools
+    for key in list(pools.keys()):
+        pool = pools.get(key)
+        if pool is None:
+            continue
+        num_requests += pool.num_requests
+        num_connections += pool.num_connections
+    return {"requests": num_requests, "connections": num_connections,
+            "reused": max(num_requests - num_connections, 0)}
+
+
+_http_pool: Optional[KEHttpPool] = None
+_http_pool_lock = Lock()
+
+
+def get_http_pool() -> KEHttpPool:
+    """
+    :return: HTTP pool shared by all KE clients, configured with `ke_settings`
+    """
+    global _http_pool
+    http_pool = _http_pool
+    if http_pool is None:
+        with _http_pool_lock:
+            # clients created concurrently share one pool
+            if _http_pool is None:
+                from ke_client import ke_settings
+                _http_pool = KEHttpPool(pool_size=ke_settings.http_pool_size,
+                                        handle_pool_size=ke_settings.http_handle_pool_size)
+            http_pool = _http_pool
+    return http_pool
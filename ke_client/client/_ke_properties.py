@@ -23,8 +23,53 @@ class KESettings(DictBaseSettings):
     rest_endpoint: str = Field(default="http://localhost:8280/rest/")
     ki_config_path: Optional[str] = Field(default=None)
     ki_config_vars_path: Optional[str] = Field(default=None)
+    ki_config_cache_dir: Optional[str] = Field(default=None, description="Directory of the processed KI config "
+                                                                         "snapshots loaded instead of the YAML "
+                                                                         "files, None - disabled")
+    ki_config_load_workers: int = Field(default=4, description="Max. number of KI config files in the `include` "
+                                                               "section loaded concurrently, 1 - sequential")
     reasoner_level: int = Field(default=1)
     allow_partial_ki: bool = Field(default=False)
+    http_pool_size: int = Field(default=10, description="Max. number of keep-alive connections per KE server "
+                                                        "for the request/response traffic (ASK, POST, ...)")
+    http_handle_pool_size: int = Field(default=2, description="Max. number of keep-alive connections per KE server "
+                                                              "for the `sc/handle` long-poll requests")
+    http_transport: str = Field(default="requests", description="HTTP backend: requests, urllib3, httpx, "
+                                                                "httpx-http2")
+    handle_workers: int = Field(default=0, description="Number of worker threads processing REACT/ANSWER handle "
+                                                       "requests, 0 - requests are processed in the poll loop")
+    handle_queue_size: int = Field(default=0, description="Max. number of queued handle requests, polling is paused "
+                                                          "when it's reached. 0 - 4 * handle_workers")
+    handle_ordered: bool = Field(default=True, description="Default handle requests execution mode: "
+                                                           "True - in arrival order per KI, False - concurrent")
+    retry_max_attempts: int = Field(default=3, description="Max. number of attempts of a KE request failed with "
+                                                           "a connection error (including the first one)")
+    retry_base_delay: float = Field(default=1.0, description="Delay before the first retry in seconds, "
+                                                             "doubled for every next retry")
+    retry_max_delay: float = Field(default=30.0, description="Max. delay between retries in seconds")
+    retry_jitter: float = Field(default=0.5, description="Random part of the retry delay: 0 - fixed, 1 - full")
+    retry_deadline: Optional[float] = Field(default=60.0, description="Max. time of a KE request including "
+                                                                      "retries in seconds, None - no deadline")
+    circuit_failure_threshold: int = Field(default=5, description="Consecutive connection failures which open the "
+                                                                  "circuit (requests fail fast), 0 - disabled")
+    circuit_reset_timeout: float = Field(default=30.0, description="Seconds before a probe request is sent "
+                                                                   "to the KE server when the circuit is open")
+    term_cache_size: int = Field(default=65536, description="Max. number of parsed N3 terms (URIs, literals) "
+                                                            "shared by the bindings objects, 0 - disabled")
+    trusted_bindings: bool = Field(default=False, description="Skip validation of KI output bindings returned "
+                                                              "as objects of a `BindingsBase` class matching the "
+                                                              "graph pattern")
+    mismatch_check: str = Field(default="full", description="Default REACT/ANSWER check that the output bindings "
+                                                            "keep the input values: full, sampled, off")
+    mismatch_check_sample: int = Field(default=100, description="Number of output bindings verified "
+                                                                "in `sampled` mismatch check mode")
+    registration_workers: int = Field(default=8, description="Max. number of concurrent KI registration requests")
+    lease_renewal_time: Optional[int] = Field(default=None, ge=30, le=3600,
+                                              description="Smart connector lease in seconds (30-3600), the KE server "
+                                                          "removes the smart connector when the lease isn't renewed. "
+                                                          "None - no lease")
+    lease_renew_interval: Optional[float] = Field(default=None, description="Seconds between lease renewals, "
+                                                                            "None - 1/3 of lease_renewal_time")
     ki_vars: Optional[dict[str, Any]] = Field(default=None)
     # ontology_prefixes: Optional[dict[str, Any]] = Field(default=None)
 
@@ -77,7 +122,7 @@ class KESettings(DictBaseSettings):
             yml_conf = {k.upper(): v for k, v in yml_conf.items() if
                         type(v) is str or type(v) is int or type(v) is float}
             yml_conf["KB_ID"] = self.knowledge_base_id
-            return {**ki_vars, **{yml_conf}}
+            return {**ki_vars, **yml_conf}
 
     @classmethod
     def load(cls, yml_path: Optional[str] = None, **kwargs):
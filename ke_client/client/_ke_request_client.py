@@ -1,23 +1,27 @@
 from abc import abstractmethod
-from typing import Union, List, Dict, TypeAlias
+from typing import Union, List, Dict, TypeAlias, Optional
 
 from ke_client.ki_model import KIPostResponse, KIAskResponse
 
-KERequest: TypeAlias = Union[Dict, List[dict[str, str]]]
+# JSON body: encoded bytes (`prepare_ke_request`) or binding set/request dict
+KERequest: TypeAlias = Union[bytes, Dict, List[dict[str, str]]]
 
 
 class KERequestClient:
     @abstractmethod
-    def ask_ke(self, bindings: KERequest, ki_id: str, ki_name: str) -> KIAskResponse:
+    def ask_ke(self, bindings: KERequest, ki_id: str, ki_name: str, timeout: Optional[float] = None) -> KIAskResponse:
         """
         ASK for knowledge with query bindings to receive bindings for an ASK knowledge interaction.
+        :param timeout: HTTP read timeout in seconds, None - client's default
         """
         pass
 
     @abstractmethod
-    def post_ke(self, bindings: KERequest, ki_id: str, ki_name: str) -> KIPostResponse:
+    def post_ke(self, bindings: KERequest, ki_id: str, ki_name: str,
+                timeout: Optional[float] = None) -> KIPostResponse:
         """
         POST knowledge interactions - post bindings for defined graph pattern
+        :param timeout: HTTP read timeout in seconds, None - client's default
         """
         pass
 
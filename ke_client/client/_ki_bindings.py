@@ -1,20 +1,25 @@
-from typing import Dict, Any, Union, Optional, Callable, List
+from typing import Dict, Any, Union, Optional, Callable, List, Sequence, Type, TypeVar, Iterator, Iterable, overload
 
 from ke_client.utils.enum_utils import EnumItem
 
 from ke_client.ki_model import KnowledgeInteractionType
 from pydantic import BaseModel, ConfigDict
 from rdflib import URIRef, Literal
-from rdflib.util import from_n3
+from rdflib.term import Node
 
-from ._rdf_utils import is_nil, is_rdf_literal, is_uri_ref, rdf_nil
+from ._rdf_utils import is_nil, is_uri_ref, rdf_nil
+from ._ki_codec import BindingsCodec
+from ._ki_frame import BindingSetFrame
+from ._ki_convert import convert_literals
+from ._term_cache import get_term_cache
+from ._n3 import format_n3
 
 
 def _from_n3(k: str, v: Any, __class__):
     try:
         # if v is None:
         #     return rdf_nil
-        return from_n3(str(v)) if (type(v) is str or type(v) is float or type(v) is int) else v
+        return get_term_cache().term(str(v)) if (type(v) is str or type(v) is float or type(v) is int) else v
     except Exception as ex:
         if is_uri_ref(__class__.__annotations__.get(k)):
             raise Exception(f"Invalid URIRef value: {v} for  {k} in {__class__.__name__}. Cause: {ex}")
@@ -33,46 +38,24 @@ class BindingsBase(BaseModel):
         if bindings is None:
             bindings = kwargs
             kwargs = {}
-            # init default values
-        rdf_nodes = {k: v.default for k, v in self.model_fields.items() if
-                     not v.is_required() and (k in self.model_fields)}
-        # try convert all values into binding objects
-        rdf_nodes.update({k: _from_n3(k, v, self.__class__) for k, v in bindings.items() if (k in self.model_fields)})
-        # rdf_literals = {k: v for k, v in self.__class__.__annotations__.items() if is_rdf_literal(v)}
-        for k, rdf_node in rdf_nodes.items():
-
-            # validate if URIRef as empty Literal is only rdf_nil,
-            # convert rdf_nil to None
-            if type(rdf_node) is URIRef:
-                # is_literal, is_optional = is_rdf_literal(self.__class__.__annotations__.get(k))
-                is_literal, is_optional = is_rdf_literal(self.model_fields.get(k).annotation)
-                is_node_nil = is_nil(rdf_node)
-                if is_literal and not is_node_nil:
-                    raise Exception(f"Non nil URIRef not allowed for Literal: {k} in {self.__class__.__name__}")
-                if is_node_nil:
-                    if is_optional:
-                        rdf_nodes[k] = rdf_nodes[k]
-                    else:
-                        raise Exception(f"Nil node is not allowed for non optional field ({k}) ")
-                    # if is_literal and is_optional:
-                    #     rdf_nodes[k] = None
-
-                    # rdf_nodes[k] = None
-                    # else:
-                    #     pass
+        # convert N3 values into rdf nodes, validate rdf_nil values
+        rdf_nodes = BindingsCodec.of(self.__class__).decode(bindings)
         super().__init__(**rdf_nodes, **kwargs)
 
+    @classmethod
+    def codec(cls) -> BindingsCodec:
+        """
+        :return: wire format codec of the class (compiled once)
+        """
+        return BindingsCodec.of(cls)
+
     def n3(self, skip_none: bool = True) -> Dict[str, str]:
         """
 
         :param skip_none:  skip None values
         :return:
         """
-        if skip_none:
-            return {k: v.n3() if (type(v) is Literal or type(v) is URIRef) else str(v)
-                    for k, v in self.__dict__.items() if v is not None}
-        return {k: v.n3() if (type(v) is Literal or type(v) is URIRef) else (str(v) if v is not None else rdf_nil.n3())
-                for k, v in self.__dict__.items()}
+        return BindingsCodec.to_wire(self, skip_none=skip_none)
 
     @property
     def input_bindings(self) -> dict:
@@ -109,6 +92,18 @@ class BindingsBase(BaseModel):
         else:
             raise ValueError(f"Invalid value {attr}. Expected {Literal.__module__}.{Literal.__name__}. ")
 
+    @staticmethod
+    def convert_values(objects: Iterable['BindingsBase'], attr: str, to: str = "python") -> Any:
+        """
+        convert `attr` literals of all objects in one pass (instead of `convert_value` per object),
+        e.g. `BindingsBase.convert_values(response.bindings(Offer), "price", "decimal")`
+        :param objects: bindings objects
+        :param attr: literal field name
+        :param to: `python`, `float64`, `datetime64` or `decimal`, see `convert_literals`
+        :return: list or numpy array, None/rdf:nil values are missing (None, NaN, NaT)
+        """
+        return convert_literals([obj.__dict__.get(attr) for obj in objects], to=to, name=f"field '{attr}'")
+
     def output_bindings(self) -> dict:
         return {k: v for k, v in self.__dict__.items() if v is not None}
 
@@ -123,17 +118,27 @@ class BindingsBase(BaseModel):
 
 
 class TargetedBindings:
-    bindings: List[BindingsBase]
+    bindings: Union[List[BindingsBase], 'BindingSetFrame']
     knowledge_bases: Optional[List[str]] = None
 
-    def __init__(self, bindings: List[BindingsBase], knowledge_bases: Optional[List[str]] = None):
+    def __init__(self, bindings: Union[List[BindingsBase], 'BindingSetFrame'],
+                 knowledge_bases: Optional[List[str]] = None):
         self.bindings = bindings
         self.knowledge_bases = knowledge_bases
 
-    def json(self, ki_type: EnumItem):
+    def json(self, ki_type: EnumItem, serialize: bool = True):
+        """
+        :param ki_type:
+        :param serialize: False - `BindingsBase` objects are kept in the binding set (serialized by the JSON encoder)
+        """
         kb = self.knowledge_bases if self.knowledge_bases is not None else []
 
-        bindings = [b.serialize(ki_type=ki_type) for b in self.bindings]
+        if type(self.bindings) is BindingSetFrame:
+            bindings = self.bindings.to_binding_set(skip_none=ki_type == KnowledgeInteractionType.ASK)
+        elif serialize:
+            bindings = [b.serialize(ki_type=ki_type) for b in self.bindings]
+        else:
+            bindings = self.bindings
 
         return {
             "recipientSelector": {
@@ -144,3 +149,86 @@ class TargetedBindings:
 
     def __len__(self):
         return len(self.bindings)
+
+
+B = TypeVar("B", bound=BindingsBase)
+
+
+class BindingSetView(Sequence[B]):
+    """
+    read-only view of a binding set, `BindingsBase` objects are built on access (not stored).
+    Slicing and filtering return views over the same binding dicts.
+    """
+    _binding_set: Sequence[Dict[str, Any]]
+    _binding_obj_cls: Type[B]
+
+    def __init__(self, binding_set: Sequence[Dict[str, Any]], binding_obj_cls: Type[B]):
+        if not (isinstance(binding_obj_cls, type) and issubclass(binding_obj_cls, BindingsBase)):
+            raise TypeError(
+                f"invalid deserialization type: {binding_obj_cls}, expected sublass of {BindingsBase.__name__}")
+        self._binding_set = binding_set
+        self._binding_obj_cls = binding_obj_cls
+
+    @property
+    def binding_set(self) -> Sequence[Dict[str, Any]]:
+        """
+        raw (N3) bindings of the view
+        """
+        return self._binding_set
+
+    def __len__(self) -> int:
+        return len(self._binding_set)
+
+    @overload
+    def __getitem__(self, index: int) -> B:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> 'BindingSetView[B]':
+        ...
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return BindingSetView(self._binding_set[index], self._binding_obj_cls)
+        return self._binding_obj_cls(self._binding_set[index])
+
+    def __iter__(self) -> Iterator[B]:
+        binding_obj_cls = self._binding_obj_cls
+        for bindings in self._binding_set:
+            yield binding_obj_cls(bindings)
+
+    def __repr__(self):
+        return f"BindingSetView[{self._binding_obj_cls.__name__}]({len(self._binding_set)})"
+
+    def filter(self, predicate: Callable[[Dict[str, Any]], bool]) -> 'BindingSetView[B]':
+        """
+        :param predicate: called with raw (N3) bindings
+        :return: view of the matching bindings
+        """
+        return BindingSetView([bindings for bindings in self._binding_set if predicate(bindings)],
+                              self._binding_obj_cls)
+
+    def where(self, **values: Any) -> 'BindingSetView[B]':
+        """
+        filter by variable values, e.g. `view.where(ts_uri=URIRef("http://example.org/ts/1"))`
+        :param values: rdflib nodes, N3 strings or python values (converted to Literal)
+        :return: view of the bindings matching all values
+        """
+        n3_values = [(k, format_n3(v) if isinstance(v, Node) else (v if type(v) is str else Literal(v).n3()))
+                     for k, v in values.items()]
+        return self.filter(lambda bindings: all(bindings.get(k) == v for k, v in n3_values))
+
+    def having(self, *variables: str) -> 'BindingSetView[B]':
+        """
+        :return: view of the bindings with all `variables` bound to non nil values
+        """
+        nil = rdf_nil.n3()
+        return self.filter(lambda bindings: all(bindings.get(k, nil) != nil for k in variables))
+
+    def values(self, variable: str) -> Iterator[Any]:
+        """
+        iterate over converted values of a single variable, None if it's not bound
+        """
+        for bindings in self._binding_set:
+            v = bindings.get(variable)
+            yield None if v is None else _from_n3(variable, v, self._binding_obj_cls)
@@ -0,0 +1,134 @@
+from typing import Dict, Any, List, Tuple, Type, Optional, Iterable, TYPE_CHECKING
+
+from pydantic_core import PydanticUndefined
+from rdflib import URIRef, Literal
+
+from ._n3 import format_n3
+from ._rdf_utils import rdf_nil, is_rdf_literal, is_uri_ref
+from ._term_cache import get_term_cache
+
+if TYPE_CHECKING:
+    from ._ki_bindings import BindingsBase
+
+_NIL_VALUES = frozenset({str(rdf_nil), "rdf:nil"})
+_NIL_N3 = rdf_nil.n3()
+_N3_TYPES = (str, float, int)
+
+
+class _FieldSpec:
+    """
+    classification of a bindings object field, computed once per class
+    """
+    __slots__ = ("name", "is_literal", "is_optional", "is_uri")
+
+    def __init__(self, name: str, annotation: Any):
+        self.name = name
+        self.is_literal, self.is_optional = is_rdf_literal(annotation)
+        self.is_uri = is_uri_ref(annotation)
+
+
+class BindingsCodec:
+    """
+    Converts bindings between the wire format (N3 strings sent/received by the KE) and `BindingsBase` objects.
+    Compiled once per `BindingsBase` subclass (on `ki_object` decoration or first use), so field types are not
+    inspected for every object.
+    """
+    binding_obj_cls: Type['BindingsBase']
+    fields: Dict[str, _FieldSpec]
+    # default values of optional fields (fields with default_factory are filled by pydantic)
+    defaults: Dict[str, Any]
+
+    def __init__(self, binding_obj_cls: Type['BindingsBase']):
+        self.binding_obj_cls = binding_obj_cls
+        model_fields = binding_obj_cls.model_fields
+        self.fields = {k: _FieldSpec(k, f.annotation) for k, f in model_fields.items()}
+        self.defaults = {k: f.default for k, f in model_fields.items()
+                         if not f.is_required() and f.default is not PydanticUndefined}
+        self._field_names: Tuple[str, ...] = tuple(model_fields.keys())
+
+    @classmethod
+    def of(cls, binding_obj_cls: Type['BindingsBase']) -> 'BindingsCodec':
+        """
+        :return: codec of the class, compiled on the first call
+        """
+        # own attribute only, subclasses have different fields
+        codec: Optional[BindingsCodec] = binding_obj_cls.__dict__.get("__bindings_codec__")
+        if codec is None:
+            codec = BindingsCodec(binding_obj_cls)
+            type.__setattr__(binding_obj_cls, "__bindings_codec__", codec)
+        return codec
+
+    # region wire -> object
+
+    def _node(self, spec: _FieldSpec, v: Any):
+        try:
+            return get_term_cache().term(str(v)) if type(v) in _N3_TYPES else v
+        except Exception as ex:
+            if spec.is_uri:
+                raise Exception(f"Invalid URIRef value: {v} for  {spec.name} in {self.binding_obj_cls.__name__}. "
+                                f"Cause: {ex}")
+            else:
+                raise Exception(f"RDF Node value: {v} for  {spec.name} in {self.binding_obj_cls.__name__}. "
+                                f"Cause: {ex}")
+
+    def decode(self, bindings: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        :param bindings: N3 values (or rdflib nodes) by variable name, unknown variables are skipped
+        :return: field values: rdflib nodes, rdf:nil is allowed only for optional fields
+        """
+        fields = self.fields
+        rdf_nodes = dict(self.defaults)
+        for k, v in bindings.items():
+            spec = fields.get(k)
+            if spec is not None:
+                rdf_nodes[k] = self._node(spec, v)
+        for k, rdf_node in rdf_nodes.items():
+            # validate if URIRef as empty Literal is only rdf_nil
+            if type(rdf_node) is URIRef:
+                spec = fields[k]
+                is_node_nil = str(rdf_node) in _NIL_VALUES
+                if spec.is_literal and not is_node_nil:
+                    raise Exception(f"Non nil URIRef not allowed for Literal: {k} in {self.binding_obj_cls.__name__}")
+                if is_node_nil and not spec.is_optional:
+                    raise Exception(f"Nil node is not allowed for non optional field ({k}) ")
+        return rdf_nodes
+
+    def from_wire(self, bindings: Dict[str, Any], validate: bool = True) -> 'BindingsBase':
+        """
+        :param bindings: N3 bindings received from the KE
+        :param validate: False - skip pydantic validation of the decoded values (trusted input)
+        """
+        if validate:
+            return self.binding_obj_cls(bindings)
+        return self.binding_obj_cls.model_construct(**self.decode(bindings))
+
+    def from_wire_many(self, binding_set: Iterable[Dict[str, Any]], validate: bool = True) -> List['BindingsBase']:
+        binding_obj_cls = self.binding_obj_cls
+        if validate:
+            return [binding_obj_cls(bindings) for bindings in binding_set]
+        decode = self.decode
+        model_construct = binding_obj_cls.model_construct
+        return [model_construct(**decode(bindings)) for bindings in binding_set]
+
+    # endregion
+
+    # region object -> wire
+
+    @staticmethod
+    def to_wire(obj: 'BindingsBase', skip_none: bool = True) -> Dict[str, str]:
+        """
+        :param obj: bindings object
+        :param skip_none: skip None values, otherwise None is sent as rdf:nil
+        :return: N3 bindings
+        """
+        if skip_none:
+            return {k: format_n3(v) if (type(v) is Literal or type(v) is URIRef) else str(v)
+                    for k, v in obj.__dict__.items() if v is not None}
+        return {k: format_n3(v) if (type(v) is Literal or type(v) is URIRef) else (str(v) if v is not None else _NIL_N3)
+                for k, v in obj.__dict__.items()}
+
+    def to_wire_many(self, objects: Iterable['BindingsBase'], skip_none: bool = True) -> List[Dict[str, str]]:
+        to_wire = self.to_wire
+        return [to_wire(obj, skip_none) for obj in objects]
+
+    # endregion
@@ -0,0 +1,102 @@
+import hashlib
+import logging
+import os
+import pickle
+import time
+from typing import Dict, Any, List, Optional, Tuple
+
+from ke_client.ki_model import GraphPattern
+from ._ke_properties import KnowledgeInteractionConfig
+
+# bump when the snapshot content changes
+_SNAPSHOT_FORMAT = 1
+
+
+def file_hash(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+class KIConfigCache:
+    """
+    On-disk snapshots of the processed KI configuration (`configure_ki`): config fields, graph patterns with their
+    derived values (joined patterns, variables, prefixes, namespaces, parsed triples), pickled to one file per key.
+
+    The key is a hash of the main config file content, the KI vars and the environment variables read by
+    `KnowledgeInteractionConfig`. Hashes of the included files are stored in the snapshot and verified on load.
+    Snapshots are trusted (pickle), keep the cache directory private to the application.
+    """
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+
+    @staticmethod
+    def key(ki_conf_file: str, file_vars: Optional[Dict[str, Any]]) -> str:
+        from importlib.metadata import version, PackageNotFoundError
+        try:
+            package_version = version("ke_client")
+        except PackageNotFoundError:
+            package_version = ""
+        config_fields = {k.lower() for k in KnowledgeInteractionConfig.model_fields}
+        env = sorted((k, v) for k, v in os.environ.items() if k.lower() in config_fields)
+        h = hashlib.sha256()
+        h.update(f"{_SNAPSHOT_FORMAT}:{package_version}\n".encode("utf-8"))
+        h.update(file_hash(ki_conf_file).encode("utf-8"))
+        h.update(repr(sorted((file_vars or {}).items())).encode("utf-8"))
+        h.update(repr(env).encode("utf-8"))
+        return h.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"ki-config-{key[:32]}.pickle")
+
+    def load(self, key: str) -> Optional[KnowledgeInteractionConfig]:
+        """
+        :return: KI configuration, None - no valid snapshot (missing, changed included files, unreadable)
+        """
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None
+        t = time.perf_counter()
+        try:
+            with open(path, "rb") as f:
+                snapshot = pickle.load(f)
+            if snapshot.get("format") != _SNAPSHOT_FORMAT or snapshot.get("key") != key:
+                return None
+            for include_path, include_hash in snapshot["includes"]:
+                if not os.path.exists(include_path) or file_hash(include_path) != include_hash:
+                    logging.info(f"KI config snapshot outdated, included file changed: {include_path}")
+                    return None
+            prefixes = snapshot["prefixes"]
+            graph_patterns = {k: GraphPattern.from_compiled(fields=fields, default_prefixes=prefixes, derived=derived)
+                              for k, (fields, derived) in snapshot["graph_patterns"].items()}
+            ki_conf = KnowledgeInteractionConfig.model_construct(**snapshot["fields"], prefixes=prefixes,
+                                                                 graph_patterns=graph_patterns)
+        except Exception as ex:
+            logging.warning(f"Invalid KI config snapshot {path}: {ex}")
+            return None
+        logging.info(f"KI config loaded from snapshot {path} in {(time.perf_counter() - t) * 1000:.1f} ms")
+        return ki_conf
+
+    def save(self, key: str, ki_conf: KnowledgeInteractionConfig, include_files: List[str]):
+        """
+        :param ki_conf: configuration processed by `configure_ki` (default prefixes set)
+        :param include_files: files included by the main config file
+        """
+        graph_patterns: Dict[str, Tuple[Dict[str, Any], Dict[str, Any]]] = {
+            k: (gp.model_dump(), gp.compile()) for k, gp in ki_conf.graph_patterns_safe().items()}
+        fields = {k: v for k, v in ki_conf.model_dump().items() if k not in ["prefixes", "graph_patterns"]}
+        snapshot = {"format": _SNAPSHOT_FORMAT, "key": key, "fields": fields, "prefixes": ki_conf.prefixes,
+                    "graph_patterns": graph_patterns,
+                    "includes": [(p, file_hash(p)) for p in include_files]}
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(tmp_path, "wb") as f:
+                pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+            # atomic, concurrent workers write the same snapshot
+            os.replace(tmp_path, path)
+        except Exception as ex:
+            logging.warning(f"KI config snapshot {path} not saved: {ex}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
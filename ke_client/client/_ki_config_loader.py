@@ -0,0 +1,82 @@
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple
+
+from ke_client.ki_model import GraphPattern
+from ke_client.utils import load_yml_obj
+from ._ke_properties import KnowledgeInteractionConfig
+
+
+class KIConfigLoader:
+    """
+    Loads the KI config file and the files listed in its `include` section. KI vars are resolved once per load,
+    included files are read, rendered, parsed and validated concurrently and merged in the listed order.
+    Load time of every file is kept in `timings`.
+    """
+
+    def __init__(self, file_vars: Optional[Dict[str, Any]], workers: int = 4):
+        """
+        :param file_vars: KI vars substituted in all config files
+        :param workers: max. number of included files loaded concurrently, 1 - sequential
+        """
+        if workers < 1:
+            raise ValueError(f"Invalid number of KI config load workers: {workers}")
+        self.file_vars = file_vars
+        self.workers = workers
+        # load time in seconds by file path
+        self.timings: Dict[str, float] = {}
+        self.include_files: List[str] = []
+
+    def _load_file(self, path: str) -> Tuple[Dict, KnowledgeInteractionConfig, float]:
+        t = time.perf_counter()
+        yml = load_yml_obj(path, section=KnowledgeInteractionConfig.__SECTION__, settings_constructor=dict,
+                           file_vars=self.file_vars)
+        conf = KnowledgeInteractionConfig.model_validate(yml)
+        return yml, conf, time.perf_counter() - t
+
+    def load(self, ki_conf_file: str) -> KnowledgeInteractionConfig:
+        t = time.perf_counter()
+        _ki_conf, ki_conf, elapsed = self._load_file(ki_conf_file)
+        self.timings[ki_conf_file] = elapsed
+        if "include" in _ki_conf:
+            if type(_ki_conf["include"]) is list:
+                self.include_files = list(_ki_conf["include"])
+            else:
+                self.include_files = [_ki_conf["include"]]
+            self._merge_includes(ki_conf)
+        logging.info(f"KI config loaded in {(time.perf_counter() - t) * 1000:.1f} ms "
+                     f"({1 + len(self.include_files)} files)")
+        return ki_conf
+
+    def _merge_includes(self, ki_conf: KnowledgeInteractionConfig):
+        if self.workers > 1 and len(self.include_files) > 1:
+            with ThreadPoolExecutor(max_workers=min(self.workers, len(self.include_files)),
+                                    thread_name_prefix="ki-config") as executor:
+                included = list(executor.map(self._load_file, self.include_files))
+        else:
+            included = [self._load_file(path) for path in self.include_files]
+
+        graph_patterns: Dict[str, GraphPattern] = {}
+        prefixes = {}
+        for include_file_path, (_, included_conf, elapsed) in zip(self.include_files, included):
+            self.timings[include_file_path] = elapsed
+            logging.debug(f"KI config include {include_file_path} loaded in {elapsed * 1000:.1f} ms")
+            for k in included_conf.graph_patterns_safe().keys():
+                if k in graph_patterns.keys():
+                    raise Exception(f"Duplicate graph pattern key: '{k}'.")
+            graph_patterns.update(included_conf.graph_patterns_safe())
+            prefixes.update(included_conf.prefixes_safe())
+
+        if len(prefixes) > 0:
+            prefixes.update(ki_conf.prefixes_safe())
+            ki_conf.prefixes = prefixes
+        if len(graph_patterns) > 0:
+            graph_patterns.update(ki_conf.graph_patterns_safe())
+            ki_conf.graph_patterns = graph_patterns
+
+    def slowest(self, n: int = 5) -> List[Tuple[str, float]]:
+        """
+        :return: (file path, load time in seconds) of the `n` slowest files
+        """
+        return sorted(self.timings.items(), key=lambda item: -item[1])[:n]
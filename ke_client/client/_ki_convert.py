@@ -0,0 +1,218 @@
+from datetime import datetime, date, timezone
+from decimal import Decimal
+from typing import List, Optional, Any, Iterable, Tuple, Union
+
+from rdflib import URIRef, Literal
+
+from ._rdf_utils import rdf_nil
+from ._term_cache import get_term_cache
+
+XSD = "http://www.w3.org/2001/XMLSchema#"
+_NIL_N3 = rdf_nil.n3()
+_NIL_VALUES = frozenset({_NIL_N3, "rdf:nil", str(rdf_nil)})
+_INT_TYPES = frozenset({f"{XSD}{t}" for t in ("integer", "int", "long", "short", "byte", "nonNegativeInteger",
+                                              "positiveInteger", "negativeInteger", "nonPositiveInteger",
+                                              "unsignedLong", "unsignedInt", "unsignedShort", "unsignedByte")})
+_FLOAT_TYPES = frozenset({f"{XSD}double", f"{XSD}float", f"{XSD}decimal"})
+_DATETIME_TYPES = frozenset({f"{XSD}dateTime", f"{XSD}dateTimeStamp", f"{XSD}date"})
+
+CONVERSIONS = ["python", "float64", "datetime64", "decimal"]
+
+LiteralValue = Union[Literal, URIRef, str, None]
+
+
+def split_literal(n3: str) -> Tuple[Optional[str], Optional[str]]:
+    """
+    split N3 literal without escapes into lexical value and datatype URI: `"1.5"^^<xsd#double>` -> ("1.5", xsd#double)
+    :return: (lexical, datatype), (None, None) if `n3` is not a literal
+    """
+    if not n3 or n3[0] != '"':
+        return None, None
+    end = n3.rfind('"')
+    if end <= 0:
+        return None, None
+    tail = n3[end + 1:]
+    if tail.startswith("^^<") and tail.endswith(">"):
+        return n3[1:end], tail[3:-1]
+    return n3[1:end], None
+
+
+def _parse_datetime(lexical: str) -> datetime:
+    value = datetime.fromisoformat(lexical)
+    if type(value) is date:
+        value = datetime(value.year, value.month, value.day)
+    return value
+
+
+def _parse_boolean(lexical: str) -> bool:
+    return lexical == "true" or lexical == "1"
+
+
+def _python_parser(datatype: Optional[str]):
+    """
+    :return: lexical value parser giving the same value as rdflib `Literal.value`, None for other datatypes
+    """
+    if datatype in _INT_TYPES:
+        return int
+    if datatype == f"{XSD}decimal":
+        return Decimal
+    if datatype in _FLOAT_TYPES:
+        return float
+    if datatype == f"{XSD}date":
+        return date.fromisoformat
+    if datatype in _DATETIME_TYPES:
+        return datetime.fromisoformat
+    if datatype == f"{XSD}boolean":
+        return _parse_boolean
+    if datatype is None or datatype == f"{XSD}string":
+        return str
+    return None
+
+
+def literal_lexicals(values: Iterable[LiteralValue], name: str = "column") -> Tuple[List[Optional[str]], set]:
+    """
+    :param values: `Literal` objects or N3 literals, None and rdf:nil are missing values
+    :param name: column name used in errors
+    :return: lexical values of the literals (None for missing values), datatypes of the column
+    """
+    lexicals: List[Optional[str]] = []
+    append = lexicals.append
+    datatypes = set()
+    # `"^^<datatype>` of the previous N3 literal, usually the same for the whole column
+    suffix = None
+    suffix_len = 0
+    for v in values:
+        t = type(v)
+        if v is None:
+            append(None)
+        elif t is str:
+            if suffix is not None and v.endswith(suffix) and v[0] == '"':
+                append(v[1:-suffix_len])
+            elif v in _NIL_VALUES:
+                append(None)
+            else:
+                lexical, datatype = split_literal(v)
+                if lexical is None:
+                    raise ValueError(f"Non literal value in {name}: {v}")
+                datatypes.add(datatype)
+                append(lexical)
+                if datatype is not None:
+                    suffix = f'"^^<{datatype}>'
+                    suffix_len = len(suffix)
+        elif t is Literal:
+            datatype = v.datatype
+            datatypes.add(None if datatype is None else str(datatype))
+            append(str(v))
+        elif str(v) in _NIL_VALUES:
+            append(None)
+        else:
+            raise ValueError(f"Non literal value in {name}: {v!r}")
+    return lexicals, datatypes
+
+
+def _to_numpy(lexicals: List[Optional[str]], datatypes: set, dtype: Any = None, datetimes: Optional[bool] = None):
+    try:
+        import numpy as np
+    except ImportError as err:
+        raise ImportError("NumPy export requires 'numpy', install: `pip install ke_client[numpy]`") from err
+    if datetimes is None:
+        datetimes = bool(datatypes & _DATETIME_TYPES)
+    if datetimes:
+        timestamps = []
+        append = timestamps.append
+        for lexical in lexicals:
+            if lexical is None:
+                append("NaT")
+            elif lexical.endswith("+00:00"):
+                # numpy parses naive ISO timestamps
+                append(lexical[:-6])
+            elif lexical.endswith("Z"):
+                append(lexical[:-1])
+            else:
+                value = _parse_datetime(lexical)
+                if value.tzinfo is not None:
+                    value = value.astimezone(timezone.utc).replace(tzinfo=None)
+                append(value.isoformat())
+        return np.array(timestamps, dtype="datetime64[us]" if dtype is None else dtype)
+    return np.array(["nan" if lexical is None else lexical for lexical in lexicals],
+                    dtype=np.float64 if dtype is None else dtype)
+
+
+def literal_values(values: Iterable[LiteralValue], name: str = "column") -> List[Any]:
+    """
+    :param values: `Literal` objects or N3 literals, None and rdf:nil are missing values
+    :param name: column name used in errors
+    :return: native values (None for missing values), `Literal` objects provide the value parsed by rdflib
+    """
+    result: List[Any] = []
+    append = result.append
+    # `"^^<datatype>` and the parser of the previous N3 literal, usually the same for the whole column
+    suffix = None
+    suffix_len = 0
+    suffix_parser = None
+    for v in values:
+        t = type(v)
+        if t is Literal:
+            value = v.value
+            append(v.toPython() if value is None else value)
+        elif v is None:
+            append(None)
+        elif t is str:
+            if suffix is not None and v.endswith(suffix) and v[0] == '"':
+                append(suffix_parser(v[1:-suffix_len]))
+            elif v in _NIL_VALUES:
+                append(None)
+            else:
+                lexical, datatype = split_literal(v)
+                if lexical is None:
+                    raise ValueError(f"Non literal value in {name}: {v}")
+                parser = _python_parser(datatype)
+                if parser is None:
+                    append(get_term_cache().term(v).toPython())
+                    continue
+                append(parser(lexical))
+                if datatype is not None:
+                    suffix = f'"^^<{datatype}>'
+                    suffix_len = len(suffix)
+                    suffix_parser = parser
+        elif str(v) in _NIL_VALUES:
+            append(None)
+        else:
+            raise ValueError(f"Non literal value in {name}: {v!r}")
+    return result
+
+
+def _to_decimal(value: Any) -> Optional[Decimal]:
+    if value is None or type(value) is Decimal:
+        return value
+    # shortest repr of floats, e.g. 0.1 -> Decimal("0.1")
+    return Decimal(str(value))
+
+
+def convert_literals(values: Iterable[LiteralValue], to: str = "python", name: str = "column") -> Any:
+    """
+    convert a column of typed literals in one pass, e.g. `convert_literals([b.price for b in offers], "decimal")`
+    :param values: `Literal` objects or N3 literals, None and rdf:nil are missing values
+    :param to: `python` - list of native values (int, float, Decimal, datetime, bool, str),
+     `float64` - numpy array (NaN for missing values), `datetime64` - numpy array in UTC (NaT for missing values),
+     `decimal` - list of Decimal
+    :param name: column name used in errors
+    :return: list or numpy array, missing values are None (NaN/NaT in numpy arrays)
+    """
+    if to not in CONVERSIONS:
+        raise ValueError(f"Unknown conversion: '{to}'. Valid options: {', '.join(CONVERSIONS)}")
+    if to == "datetime64":
+        # numpy parses the ISO lexical values faster than python datetimes
+        lexicals, datatypes = literal_lexicals(values, name=name)
+        return _to_numpy(lexicals, datatypes, datetimes=True)
+    native = literal_values(values, name=name)
+    if to == "python":
+        return native
+    if to == "decimal":
+        return [_to_decimal(value) for value in native]
+    try:
+        import numpy as np
+    except ImportError as err:
+        raise ImportError("NumPy export requires 'numpy', install: `pip install ke_client[numpy]`") from err
+    nan = float("nan")
+    return np.array([nan if value is None else value for value in native], dtype=np.float64)
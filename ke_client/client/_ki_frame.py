@@ -0,0 +1,242 @@
+from datetime import datetime
+from typing import Dict, List, Optional, Any, Iterable, Sequence, Iterator, Type, TYPE_CHECKING
+
+from rdflib import URIRef, Literal
+from rdflib.term import Node
+
+from ._n3 import format_n3
+from ._ki_convert import XSD, _NIL_N3, _NIL_VALUES, _INT_TYPES, _FLOAT_TYPES, _DATETIME_TYPES, split_literal, \
+    _parse_datetime, literal_lexicals, convert_literals, _to_numpy
+from ._term_cache import get_term_cache
+
+if TYPE_CHECKING:
+    from ._ki_bindings import BindingsBase, BindingSetView
+
+Column = List[Optional[str]]
+
+
+def _to_n3(v: Any) -> Optional[str]:
+    """
+    python value or rdflib node -> N3, None stays unbound
+    """
+    t = type(v)
+    if t is str:
+        # already N3
+        return v
+    if v is None:
+        return None
+    if t is URIRef or t is Literal:
+        return format_n3(v)
+    if t is bool:
+        return f'"{"true" if v else "false"}"^^<{XSD}boolean>'
+    if t is float:
+        return f'"{v!r}"^^<{XSD}double>'
+    if t is int:
+        return f'"{v}"^^<{XSD}integer>'
+    if t is datetime:
+        return f'"{v.isoformat()}"^^<{XSD}dateTime>'
+    if isinstance(v, Node):
+        return v.n3()
+    # numpy scalars and other python values
+    item = getattr(v, "item", None)
+    if item is not None:
+        return _to_n3(item())
+    return Literal(v).n3()
+
+
+class BindingSetFrame:
+    """
+    Columnar binding set: one list of N3 values per variable (None - variable not bound in the row), built from
+    `KIAskResponse.frame()`, `KIPostResponse.result_frame()` or python columns (`from_columns`) and accepted as
+    ASK/POST/REACT/ANSWER bindings. Columns are converted in bulk (`values`, `to_numpy`).
+    """
+    _columns: Dict[str, Column]
+    _length: int
+
+    def __init__(self, columns: Dict[str, Column]):
+        """
+        :param columns: N3 values by variable, all columns have the same length
+        """
+        lengths = {len(column) for column in columns.values()}
+        if len(lengths) > 1:
+            raise ValueError(f"Columns have different lengths: {sorted(lengths)}")
+        self._columns = columns
+        self._length = lengths.pop() if lengths else 0
+
+    # region construction
+
+    @classmethod
+    def from_binding_set(cls, binding_set: Iterable[Dict[str, Any]],
+                         variables: Optional[Sequence[str]] = None) -> 'BindingSetFrame':
+        """
+        :param binding_set: N3 bindings (KE wire format)
+        :param variables: columns of the frame, default: all variables of the binding set
+        """
+        # repeated values (URIs, timestamps, ...) are stored once
+        shared: Dict[str, str] = {}
+        share = shared.setdefault
+        if variables is not None:
+            getters = [(variable, []) for variable in variables]
+            for bindings in binding_set:
+                get = bindings.get
+                for variable, column in getters:
+                    value = get(variable)
+                    column.append(None if value is None else share(value, value))
+            return cls(dict(getters))
+        columns: Dict[str, Column] = {}
+        n = 0
+        for bindings in binding_set:
+            for variable, value in bindings.items():
+                column = columns.get(variable)
+                if column is None:
+                    # variable missing in the previous rows
+                    column = columns[variable] = [None] * n
+                column.append(share(value, value))
+            n += 1
+            for column in columns.values():
+                if len(column) < n:
+                    column.append(None)
+        return cls(columns)
+
+    @classmethod
+    def from_columns(cls, **columns: Iterable[Any]) -> 'BindingSetFrame':
+        """
+        e.g. `BindingSetFrame.from_columns(ts_uri=[URIRef(...)] * 3, value=[1.0, 2.5, 3.0])`
+        :param columns: rdflib nodes, python values (converted to typed literals), numpy arrays or N3 strings
+        """
+        return cls({variable: [_to_n3(v) for v in values] for variable, values in columns.items()})
+
+    # endregion
+
+    # region access
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __repr__(self):
+        return f"BindingSetFrame({self._length} rows, variables: {', '.join(self._columns)})"
+
+    def __contains__(self, variable: str) -> bool:
+        return variable in self._columns
+
+    def __getitem__(self, variable: str) -> Column:
+        """
+        :return: N3 values of the variable
+        """
+        return self._columns[variable]
+
+    @property
+    def variables(self) -> List[str]:
+        return list(self._columns)
+
+    def select(self, *variables: str) -> 'BindingSetFrame':
+        return BindingSetFrame({variable: self._columns[variable] for variable in variables})
+
+    def take(self, indices: Iterable[int]) -> 'BindingSetFrame':
+        indices = list(indices)
+        return BindingSetFrame({k: [column[i] for i in indices] for k, column in self._columns.items()})
+
+    def head(self, n: int) -> 'BindingSetFrame':
+        return BindingSetFrame({k: column[:n] for k, column in self._columns.items()})
+
+    def rows(self) -> Iterator[Dict[str, str]]:
+        """
+        iterate over N3 bindings, unbound variables are skipped
+        """
+        items = list(self._columns.items())
+        for i in range(self._length):
+            yield {k: column[i] for k, column in items if column[i] is not None}
+
+    # endregion
+
+    # region conversion
+
+    def nodes(self, variable: str) -> List[Optional[Node]]:
+        """
+        :return: rdflib nodes of the variable, each distinct N3 value is parsed once
+        """
+        term = get_term_cache().term
+        parsed: Dict[str, Node] = {}
+        result = []
+        for v in self._columns[variable]:
+            if v is None:
+                result.append(None)
+                continue
+            node = parsed.get(v)
+            if node is None:
+                node = parsed[v] = term(v)
+            result.append(node)
+        return result
+
+    def values(self, variable: str) -> List[Any]:
+        """
+        :return: python values of the variable: numbers, datetimes, booleans, strings, URIRef for URIs,
+         None for unbound and rdf:nil values
+        """
+        converted: Dict[str, Any] = {}
+        result = []
+        for v in self._columns[variable]:
+            if v is None or v in _NIL_VALUES:
+                result.append(None)
+                continue
+            if v in converted:
+                result.append(converted[v])
+                continue
+            lexical, datatype = split_literal(v)
+            if datatype in _FLOAT_TYPES:
+                value = float(lexical)
+            elif datatype in _INT_TYPES:
+                value = int(lexical)
+            elif datatype in _DATETIME_TYPES:
+                value = _parse_datetime(lexical)
+            else:
+                node = get_term_cache().term(v)
+                value = node.toPython() if type(node) is Literal else node
+            converted[v] = value
+            result.append(value)
+        return result
+
+    def to_numpy(self, variable: str, dtype: Any = None):
+        """
+        export numeric or datetime column (requires `numpy`), unbound and rdf:nil values are NaN/NaT
+        :param variable:
+        :param dtype: numpy dtype, default: float64 for numbers, datetime64[us] (UTC) for xsd:dateTime
+        :return: numpy array
+        """
+        lexicals, datatypes = literal_lexicals(self._columns[variable], name=f"column '{variable}'")
+        return _to_numpy(lexicals, datatypes, dtype=dtype)
+
+    def convert(self, variable: str, to: str = "python") -> Any:
+        """
+        convert literal column in one pass, see `convert_literals`
+        :param variable:
+        :param to: `python`, `float64`, `datetime64` or `decimal`
+        """
+        if to == "float64":
+            # numpy parses the lexical values of N3 column
+            lexicals, datatypes = literal_lexicals(self._columns[variable], name=f"column '{variable}'")
+            return _to_numpy(lexicals, datatypes, datetimes=False)
+        return convert_literals(self._columns[variable], to=to, name=f"column '{variable}'")
+
+    def to_binding_set(self, skip_none: bool = True) -> List[Dict[str, str]]:
+        """
+        :param skip_none: skip unbound variables (ASK), otherwise send them as rdf:nil (POST, REACT, ANSWER)
+        :return: N3 bindings (KE wire format)
+        """
+        if skip_none:
+            return list(self.rows())
+        items = list(self._columns.items())
+        return [{k: _NIL_N3 if column[i] is None else column[i] for k, column in items} for i in range(self._length)]
+
+    def to_objects(self, binding_obj_cls: Type['BindingsBase']) -> List['BindingsBase']:
+        return binding_obj_cls.codec().from_wire_many(self.rows())
+
+    def view(self, binding_obj_cls: Type['BindingsBase']) -> 'BindingSetView':
+        """
+        :return: lazy view, objects are built on access
+        """
+        from ._ki_bindings import BindingSetView
+        return BindingSetView(self.to_binding_set(), binding_obj_cls)
+
+    # endregion
+
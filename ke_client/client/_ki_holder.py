@@ -1,70 +1,67 @@
 import inspect
 import logging.config
-from functools import wraps
-from typing import Union, Callable, Optional, List, Dict, Any, get_args, get_origin, \
-    Iterable, Tuple, TypeAlias
+from functools import wraps, partial
+from typing import Union, Callable, Optional, List, Dict, Any, Type, get_args, get_origin, \
+    TypeAlias
 
 from ke_client.client._ke_request_client import KERequestClient
+from ke_client.client._batch import run_batch
 from ke_client.client._ki_bindings import BindingsBase
-from ke_client.client._ki_exceptions import KIError, KITypeError
+from ke_client.client._ki_exceptions import KIError
 
-from ke_client.client._ki_utils import verify_in_bindings_ki, verify_out_bindings_ki, _verify_required_bindings, \
+from ke_client.client._ki_utils import verify_in_bindings_ki, verify_out_bindings_ki, \
     prepare_ke_request
+from ke_client.client._post_chunks import PostChunking, merge_chunk_results
 from ke_client.ki_model import KnowledgeInteractionType, KIPostResponse, KIAskResponse, KnowledgeInteraction, \
     GraphPattern
-from ke_client.utils import to_json, time_utils
+from ke_client.utils import time_utils
 from ke_client.utils.enum_utils import EnumItem
 
 KIBindings: TypeAlias = List[Union[Dict[str, Any], BindingsBase]]
 
 
 # region helpers
-def _verify_mismatched_bindings(ki_id: str, input_bindings, output_bindings):
+class _InvocationPlan:
     """
-    verify if input bindings values match the output
-    :param ki_id:
-    :param input_bindings:
-    :param output_bindings:
-    :return:
+    REACT/ANSWER handler call compiled on decoration: passed arguments and the `BindingsBase` class of the input
+    bindings, resolved once from the handler signature
     """
-
-    def _keys(ki_binding: Union[BindingsBase, dict]) -> Iterable[str]:
-        if type(ki_binding) is dict:
-            ki_binding: dict
-            return ki_binding.keys()
-        if issubclass(type(ki_binding), BindingsBase):
-            return ki_binding.n3().keys()
-        raise KITypeError(f"Invalid type bindings type: {type(ki_binding)} ", ctx="verify_mismatched_bindings:_keys")
-
-    def _items(ki_binding: Union[BindingsBase, dict]) -> Iterable[Tuple[str, str]]:
-        if type(ki_binding) is dict:
-            return ki_binding.items()
-        if issubclass(type(ki_binding), BindingsBase):
-            return ki_binding.n3().items()
-        raise KITypeError(f"Invalid type bindings type: {type(ki_binding)} ", ctx="verify_mismatched_bindings:_items")
-
-    input_keys = {k for ib in input_bindings for k in _keys(ib)}
-    pair_set = {f"{k}_{v}" for ib in input_bindings for k, v in _items(ib)}
-    err_set = {f"{k}:{v}" for ab in output_bindings for k, v in _items(ab) if
-               k in input_keys and f"{k}_{v}" not in pair_set}
-    if len(err_set) > 0:
-        raise Exception(
-            f"input bindings don't match output bindings for:{ki_id} =  {err_set}")
-
-
-def _init_ki_kwargs(wrapper_args, params: Dict[str, inspect.Parameter]):
-    _kwargs = {k: v for k, v in {"ki_id": wrapper_args[0], "bindings": wrapper_args[1]}.items() if
-               k in params}
-    if to_json(_kwargs["bindings"]) == to_json([{}]):
-        _kwargs["bindings"] = []
-    else:
-        bindings_annotation = get_origin(params["bindings"].annotation)
-        if "bindings" in _kwargs and (bindings_annotation is not None) and issubclass(bindings_annotation, list):
-            # if "bindings" in _kwargs and issubclass(params["bindings"].annotation, BindingsBase):
-            cls_annotations = get_args(params["bindings"].annotation)
-            if len(cls_annotations) == 1 and issubclass(cls_annotations[0], BindingsBase):
-                _kwargs["bindings"] = [cls_annotations[0](**b) for b in _kwargs["bindings"]]
-    return _kwargs
+    __slots__ = ("pass_ki_id", "pass_bindings", "bindings_cls")
+    pass_ki_id: bool
+    pass_bindings: bool
+    bindings_cls: Optional[Type[BindingsBase]]
+
+    def __init__(self, params: Dict[str, inspect.Parameter]):
+        self.pass_ki_id = "ki_id" in params
+        self.pass_bindings = "bindings" in params
+        self.bindings_cls = None
+        if self.pass_bindings:
+            annotation = params["bindings"].annotation
+            bindings_annotation = get_origin(annotation)
+            if isinstance(bindings_annotation, type) and issubclass(bindings_annotation, list):
+                cls_annotations = get_args(annotation)
+                if len(cls_annotations) == 1 and isinstance(cls_annotations[0], type) \
+                        and issubclass(cls_annotations[0], BindingsBase):
+                    self.bindings_cls = cls_annotations[0]
+
+    def kwargs(self, wrapper_args) -> Dict[str, Any]:
+        """
+        :param wrapper_args: (ki_id, N3 bindings) of the handle request
+        :return: handler kwargs
+        """
+        _kwargs = {}
+        if self.pass_ki_id:
+            _kwargs["ki_id"] = wrapper_args[0]
+        if self.pass_bindings:
+            bindings = wrapper_args[1]
+            if bindings is not None and len(bindings) == 1 and not bindings[0]:
+                # KE binding set without bindings: [{}]
+                bindings = []
+            elif self.bindings_cls is not None:
+                bindings_cls = self.bindings_cls
+                bindings = [bindings_cls(**b) for b in bindings]
+            _kwargs["bindings"] = bindings
+        return _kwargs
 
 
 # endregion
@@ -89,7 +86,15 @@ class KIHolder:
     def list_ki(self):
         return self._client_ki.values()
 
-    def try_extend_ki(self, graph_pattern: GraphPattern, ki_type: Union[str, EnumItem], handler: Optional[Callable]):
+    def mismatch_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        :return: input/output bindings mismatch check stats of the REACT/ANSWER KIs by KI name
+        """
+        return {ki.ki_name: ki.mismatch_checker.stats() for ki in self._client_ki.values()
+                if ki.ki_type in (KnowledgeInteractionType.REACT, KnowledgeInteractionType.ANSWER)}
+
+    def try_extend_ki(self, graph_pattern: GraphPattern, ki_type: Union[str, EnumItem], handler: Optional[Callable],
+                      ordered: Optional[bool] = None):
         from ke_client.gp_ext import get_gp_extender
         from ke_client import ke_settings
         if not ke_settings.extend_graph_patterns:
@@ -105,31 +110,48 @@ class KIHolder:
         extended_ki = gp_ext.match_ki(ki_name=ki_pattern.ki_name, graph_pattern=graph_pattern, handler=handler)
         logging.info(f"Extending {ki_pattern.ki_name} with {len(extended_ki)} ki patterns .")
         for ki in extended_ki:
+            ki.ordered = ordered
             if ki.ki_name in self._client_ki:
                 raise Exception(f"Duplicate knowledge interaction: 'ext_*-{graph_pattern.name}' ({ki.ki_type}).")
             self._client_ki[ki.ki_name] = ki
 
-    def _set_ki_(self, gp_name: str, handler, ki_type: Union[str, EnumItem], call_ctx: str) -> KnowledgeInteraction:
+    def _set_ki_(self, gp_name: str, handler, ki_type: Union[str, EnumItem], call_ctx: str,
+                 ordered: Optional[bool] = None, mismatch_check: Optional[str] = None) -> KnowledgeInteraction:
         from ke_client.client._ki_utils import require_graph_pattern, try_validate_gp
         gp = require_graph_pattern(gp_name)
 
         try_validate_gp(gp=gp)
 
-        def measured_handler(kb_id: str, bindings: Optional[List[Dict[str, Any]]]):
-            current_ts = time_utils.current_timestamp()
-            result = handler(kb_id, bindings)
-            t = time_utils.current_timestamp() - current_ts
-            if t > 2000:
-                logging.warning(f"Slow ({t} ms) KI handler ({call_ctx}) for {kb_id}")
-            return result
+        if inspect.iscoroutinefunction(handler):
+            # async REACT/ANSWER handlers (AsyncKIHolder)
+            async def measured_handler(kb_id: str, bindings: Optional[List[Dict[str, Any]]]):
+                current_ts = time_utils.current_timestamp()
+                result = await handler(kb_id, bindings)
+                t = time_utils.current_timestamp() - current_ts
+                if t > 2000:
+                    logging.warning(f"Slow ({t} ms) KI handler ({call_ctx}) for {kb_id}")
+                return result
+        else:
+            def measured_handler(kb_id: str, bindings: Optional[List[Dict[str, Any]]]):
+                current_ts = time_utils.current_timestamp()
+                result = handler(kb_id, bindings)
+                t = time_utils.current_timestamp() - current_ts
+                if t > 2000:
+                    logging.warning(f"Slow ({t} ms) KI handler ({call_ctx}) for {kb_id}")
+                return result
 
         ki = KnowledgeInteraction(ki_name=gp.ki_name(ki_type=ki_type), handler=measured_handler, ki_type=ki_type,
-                                  graph_pattern=gp)
+                                  graph_pattern=gp, ordered=ordered, mismatch_check=mismatch_check)
+        # compile the bindings validation on declaration
+        ki.validation_plan
+        if ki_type in (KnowledgeInteractionType.REACT, KnowledgeInteractionType.ANSWER):
+            # fail on declaration for invalid mismatch check mode
+            ki.mismatch_checker
         if ki.ki_name in self._client_ki:
             raise Exception(f"Duplicate knowledge interaction '{gp.name}' ({ki.ki_type}).")
         self._client_ki[ki.ki_name] = ki
 
-        self.try_extend_ki(graph_pattern=gp, ki_type=ki_type, handler=measured_handler)
+        self.try_extend_ki(graph_pattern=gp, ki_type=ki_type, handler=measured_handler, ordered=ordered)
         return ki
 
     @staticmethod
@@ -150,14 +172,35 @@ class KIHolder:
         self._ke_client = ke_client
         self._kb_id = kb_id
 
+    def _post_chunks_(self, chunking: PostChunking, bindings, ki: KnowledgeInteraction, ki_id: str,
+                      call_ctx: str) -> KIPostResponse:
+        bodies = chunking.prepare(bindings=bindings, ki=ki, call_ctx=call_ctx)
+        if len(bodies) == 1:
+            return self._client.post_ke(bindings=bodies[0], ki_id=ki_id, ki_name=ki.ki_name)
+        logging.info(f"POST {ki_id}: {len(bodies)} chunks")
+        results = run_batch([partial(self._client.post_ke, bindings=body, ki_id=ki_id, ki_name=ki.ki_name)
+                             for body in bodies], max_concurrency=chunking.max_concurrency)
+        return merge_chunk_results(results, ki_name=ki.ki_name)
+
     # region deco
-    def post(self, name: str) -> \
+    def post(self, name: str, chunk_bindings: Optional[int] = None, chunk_bytes: Optional[int] = None,
+             chunk_concurrency: int = 4) -> \
             Callable[
                 [
                     [Callable[..., KIBindings]],
                 ], Callable[..., KIPostResponse]]:
+        """
+        :param name: graph pattern name
+        :param chunk_bindings: split the bindings into requests with max. `chunk_bindings` bindings, None - no limit
+        :param chunk_bytes: split the bindings into requests with max. `chunk_bytes` JSON body, None - no limit
+        :param chunk_concurrency: max. number of chunks sent at the same time. The responses of multiple chunks are
+         merged into a `KIChunkedPostResponse`.
+        """
         # ki : GraphPattern = init_ki_graph_pattern(name, KnowledgeInteractionTypeName.POST)
         call_ctx = self._deco_ctx()
+        chunking = PostChunking(max_bindings=chunk_bindings, max_bytes=chunk_bytes,
+                                max_concurrency=chunk_concurrency) \
+            if chunk_bindings is not None or chunk_bytes is not None else None
 
         def deco(func: Callable[..., KIBindings]) -> Callable[..., KIPostResponse]:
             ki: KnowledgeInteraction = self._set_ki_(gp_name=name, handler=func,
@@ -177,9 +220,13 @@ class KIHolder:
                 logging.info(f"POST init bindings: {ki_id}")
                 post_bindings = func(*wrapper_args, **kwargs)
 
-                ke_request_json = prepare_ke_request(bindings=post_bindings, ki=ki, call_ctx=call_ctx)
-                ki_post_response: KIPostResponse = self._client.post_ke(bindings=ke_request_json, ki_id=ki_id,
-                                                                        ki_name=ki.ki_name)
+                if chunking is not None:
+                    ki_post_response = self._post_chunks_(chunking=chunking, bindings=post_bindings, ki=ki,
+                                                          ki_id=ki_id, call_ctx=call_ctx)
+                else:
+                    ke_request_json = prepare_ke_request(bindings=post_bindings, ki=ki, call_ctx=call_ctx)
+                    ki_post_response: KIPostResponse = self._client.post_ke(bindings=ke_request_json, ki_id=ki_id,
+                                                                            ki_name=ki.ki_name)
 
                 t = time_utils.current_timestamp() - current_ts
                 if t > 5000:
@@ -227,15 +274,25 @@ class KIHolder:
                 if t > 5000:
                     logging.warning(
                         f"Long ({t} ms) KI {ki_id}, [{len(ask_bindings)}] -> [{len(result_bindings.binding_set)}]")
-                logging.debug(f"ASK-{ki_id}-result: {str(result_bindings)[:1024]}")
+                if logging.getLogger().isEnabledFor(logging.DEBUG):
+                    # str() of a large response is expensive
+                    logging.debug(f"ASK-{ki_id}-result: {str(result_bindings)[:1024]}")
                 return result_bindings
 
             return wrapper
 
         return deco
 
-    def react(self, name: str) -> Callable[[Callable[[str, Optional[KIBindings]], KIBindings]], \
-            Callable[[str, Optional[KIBindings]], KIBindings]]:
+    def react(self, name: str, ordered: Optional[bool] = None, mismatch_check: Optional[str] = None) -> \
+            Callable[[Callable[[str, Optional[KIBindings]], KIBindings]],
+                     Callable[[str, Optional[KIBindings]], KIBindings]]:
+        """
+        :param name: graph pattern name
+        :param ordered: process handle requests in arrival order when the client dispatches them to the worker pool,
+         None - client's default
+        :param mismatch_check: check that the output bindings keep the input values: `full`, `sampled`, `off`,
+         None - client's default
+        """
         call_ctx = self._deco_ctx()
 
         def deco(func: Callable[[str, Optional[KIBindings]], KIBindings]) -> \
@@ -248,31 +305,40 @@ class KIHolder:
             verify_out_bindings_ki(gp_name=name, bindings_annotation=func_sig.return_annotation,
                                    call_ctx=call_ctx)
 
+            invocation_plan = _InvocationPlan(params)
             ki: KnowledgeInteraction
 
             # def wrapper(*wrapper_args,**kwargs ) -> KIBindings:
             @wraps(func)
             def wrapper(*wrapper_args) -> KIBindings:
-                _kwargs = _init_ki_kwargs(wrapper_args=wrapper_args, params=params)
-                ki_id = _kwargs["ki_id"] if "ki_id" in _kwargs else None
+                _kwargs = invocation_plan.kwargs(wrapper_args)
+                ki_id = wrapper_args[0]
                 post_input_bindings = _kwargs["bindings"] if "bindings" in _kwargs else None
                 logging.info(f"REACT init bindings: {ki_id}")
                 react_bindings: Union[List[Dict], List[BindingsBase]] = func(**_kwargs)
                 if react_bindings is None:
                     logging.warning(f"Undefined react_bindings for {ki_id}, setting empty list")
                     react_bindings = []
-                _verify_mismatched_bindings(ki_id, post_input_bindings, react_bindings)
+                ki.mismatch_checker.check(ki_id, post_input_bindings, react_bindings)
                 ke_request_json = prepare_ke_request(bindings=react_bindings, ki=ki, call_ctx=call_ctx)
                 return ke_request_json
 
             wrapper.__name__ = wrapper.__name__ + "_" + func.__name__
             ki: KnowledgeInteraction = self._set_ki_(gp_name=name, handler=wrapper,
-                                                     ki_type=KnowledgeInteractionType.REACT, call_ctx=call_ctx)
+                                                     ki_type=KnowledgeInteractionType.REACT, call_ctx=call_ctx,
+                                                     ordered=ordered, mismatch_check=mismatch_check)
             return wrapper
 
         return deco
 
-    def answer(self, name: str):
+    def answer(self, name: str, ordered: Optional[bool] = None, mismatch_check: Optional[str] = None):
+        """
+        :param name: graph pattern name
+        :param ordered: process handle requests in arrival order when the client dispatches them to the worker pool,
+         None - client's default
+        :param mismatch_check: check that the output bindings keep the input values: `full`, `sampled`, `off`,
+         None - client's default
+        """
         # gp: GraphPattern = init_ki_graph_pattern(name, KnowledgeInteractionTypeName.ANSWER)
         call_ctx = self._deco_ctx()
 
@@ -282,25 +348,27 @@ class KIHolder:
                       param.kind == inspect.Parameter.POSITIONAL_OR_KEYWORD}
             verify_in_bindings_ki(gp_name=name, params=params, call_ctx=call_ctx)
             verify_out_bindings_ki(gp_name=name, bindings_annotation=func_sig.return_annotation, call_ctx=call_ctx)
+            invocation_plan = _InvocationPlan(params)
             ki: KnowledgeInteraction
 
             def wrapper(*wrapper_args):
-                _kwargs = _init_ki_kwargs(wrapper_args=wrapper_args, params=params)
-                ki_id = _kwargs["ki_id"] if "ki_id" in _kwargs else None
+                _kwargs = invocation_plan.kwargs(wrapper_args)
+                ki_id = wrapper_args[0]
                 input_bindings: List[Union[dict, BindingsBase]] = _kwargs["bindings"] if "bindings" in _kwargs else None
 
                 logging.info(f"ANSWER init bindings: {ki_id}")
                 logging.debug(f"ANSWER init bindings: {ki_id} :{input_bindings}")
-                _verify_required_bindings(gp=ki.graph_pattern, ki_bindings=input_bindings, call_ctx=call_ctx)
+                ki.validation_plan.verify_required(ki_bindings=input_bindings, call_ctx=call_ctx)
 
                 answer_bindings = func(**_kwargs)
-                _verify_mismatched_bindings(ki_id, input_bindings, answer_bindings)
+                ki.mismatch_checker.check(ki_id, input_bindings, answer_bindings)
                 ke_request_json = prepare_ke_request(bindings=answer_bindings, ki=ki, call_ctx=call_ctx)
                 return ke_request_json
 
             wrapper.__name__ = wrapper.__name__ + "_" + func.__name__
             ki: KnowledgeInteraction = self._set_ki_(gp_name=name, handler=wrapper,
-                                                     ki_type=KnowledgeInteractionType.ANSWER, call_ctx=call_ctx)
+                                                     ki_type=KnowledgeInteractionType.ANSWER, call_ctx=call_ctx,
+                                                     ordered=ordered, mismatch_check=mismatch_check)
 
             return wrapper
 
@@ -0,0 +1,125 @@
+from threading import Lock
+from typing import Dict, Any, List, Optional, Set, Union
+
+from rdflib.term import Node
+
+from ._ki_bindings import BindingsBase
+from ._ki_exceptions import KITypeError
+from ._ki_frame import BindingSetFrame
+from ._n3 import format_n3
+
+MISMATCH_CHECK_MODES = ["full", "sampled", "off"]
+
+
+def _binding_values(ki_binding: Union[BindingsBase, Dict[str, Any]]) -> Dict[str, Any]:
+    if type(ki_binding) is dict:
+        return ki_binding
+    if isinstance(ki_binding, BindingsBase):
+        return ki_binding.__dict__
+    raise KITypeError(f"Invalid type bindings type: {type(ki_binding)} ", ctx="verify_mismatched_bindings")
+
+
+def _term(v: Any, n3_cache: Dict[int, str]) -> str:
+    """
+    :param n3_cache: N3 of the rdflib nodes by object id, nodes shared by the bindings (term cache) are serialized once
+    """
+    if type(v) is str:
+        return v
+    term = n3_cache.get(id(v))
+    if term is None:
+        term = n3_cache[id(v)] = format_n3(v) if isinstance(v, Node) else str(v)
+    return term
+
+
+class BindingsMismatchCheck:
+    """
+    Verifies that REACT/ANSWER output bindings don't change the values of the input variables: hash join of the output
+    (variable, term) pairs with the input pairs, N3 terms of the rdflib nodes are serialized once per check.
+    Modes: `full` - all output bindings, `sampled` - up to `sample_size` evenly spaced output bindings, `off` - no check.
+    """
+    mode: str
+    sample_size: int
+
+    def __init__(self, mode: str = "full", sample_size: int = 100):
+        """
+        :param mode: `full`, `sampled` or `off`
+        :param sample_size: number of output bindings verified in `sampled` mode
+        """
+        if mode not in MISMATCH_CHECK_MODES:
+            raise ValueError(f"Unknown mismatch check mode: '{mode}'. Valid options: {', '.join(MISMATCH_CHECK_MODES)}")
+        if sample_size <= 0:
+            raise ValueError(f"Invalid mismatch check sample size: {sample_size}")
+        self.mode = mode
+        self.sample_size = sample_size
+        self._lock = Lock()
+        # region stats
+        self._checks = 0
+        self._verified = 0
+        self._mismatches = 0
+        # endregion
+
+    def _sample(self, n: int) -> Optional[range]:
+        """
+        :return: indices of the verified output bindings, None - all
+        """
+        if self.mode == "sampled" and n > self.sample_size:
+            return range(0, n, n // self.sample_size)[:self.sample_size]
+        return None
+
+    def check(self, ki_id: str, input_bindings: Optional[List[Union[BindingsBase, Dict[str, Any]]]],
+              output_bindings: Union[List[Union[BindingsBase, Dict[str, Any]]], BindingSetFrame, None]):
+        """
+        :raise Exception: output bindings change the values of input variables
+        """
+        if self.mode == "off" or not input_bindings or not output_bindings:
+            return
+        n3_cache: Dict[int, str] = {}
+        # (variable, term) keys of the input bindings: variable -> N3 terms, unbound (None) variables are skipped
+        input_terms: Dict[str, Set[str]] = {}
+        for ib in input_bindings:
+            for k, v in _binding_values(ib).items():
+                if v is None:
+                    continue
+                terms = input_terms.get(k)
+                if terms is None:
+                    terms = input_terms[k] = set()
+                terms.add(v if type(v) is str else _term(v, n3_cache))
+        indices = self._sample(len(output_bindings))
+        err_set = set()
+        if type(output_bindings) is BindingSetFrame:
+            verified = len(output_bindings) if indices is None else len(indices)
+            for k, terms in input_terms.items():
+                if k in output_bindings:
+                    column = output_bindings[k]
+                    if indices is not None:
+                        column = [column[i] for i in indices]
+                    err_set.update(f"{k}:{term}" for term in set(column).difference(terms) if term is not None)
+        else:
+            outputs = output_bindings if indices is None else [output_bindings[i] for i in indices]
+            verified = len(outputs)
+            columns = list(input_terms.items())
+            for ob in outputs:
+                values = _binding_values(ob)
+                # only the input variables of the output are serialized
+                for k, terms in columns:
+                    v = values.get(k)
+                    if v is None:
+                        continue
+                    term = v if type(v) is str else _term(v, n3_cache)
+                    if term not in terms:
+                        err_set.add(f"{k}:{term}")
+        with self._lock:
+            self._checks += 1
+            self._verified += verified
+            if len(err_set) > 0:
+                self._mismatches += 1
+        if len(err_set) > 0:
+            raise Exception(f"input bindings don't match output bindings for:{ki_id} =  {err_set}")
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        :return: mode, number of checks, verified output bindings and checks which detected mismatched bindings
+        """
+        with self._lock:
+            return {"mode": self.mode, "checks": self._checks, "verified_bindings": self._verified,
+                    "mismatches": self._mismatches}
@@ -4,12 +4,14 @@ import sys
 from types import ModuleType
 from typing import Dict, Any, List, Optional, get_origin, get_args, Union
 
+import orjson
 from pydantic import BaseModel
 
 from ke_client.ki_model import GraphPattern
-from ke_client.ki_model import rdf_binding_pattern, KnowledgeInteractionType, KnowledgeInteraction
+from ke_client.ki_model import KnowledgeInteractionType, KnowledgeInteraction
 from ke_client.utils.enum_utils import EnumItem
 from ._ki_bindings import BindingsBase, TargetedBindings
+from ._ki_frame import BindingSetFrame
 from ._ki_exceptions import KIError, PatternError
 
 
@@ -46,14 +48,12 @@ def try_validate_gp(gp: GraphPattern):
     from ke_client import ke_settings
     if ke_settings.validate_graph_patterns:
         from ke_client.validation import get_validator
-        from ke_client.gp_ext._sub_graph_utils import parse_turtle_pattern
         prefix_namespace = gp.prefix_namespace
-        pattern_triples = parse_turtle_pattern(gp.pattern_value, prefixes=prefix_namespace)
-        pattern_errors = get_validator().validate_pattern(pattern_triples=pattern_triples,
+        pattern_errors = get_validator().validate_pattern(pattern_triples=gp.pattern_triples,
                                                           namespaces=prefix_namespace.values())
         result_pattern_errors = None
         if gp.result_pattern_value is not None:
-            result_pattern_triples = parse_turtle_pattern(gp.result_pattern_value, prefixes=gp.prefix_namespace)
+            result_pattern_triples = gp.result_pattern_triples
             result_pattern_errors = get_validator().validate_pattern(pattern_triples=result_pattern_triples,
                                                                      namespaces=prefix_namespace.values())
         if pattern_errors or result_pattern_errors:
@@ -144,11 +144,20 @@ def verify_out_bindings_ki(gp_name: str, bindings_annotation, call_ctx: str):
         _verify_object_ki(gp_name=gp_name, bindings_arg_annotation=bindings_annotation, call_ctx=call_ctx)
 
 
-def _serialize_returned_bindings(bindings: Union[TargetedBindings, List[BindingsBase], List[Dict], None],
+def _serialize_returned_bindings(bindings: Union[TargetedBindings, BindingSetFrame, List[BindingsBase],
+                                                 List[Dict], None],
                                  ki_type: EnumItem, graph_pattern_name: str) -> \
-        Union[Dict, List[Dict[str, str]]]:
+        Union[Dict, List[Dict[str, str]], List[BindingsBase]]:
+    """
+    :return: KE request: binding set or targeted request dict, `BindingsBase` objects are kept (serialized by
+     `encode_ke_request`)
+    """
     if bindings is None:
         bindings = []
+    if type(bindings) is BindingSetFrame:
+        logging.debug(f"{ki_type} bindings: {graph_pattern_name} = {bindings}")
+        # ASK KI allows to send part of graph pattern bindings
+        return bindings.to_binding_set(skip_none=ki_type == KnowledgeInteractionType.ASK)
     if type(bindings) is TargetedBindings:
         if len(bindings.bindings) > 5:
             dots = f"...[{len(bindings.bindings) - 5}]"
@@ -157,17 +166,13 @@ def _serialize_returned_bindings(bindings: Union[TargetedBindings, List[Bindings
         logging.debug(
             f"{ki_type} bindings: {graph_pattern_name} , with: {bindings.knowledge_bases} = {bindings.bindings[:5]}{dots} ")
         # bindings: TargetedBindings
-        return bindings.json(ki_type=ki_type)
+        return bindings.json(ki_type=ki_type, serialize=False)
     if type(bindings) is not list:
         bindings = [bindings]
     if len(bindings) == 0:
         logging.debug(
             f"{ki_type} bindings: {graph_pattern_name} = []")
         return bindings
-    # if issubclass(type(bindings ), TargetedBindings)  :
-    if issubclass(type(bindings[0]), BindingsBase):
-        b: BindingsBase
-        bindings = [b.serialize(ki_type=ki_type) for b in bindings]
     if len(bindings) > 5:
         dots = f"...[{len(bindings) - 5}]"
     else:
@@ -177,68 +182,46 @@ def _serialize_returned_bindings(bindings: Union[TargetedBindings, List[Bindings
     return bindings
 
 
-def prepare_ke_request(bindings: Union[TargetedBindings, List[BindingsBase], List[Dict], None],
-                       ki: KnowledgeInteraction, call_ctx):
-    ki_bindings = _serialize_returned_bindings(bindings=bindings, ki_type=ki.ki_type,
-                                               graph_pattern_name=ki.graph_pattern.name)
+def encode_ke_request(ke_request: Union[Dict, List[Dict[str, str]], List[BindingsBase]], ki_type: EnumItem) -> bytes:
+    """
+    encode KE request body in a single pass, `BindingsBase` objects are written by orjson straight to the JSON bytes,
+    the N3 bindings of a row are released as soon as the row is written
+    :param ke_request: binding set or request dict, with N3 bindings or `BindingsBase` objects
+    :param ki_type: ASK - unbound (None) variables are skipped, otherwise sent as rdf:nil
+    :return: JSON body
+    """
 
-    if type(bindings) is TargetedBindings:
-        _verify_pattern_bindings(name=ki.graph_pattern.name, ki_type=ki.ki_type, ki_bindings=ki_bindings["bindingSet"],
-                                 call_ctx=call_ctx)
+    def default(obj):
+        if isinstance(obj, BindingsBase):
+            return obj.serialize(ki_type=ki_type)
+        raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
 
-    else:
-        _verify_pattern_bindings(name=ki.graph_pattern.name, ki_type=ki.ki_type, ki_bindings=ki_bindings,
-                                 call_ctx=call_ctx)
-    return ki_bindings
+    return orjson.dumps(ke_request, default=default)
 
 
-def _verify_pattern_bindings(name: str, ki_type: EnumItem, ki_bindings: Optional[List[Dict]] = None,
-                             call_ctx: Optional[str] = None):
+def verified_ke_request(bindings: Union[TargetedBindings, BindingSetFrame, List[BindingsBase], List[Dict], None],
+                        ki: KnowledgeInteraction, call_ctx) -> Union[Dict, List[Dict[str, str]], List[BindingsBase]]:
     """
-    verify pattern bindings before sending to the
-    :param name:
-    :param ki_type:
-    :param ki_bindings:
-    :param call_ctx:
-    :return:
+    verify the bindings
+    :return: KE request: binding set or targeted request dict (see `encode_ke_request`)
     """
-    if call_ctx is None:
-        raise ValueError("None call_ctx not supported")
-    gp: GraphPattern = require_graph_pattern(gp_name=name)
-    if ki_bindings is None:
-        # todo log warning ?
-        ki_bindings = []
-    if ki_type == KnowledgeInteractionType.ASK:
-        _verify_required_bindings(gp=gp, ki_bindings=ki_bindings, call_ctx=call_ctx)
-    elif len(ki_bindings) > 0:
-        if ki_type == KnowledgeInteractionType.REACT:
-            if gp.result_pattern_value is None:
-                gp_vars = {}
-            else:
-                gp_vars = {k[1:] for k in rdf_binding_pattern.findall(gp.result_pattern_value)}
-        else:
-            gp_vars = {k[1:] for k in rdf_binding_pattern.findall(gp.pattern_value)}
-        for ki_binding in ki_bindings:
-            args_missing = [ki_arg for ki_arg in ki_binding.keys() if ki_arg not in gp_vars]
-            if len(args_missing) > 0:
-                raise KIError(
-                    f" KI {ki_type}:{name} is missing variables: "
-                    f"{",".join([f"'{v}'" for v in args_missing])} ", ctx=call_ctx)
+    ki_bindings = _serialize_returned_bindings(bindings=bindings, ki_type=ki.ki_type,
+                                               graph_pattern_name=ki.graph_pattern.name)
+
+    if type(bindings) is TargetedBindings:
+        ki.validation_plan.verify(ki_bindings=ki_bindings["bindingSet"], call_ctx=call_ctx)
+    else:
+        ki.validation_plan.verify(ki_bindings=ki_bindings, call_ctx=call_ctx)
+    return ki_bindings
 
 
-def _verify_required_bindings(gp: GraphPattern, ki_bindings: Optional[List[Dict]] = None,
-                              call_ctx: Optional[str] = None):
+def prepare_ke_request(bindings: Union[TargetedBindings, BindingSetFrame, List[BindingsBase], List[Dict], None],
+                       ki: KnowledgeInteraction, call_ctx) -> bytes:
     """
-    :param call_ctx:
-    :param gp:
-    :param ki_bindings:
-    :return:
+    verify the bindings and encode the KE request body
+    :return: JSON body (`KERequest`)
     """
-    for ki_binding in ki_bindings:
-        try:
-            gp.verify_required_bindings(bindings=ki_binding)
-        except KeyError as err:
-            raise KIError(f"Invalid ki bindings: {err}", ctx=call_ctx) from err
+    return encode_ke_request(verified_ke_request(bindings=bindings, ki=ki, call_ctx=call_ctx), ki_type=ki.ki_type)
 
 
 def ki_object(name: str, allow_partial: bool = False, result: bool = False):
@@ -252,9 +235,9 @@ def ki_object(name: str, allow_partial: bool = False, result: bool = False):
     """
     gp: GraphPattern = require_graph_pattern(gp_name=name)
     if not result:
-        gp_vars = {k[1:] for k in rdf_binding_pattern.findall(gp.pattern_value)}
+        gp_vars = gp.pattern_var_set
     else:
-        gp_vars = {k[1:] for k in rdf_binding_pattern.findall(gp.result_pattern_value)}
+        gp_vars = gp.result_pattern_var_set
 
     def deco(cls):
         if issubclass(cls, BaseModel):
@@ -276,6 +259,9 @@ def ki_object(name: str, allow_partial: bool = False, result: bool = False):
                     f"Graph: {name} is missing variables: "
                     f"{",".join([f"'{v}'" for v in variables_missing])} from class {cls.__module__}.{cls.__name__}")
         cls.__gp_name__ = name
+        if isinstance(cls, type) and issubclass(cls, BindingsBase):
+            # compile the wire format codec on decoration
+            cls.codec()
         return cls
 
     return deco
@@ -0,0 +1,153 @@
+from types import UnionType
+from typing import Dict, List, Optional, Union, Iterable, Type, Any, get_origin, get_args
+
+from ke_client.ki_model import GraphPattern, KnowledgeInteractionType
+from ke_client.utils.enum_utils import EnumItem
+from ._ki_bindings import BindingsBase
+from ._ki_exceptions import KIError
+
+
+def _none_allowed(annotation: Any) -> bool:
+    """
+    :return: True if the field annotation accepts None (`Optional[...]`, `... | None`, `Any`)
+    """
+    if annotation is Any or annotation is None or annotation is type(None):
+        return True
+    if get_origin(annotation) in (Union, UnionType):
+        return any(_none_allowed(t) for t in get_args(annotation))
+    return False
+
+
+def _binding_variables(ki_binding: Union[Dict, BindingsBase], skip_none: bool):
+    """
+    :param skip_none: skip unbound variables of `BindingsBase` objects (not sent in ASK requests)
+    :return: variables of the N3 bindings sent to the KE
+    """
+    if isinstance(ki_binding, BindingsBase):
+        if skip_none:
+            return {k for k, v in ki_binding.__dict__.items() if v is not None}
+        return ki_binding.__dict__.keys()
+    return ki_binding.keys()
+
+
+class KIValidationPlan:
+    """
+    Validation of the bindings sent for a knowledge interaction, compiled once per KI: graph pattern variables and
+    required bindings are frozen sets, so a binding is verified with a single set operation.
+    POST/REACT/ANSWER `BindingsBase` objects are verified once per class (object fields are the class fields).
+    In trusted mode the bindings of a `BindingsBase` class matching the pattern are not verified at all.
+    """
+    name: str
+    ki_type: EnumItem
+    pattern_variables: frozenset
+    result_variables: frozenset
+    # variables of the bindings sent by the KI (REACT - result pattern)
+    variables: frozenset
+    required: frozenset
+    trusted: bool
+
+    def __init__(self, graph_pattern: GraphPattern, ki_type: EnumItem, trusted: bool = False):
+        """
+        :param graph_pattern:
+        :param ki_type:
+        :param trusted: skip verification of `BindingsBase` outputs of classes matching the pattern
+        """
+        self.name = graph_pattern.name
+        self.ki_type = ki_type
+        self.pattern_variables = graph_pattern.pattern_var_set
+        self.result_variables = graph_pattern.result_pattern_var_set
+        self.variables = self.result_variables if ki_type == KnowledgeInteractionType.REACT \
+            else self.pattern_variables
+        self.required = frozenset(graph_pattern.required_bindings) if graph_pattern.required_bindings is not None \
+            else frozenset()
+        self.trusted = trusted
+        # BindingsBase class -> class fields match the pattern
+        self._class_matches_: Dict[type, bool] = {}
+
+    def _missing_required_(self, variables) -> Optional[str]:
+        if self.required.issubset(variables):
+            return None
+        missing = [k for k in self.required if k not in variables][0]
+        return f"Binding key={missing} missing in {sorted(self.required)}. "
+
+    def matches_class(self, binding_obj_cls: Type[BindingsBase]) -> bool:
+        """
+        :return: True if all objects of the class are valid bindings: fields are pattern variables (ASK: required
+         bindings are required fields not accepting None)
+        """
+        matches = self._class_matches_.get(binding_obj_cls)
+        if matches is None:
+            model_fields = binding_obj_cls.model_fields
+            if self.ki_type == KnowledgeInteractionType.ASK:
+                # a required field can still be set to None (`x: Optional[URIRef]` without default)
+                matches = self.required.issubset({k for k, f in model_fields.items()
+                                                  if f.is_required() and not _none_allowed(f.annotation)})
+            else:
+                matches = self.variables.issuperset(model_fields.keys())
+            self._class_matches_[binding_obj_cls] = matches
+        return matches
+
+    def is_trusted(self, ki_bindings: List[Union[Dict, BindingsBase]]) -> bool:
+        """
+        :return: True if the bindings are not verified: trusted mode and all bindings are objects of one class
+         matching the pattern
+        """
+        if not self.trusted or len(ki_bindings) == 0:
+            return False
+        binding_cls = type(ki_bindings[0])
+        if not issubclass(binding_cls, BindingsBase) or not self.matches_class(binding_cls):
+            return False
+        return all(type(ki_binding) is binding_cls for ki_binding in ki_bindings)
+
+    def verify(self, ki_bindings: Optional[List[Union[Dict, BindingsBase]]], call_ctx: Optional[str] = None):
+        """
+        verify bindings before sending them to the KE
+        :param ki_bindings: N3 bindings or `BindingsBase` objects
+        :param call_ctx:
+        """
+        if call_ctx is None:
+            raise ValueError("None call_ctx not supported")
+        if not ki_bindings or self.is_trusted(ki_bindings):
+            return
+        ask = self.ki_type == KnowledgeInteractionType.ASK
+        if ask and not self.required:
+            return
+        variables = self.variables
+        required = self.required
+        # last verified class (POST, REACT, ANSWER), objects of the same class have the same fields
+        verified_cls = None
+        for ki_binding in ki_bindings:
+            binding_cls = type(ki_binding)
+            if binding_cls is verified_cls:
+                continue
+            if ask:
+                if binding_cls is dict:
+                    if required.issubset(ki_binding.keys()):
+                        continue
+                elif isinstance(ki_binding, BindingsBase):
+                    values = ki_binding.__dict__
+                    # unbound (None) variables are not sent
+                    if all(values.get(k) is not None for k in required):
+                        continue
+                err = self._missing_required_(_binding_variables(ki_binding, skip_none=True))
+                if err is not None:
+                    raise KIError(f"Invalid ki bindings: {err}", ctx=call_ctx)
+            elif isinstance(ki_binding, BindingsBase) and self.matches_class(binding_cls):
+                verified_cls = binding_cls
+            elif not variables.issuperset(_binding_variables(ki_binding, skip_none=False)):
+                args_missing = _binding_variables(ki_binding, skip_none=False) - variables
+                raise KIError(
+                    f" KI {self.ki_type}:{self.name} is missing variables: "
+                    f"{",".join([f"'{v}'" for v in sorted(args_missing)])} ", ctx=call_ctx)
+
+    def verify_required(self, ki_bindings: Optional[Iterable[Union[Dict, BindingsBase]]],
+                        call_ctx: Optional[str] = None):
+        """
+        verify required bindings of the received bindings (ANSWER input)
+        """
+        if not self.required or ki_bindings is None:
+            return
+        for ki_binding in ki_bindings:
+            err = self._missing_required_(_binding_variables(ki_binding, skip_none=False))
+            if err is not None:
+                raise KIError(f"Invalid ki bindings: {err}", ctx=call_ctx)
@@ -0,0 +1,145 @@
+import logging
+import time
+from datetime import datetime, timezone
+from logging import Logger
+from threading import Thread, Event, Lock, current_thread
+from typing import Callable, Optional, Dict, Any
+
+from ke_client.ki_model import SmartConnectorLease
+
+
+class LeaseLostError(Exception):
+    """
+    the KE server doesn't know the smart connector (expired or removed), the knowledge base must be re-registered
+    """
+    pass
+
+
+class KELeaseRenewer:
+    """
+    Renews the smart connector lease (`PUT sc/lease/renew`) in a background thread, so the KE server doesn't clean up
+    the knowledge base. `on_lost` is called once when the lease is lost: the server rejected the renewal (404) or the
+    renewals failed until the lease expired.
+    """
+    # lease time range accepted by the KE server (`leaseRenewalTime`)
+    MIN_LEASE_TIME = 30
+    MAX_LEASE_TIME = 3600
+
+    lease_time: float
+    interval: float
+
+    def __init__(self, renew: Callable[[], SmartConnectorLease], lease_time: float, on_lost: Callable[[str], None],
+                 interval: Optional[float] = None, logger: Optional[Logger] = None):
+        """
+
+        :param renew: sends the renewal request, raises `LeaseLostError` if the smart connector is unknown
+        :param lease_time: lease time sent at the registration (`leaseRenewalTime`) in seconds
+        :param on_lost: called with the reason when the lease is lost (e.g. `reconnect`)
+        :param interval: seconds between renewals, default: 1/3 of `lease_time`
+        :param logger:
+        """
+        if not KELeaseRenewer.MIN_LEASE_TIME <= lease_time <= KELeaseRenewer.MAX_LEASE_TIME:
+            raise ValueError(f"Invalid lease time: {lease_time}, expected value between "
+                             f"{KELeaseRenewer.MIN_LEASE_TIME} and {KELeaseRenewer.MAX_LEASE_TIME} seconds")
+        self.lease_time = lease_time
+        self.interval = lease_time / 3.0 if interval is None else interval
+        if not 0 < self.interval < lease_time:
+            raise ValueError(f"Invalid lease renewal interval: {self.interval}, expected value between 0 and "
+                             f"lease time ({lease_time})")
+        self._renew = renew
+        self._on_lost = on_lost
+        self._logger_ = logging.getLogger() if logger is None else logger
+        self._lock = Lock()
+        self._thread_: Optional[Thread] = None
+        self._stop_event_: Optional[Event] = None
+        # region stats
+        self._renewals = 0
+        self._failures = 0
+        self._consecutive_failures = 0
+        self._lost = 0
+        self._last_renewal: Optional[datetime] = None
+        self._expires: Optional[datetime] = None
+        # local estimate of the expiry, independent of the server clock
+        self._expires_at = 0.0
+        # endregion
+
+    def start(self):
+        with self._lock:
+            if self._thread_ is not None:
+                return
+            # lease time starts with the registration
+            self._expires_at = time.monotonic() + self.lease_time
+            self._stop_event_ = Event()
+            self._thread_ = Thread(target=self._worker_, args=(self._stop_event_,), name="ke-lease", daemon=True)
+            self._thread_.start()
+
+    def stop(self, wait: bool = True):
+        """
+        :param wait: wait for the renewal in progress (joins the thread)
+        """
+        with self._lock:
+            thread, stop_event = self._thread_, self._stop_event_
+            self._thread_ = None
+            self._stop_event_ = None
+        if stop_event is not None:
+            stop_event.set()
+        if wait and thread is not None and thread is not current_thread():
+            thread.join()
+
+    @property
+    def is_running(self) -> bool:
+        thread = self._thread_
+        return thread is not None and thread.is_alive()
+
+    def _next_delay(self) -> float:
+        if self._consecutive_failures == 0:
+            return self.interval
+        # retry faster after a failure, but before the lease expires
+        return max(min(self.interval, (self._expires_at - time.monotonic()) / 2.0), 0.5)
+
+    def _worker_(self, stop_event: Event):
+        while not stop_event.wait(self._next_delay()):
+            try:
+                lease = self._renew()
+            except LeaseLostError as err:
+                self._lease_lost(stop_event, f"lease renewal rejected: {err}")
+                return
+            except Exception as err:
+                with self._lock:
+                    self._failures += 1
+                    self._consecutive_failures += 1
+                remaining = self._expires_at - time.monotonic()
+                if remaining <= 0:
+                    self._lease_lost(stop_event, f"lease expired, last renewal error: {err}")
+                    return
+                self._logger_.warning(f"Lease renewal failed: {err}, lease expires in {remaining:.1f} s")
+                continue
+            with self._lock:
+                self._renewals += 1
+                self._consecutive_failures = 0
+                self._last_renewal = datetime.now(timezone.utc)
+                self._expires = lease.expires
+                self._expires_at = time.monotonic() + self.lease_time
+
+    def _lease_lost(self, stop_event: Event, reason: str):
+        with self._lock:
+            self._lost += 1
+            if self._stop_event_ is stop_event:
+                self._thread_ = None
+                self._stop_event_ = None
+        if stop_event.is_set():
+            # stopped meanwhile
+            return
+        self._logger_.error(f"Smart connector lease lost: {reason}")
+        self._on_lost(reason)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        :return: renewal counters, time of the last renewal, lease expiry reported by the server
+         and the local estimate of seconds to expiry
+        """
+        with self._lock:
+            return {"renewals": self._renewals, "failures": self._failures,
+                    "consecutive_failures": self._consecutive_failures, "lost": self._lost,
+                    "last_renewal": self._last_renewal, "expires": self._expires,
+                    "expires_in": max(self._expires_at - time.monotonic(), 0.0) if self.is_running else None}
@@ -0,0 +1,70 @@
+import re
+from typing import Any
+
+from rdflib import URIRef, Literal
+from rdflib.term import Node
+from rdflib.util import from_n3
+
+from ._rdf_utils import rdf_nil
+
+# characters which require escaping (or unescaping) in N3 terms, handled by rdflib
+_ESCAPED = re.compile(r'[\\"\n\r]')
+# characters not allowed in N3 IRIs, rdflib raises an error for them
+_INVALID_IRI = re.compile(r'[<>" {}|\\^`]')
+
+
+def parse_n3(value: str) -> Node:
+    """
+    Parse a KE binding value: `<iri>`, `"lex"`, `"lex"^^<datatype>`, `"lex"@lang` or `rdf:nil`.
+    Values with escapes and other N3 forms (numbers, booleans, blank nodes, ...) are parsed with rdflib's `from_n3`.
+    :param value: N3 term
+    :return: URIRef or Literal
+    """
+    if not value:
+        return from_n3(value)
+    first = value[0]
+    if first == "<":
+        if value[-1] == ">" and "\\" not in value:
+            return URIRef(value[1:-1])
+    elif first == '"':
+        if value.startswith('"""'):
+            return from_n3(value)
+        end = value.rfind('"')
+        if end > 0:
+            lexical = value[1:end]
+            if "\\" not in lexical and '"' not in lexical:
+                tail = value[end + 1:]
+                if not tail:
+                    return Literal(lexical)
+                if tail.startswith("^^<") and tail[-1] == ">":
+                    return Literal(lexical, datatype=URIRef(tail[3:-1]))
+                if tail[0] == "@":
+                    return Literal(lexical, lang=tail[1:])
+    elif value == "rdf:nil":
+        return rdf_nil
+    return from_n3(value)
+
+
+def format_n3(node: Any) -> str:
+    """
+    Format a term in the KE wire format (same output as `node.n3()` without namespace manager)
+    :param node: URIRef, Literal or other rdflib node
+    :return: N3 term
+    """
+    t = type(node)
+    if t is URIRef:
+        if _INVALID_IRI.search(node) is not None:
+            return node.n3()
+        return f"<{node}>"
+    if t is Literal:
+        lexical = str(node)
+        if _ESCAPED.search(lexical) is not None:
+            return node.n3()
+        datatype = node.datatype
+        if datatype is not None:
+            return f'"{lexical}"^^<{datatype}>'
+        language = node.language
+        if language is not None:
+            return f'"{lexical}"@{language}'
+        return f'"{lexical}"'
+    return node.n3()
@@ -0,0 +1,131 @@
+import logging
+from typing import Dict, List, Optional, Union
+
+from pydantic import ConfigDict, Field
+
+from ke_client.ki_model import KIPostResponse, KnowledgeInteraction
+from ._batch import KIBatchResult
+from ._ki_bindings import BindingsBase, TargetedBindings
+from ._ki_frame import BindingSetFrame
+from ._ki_utils import verified_ke_request, encode_ke_request
+
+
+class KIChunkedPostResponse(KIPostResponse):
+    """
+    POST response merged from the responses of the chunks sent by a chunked POST KI, result bindings and exchanges
+    of the failed chunks are missing: check `ok`/`failed_chunks`
+    """
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+    # results in the order of the chunks, `response` - chunk's KIPostResponse. Not serialized, the merged response
+    # is dumped as a KIPostResponse
+    chunks: List[KIBatchResult] = Field(default_factory=list, exclude=True)
+
+    @property
+    def ok(self) -> bool:
+        return all(chunk.ok for chunk in self.chunks)
+
+    @property
+    def failed_chunks(self) -> List[KIBatchResult]:
+        return [chunk for chunk in self.chunks if not chunk.ok]
+
+    def raise_for_errors(self):
+        """
+        raise the error of the first failed chunk
+        """
+        for chunk in self.chunks:
+            if not chunk.ok:
+                raise chunk.error
+
+
+class PostChunking:
+    """
+    split of a POST binding set into requests with max. `max_bindings` bindings and max. `max_bytes` JSON body,
+    the bindings are verified once for the whole binding set
+    """
+    max_bindings: Optional[int]
+    max_bytes: Optional[int]
+    max_concurrency: int
+
+    def __init__(self, max_bindings: Optional[int] = None, max_bytes: Optional[int] = None, max_concurrency: int = 4):
+        """
+        :param max_bindings: max. number of bindings per request, None - no limit
+        :param max_bytes: max. size of the request body, None - no limit. A binding larger than the limit is sent
+         in its own request.
+        :param max_concurrency: max. number of chunks sent at the same time
+        """
+        if max_bindings is not None and max_bindings < 1:
+            raise ValueError(f"Invalid max_bindings: {max_bindings}")
+        if max_bytes is not None and max_bytes < 1:
+            raise ValueError(f"Invalid max_bytes: {max_bytes}")
+        if max_concurrency < 1:
+            raise ValueError(f"Invalid max_concurrency: {max_concurrency}")
+        self.max_bindings = max_bindings
+        self.max_bytes = max_bytes
+        self.max_concurrency = max_concurrency
+
+    def __repr__(self):
+        return f"PostChunking(max_bindings={self.max_bindings}, max_bytes={self.max_bytes}, " \
+               f"max_concurrency={self.max_concurrency})"
+
+    def prepare(self, bindings: Union[TargetedBindings, BindingSetFrame, List[BindingsBase], List[Dict], None],
+                ki: KnowledgeInteraction, call_ctx) -> List[bytes]:
+        """
+        verify the bindings and encode the KE request bodies of the chunks
+        :return: JSON bodies (`KERequest`) in the order of the bindings
+        """
+        ke_request = verified_ke_request(bindings=bindings, ki=ki, call_ctx=call_ctx)
+        if type(ke_request) is dict:
+            binding_set = ke_request["bindingSet"]
+
+            def build(part: list) -> Union[Dict, list]:
+                return {**ke_request, "bindingSet": part}
+        else:
+            binding_set = ke_request
+
+            def build(part: list) -> Union[Dict, list]:
+                return part
+
+        max_bindings = self.max_bindings
+        if max_bindings is None or len(binding_set) <= max_bindings:
+            parts = [binding_set]
+        else:
+            parts = [binding_set[i:i + max_bindings] for i in range(0, len(binding_set), max_bindings)]
+        bodies: List[bytes] = []
+        max_bytes = self.max_bytes
+
+        def encode(part: list):
+            body = encode_ke_request(build(part), ki_type=ki.ki_type)
+            if max_bytes is None or len(body) <= max_bytes:
+                bodies.append(body)
+            elif len(part) <= 1:
+                logging.warning(f"POST {ki.ki_name}: binding of {len(body)} bytes exceeds the chunk limit "
+                                f"({max_bytes} bytes)")
+                bodies.append(body)
+            else:
+                # bindings per chunk estimated from the average size of the encoded bindings
+                rows = max(1, int(len(part) * max_bytes / len(body) * 0.9))
+                for i in range(0, len(part), rows):
+                    encode(part[i:i + rows])
+
+        for p in parts:
+            encode(p)
+        return bodies
+
+
+def merge_chunk_results(results: List[KIBatchResult[KIPostResponse]], ki_name: str) -> KIChunkedPostResponse:
+    """
+    merge the POST responses of the chunks
+    :raise Exception: error of the first chunk if all chunks failed
+    """
+    responses = [result.response for result in results if result.ok]
+    if len(responses) == 0 and len(results) > 0:
+        raise results[0].error
+    failed = len(results) - len(responses)
+    if failed > 0:
+        logging.warning(f"POST {ki_name}: {failed} of {len(results)} chunks failed: "
+                        f"{', '.join(f'{r.index}: {r.error!r}' for r in results if not r.ok)}")
+    # the chunk responses are already validated
+    return KIChunkedPostResponse.model_construct(
+        resultBindingSet=[b for r in responses for b in r.result_binding_set],
+        exchangeInfo=[ei for r in responses for ei in r.exchangeInfo],
+        chunks=results)
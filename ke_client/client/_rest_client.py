@@ -2,10 +2,11 @@ import logging
 from logging import Logger
 from typing import Optional, List
 
-import requests
 from pydantic import TypeAdapter
 
 import ke_client.ke_vars as ke_vars
+from ke_client.client._http_pool import KEHttpPool
+from ke_client.client._transport import KETransport, RequestsTransport
 from ke_client.ki_model import SmartClient, SCKnowledgeInteraction
 
 
@@ -16,12 +17,19 @@ class KERestClient:
     _http_timeout = (15, 180)
     ke_rest_endpoint: str
     _instance: 'KERestClient' = None
+    _transport_: KETransport
 
     def __init__(self, ke_rest_endpoint: str, verify_cert: bool = ke_vars.VERIFY_SERVER_CERT,
-                 logger: Optional[Logger] = None):
+                 logger: Optional[Logger] = None, http_pool: Optional[KEHttpPool] = None,
+                 transport: Optional[KETransport] = None):
+        """
+        :param http_pool: pooled HTTP sessions of the default transport, shared pool is used if None
+        :param transport: HTTP backend, default: `RequestsTransport`
+        """
         self._verify_cert_ = verify_cert
         self._logger_ = logging.getLogger() if logger is None else logger
         self.ke_rest_endpoint = ke_rest_endpoint
+        self._transport_ = RequestsTransport(http_pool=http_pool) if transport is None else transport
 
     @staticmethod
     def get_client():
@@ -36,8 +44,8 @@ class KERestClient:
 
     def list_sc(self) -> List[SmartClient]:
         adapter = TypeAdapter(list[SmartClient])
-        response = requests.get(
-            self.ke_rest_endpoint + "sc", verify=self._verify_cert_, timeout=self._http_timeout
+        response = self._transport_.request(
+            "GET", self.ke_rest_endpoint + "sc", verify=self._verify_cert_, timeout=self._http_timeout
         )
         if response.status_code != 200:
             try:
@@ -51,8 +59,8 @@ class KERestClient:
 
     def get_sc_ki(self, kb_id: str) -> List[SCKnowledgeInteraction]:
         adapter = TypeAdapter(list[SCKnowledgeInteraction])
-        response = requests.get(
-            self.ke_rest_endpoint + "sc/ki", verify=self._verify_cert_, timeout=self._http_timeout,
+        response = self._transport_.request(
+            "GET", self.ke_rest_endpoint + "sc/ki", verify=self._verify_cert_, timeout=self._http_timeout,
             headers={"Knowledge-Base-Id": kb_id, }
         )
         if response.status_code != 200:
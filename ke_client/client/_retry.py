@@ -0,0 +1,273 @@
+import asyncio
+import logging
+import random
+import time
+from logging import Logger
+from threading import Lock
+from typing import Callable, TypeVar, Tuple, Type, Optional, Dict, Any, Awaitable
+
+T = TypeVar("T")
+
+
+class CircuitOpenError(ConnectionError):
+    """
+    request rejected without sending, the KE server is known to be unreachable
+    """
+    pass
+
+
+class CircuitBreaker:
+    """
+    Fails fast while the KE server is unreachable: opened after `failure_threshold` consecutive connection failures,
+    after `reset_timeout` seconds a single probe request is let through (half-open), success closes the circuit.
+    """
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    failure_threshold: int
+    reset_timeout: float
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        """
+
+        :param failure_threshold: consecutive failures opening the circuit, 0 - disabled
+        :param reset_timeout: seconds before a probe request is let through
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = Lock()
+        self._state = CircuitBreaker.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_pending = False
+        # region stats
+        self._opened = 0
+        self._rejected = 0
+        # endregion
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state
+
+    def retry_after(self) -> float:
+        """
+        :return: seconds until the next probe request is allowed, 0 if the circuit is closed
+        """
+        with self._lock:
+            if self._state == CircuitBreaker.CLOSED:
+                return 0.0
+            return max(self._opened_at + self.reset_timeout - time.monotonic(), 0.0)
+
+    def before_call(self, ctx: str = "") -> bool:
+        """
+        :return: True if the call is the half-open probe, it has to be resolved with `record_success`,
+         `record_failure` or `abort_probe`
+        :raise CircuitOpenError: if the circuit is open
+        """
+        if self.failure_threshold <= 0:
+            return False
+        with self._lock:
+            if self._state == CircuitBreaker.CLOSED:
+                return False
+            if (self._state == CircuitBreaker.OPEN
+                    and time.monotonic() - self._opened_at >= self.reset_timeout and not self._probe_pending):
+                self._state = CircuitBreaker.HALF_OPEN
+                self._probe_pending = True
+                return True
+            self._rejected += 1
+        raise CircuitOpenError(f"KE server unreachable, circuit open: {ctx}")
+
+    def abort_probe(self):
+        """
+        probe ended without a result (non-retryable error, cancellation): the circuit is opened again,
+        the next probe is let through after `reset_timeout`
+        """
+        with self._lock:
+            if self._state != CircuitBreaker.HALF_OPEN:
+                return
+            self._probe_pending = False
+            self._state = CircuitBreaker.OPEN
+            self._opened_at = time.monotonic()
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._probe_pending = False
+            self._state = CircuitBreaker.CLOSED
+
+    def record_failure(self):
+        if self.failure_threshold <= 0:
+            return
+        with self._lock:
+            self._failures += 1
+            self._probe_pending = False
+            if self._state == CircuitBreaker.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != CircuitBreaker.OPEN:
+                    self._opened += 1
+                self._state = CircuitBreaker.OPEN
+                self._opened_at = time.monotonic()
+
+    def reset(self):
+        self.record_success()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"state": self._state, "consecutive_failures": self._failures, "opened": self._opened,
+                    "rejected": self._rejected}
+
+
+class RetryPolicy:
+    """
+    Retries failed requests with exponential backoff and jitter. The number of attempts (retry budget) and the total
+    time of a call (deadline) are limited.
+    """
+    max_attempts: int
+    base_delay: float
+    max_delay: float
+    multiplier: float
+    jitter: float
+    deadline: Optional[float]
+
+    def __init__(self, max_attempts: int = 3, base_delay: float = 1.0, max_delay: float = 30.0,
+                 multiplier: float = 2.0, jitter: float = 0.5, deadline: Optional[float] = 60.0):
+        """
+
+        :param max_attempts: max. number of attempts per call, including the first one
+        :param base_delay: delay before the first retry in seconds
+        :param max_delay: max. delay between attempts
+        :param multiplier: delay multiplier for the next retry
+        :param jitter: random part of the delay (0 - fixed delays, 1 - random delay between 0 and the delay)
+        :param deadline: max. time of a call in seconds (including all attempts), None - no deadline
+        """
+        if max_attempts < 1:
+            raise ValueError(f"Invalid max_attempts: {max_attempts}")
+        if not 0.0 <= jitter <= 1.0:
+            raise ValueError(f"Invalid jitter: {jitter}, expected value between 0 and 1")
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.multiplier = multiplier
+        self.jitter = jitter
+        self.deadline = deadline
+        self._lock = Lock()
+        # region stats
+        self._calls = 0
+        self._retries = 0
+        self._failed = 0
+        self._deadline_exceeded = 0
+        # endregion
+
+    def backoff(self, retry: int) -> float:
+        """
+        :param retry: retry number (0 - first retry)
+        :return: delay in seconds
+        """
+        delay = min(self.max_delay, self.base_delay * (self.multiplier ** retry))
+        return delay * (1.0 - self.jitter * random.random())
+
+    def _next_delay(self, attempt: int, started: float) -> Optional[float]:
+        """
+        :return: delay before the next attempt, None if the budget or the deadline is exhausted
+        """
+        if attempt >= self.max_attempts:
+            return None
+        delay = self.backoff(attempt - 1)
+        if self.deadline is not None and time.monotonic() + delay - started >= self.deadline:
+            with self._lock:
+                self._deadline_exceeded += 1
+            return None
+        with self._lock:
+            self._retries += 1
+        return delay
+
+    def _on_failed(self):
+        with self._lock:
+            self._failed += 1
+
+    def run(self, send_request: Callable[[], T], retry_on: Tuple[Type[BaseException], ...],
+            breaker: Optional[CircuitBreaker] = None, ctx: str = "", logger: Optional[Logger] = None) -> T:
+        """
+        call `send_request`, retry on `retry_on` exceptions
+        :param send_request:
+        :param retry_on: exceptions which are retried and counted as breaker failures
+        :param breaker: circuit breaker, None - no breaker
+        :param ctx: request description for logs and errors
+        :param logger:
+        :return: result of `send_request`
+        :raise CircuitOpenError: if the circuit is open
+        """
+        logger = logging.getLogger() if logger is None else logger
+        with self._lock:
+            self._calls += 1
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            probe = breaker.before_call(ctx=ctx) if breaker is not None else False
+            attempt += 1
+            try:
+                result = send_request()
+            except retry_on as err:
+                if breaker is not None:
+                    breaker.record_failure()
+                delay = self._next_delay(attempt=attempt, started=started)
+                if delay is None:
+                    self._on_failed()
+                    raise
+                logger.warning(f"Request failed {ctx}: {err}. Attempt {attempt}/{self.max_attempts}, "
+                               f"next attempt in {delay:.2f} s")
+                time.sleep(delay)
+                continue
+            except BaseException:
+                # not a connection failure (e.g. read timeout), but the probe has to be resolved
+                if probe:
+                    breaker.abort_probe()
+                raise
+            if breaker is not None:
+                breaker.record_success()
+            return result
+
+    async def run_async(self, send_request: Callable[[], Awaitable[T]], retry_on: Tuple[Type[BaseException], ...],
+                        breaker: Optional[CircuitBreaker] = None, ctx: str = "",
+                        logger: Optional[Logger] = None) -> T:
+        """
+        asyncio version of `run`
+        """
+        logger = logging.getLogger() if logger is None else logger
+        with self._lock:
+            self._calls += 1
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            probe = breaker.before_call(ctx=ctx) if breaker is not None else False
+            attempt += 1
+            try:
+                result = await send_request()
+            except retry_on as err:
+                if breaker is not None:
+                    breaker.record_failure()
+                delay = self._next_delay(attempt=attempt, started=started)
+                if delay is None:
+                    self._on_failed()
+                    raise
+                logger.warning(f"Request failed {ctx}: {err}. Attempt {attempt}/{self.max_attempts}, "
+                               f"next attempt in {delay:.2f} s")
+                await asyncio.sleep(delay)
+                continue
+            except BaseException:
+                # not a connection failure (e.g. timeout, cancellation), but the probe has to be resolved
+                if probe:
+                    breaker.abort_probe()
+                raise
+            if breaker is not None:
+                breaker.record_success()
+            return result
+
+    def stats(self) -> Dict[str, int]:
+        """
+        :return: number of calls, retries, calls failed after the last attempt and calls stopped by the deadline
+        """
+        with self._lock:
+            return {"calls": self._calls, "retries": self._retries, "failed": self._failed,
+                    "deadline_exceeded": self._deadline_exceeded}
@@ -1,12 +1,16 @@
 import inspect
 import re
+from collections import OrderedDict
 from string import Template
-from typing import TypeVar, Generic, Type, Union, Callable, Optional
+from threading import Lock
+from typing import TypeVar, Generic, Type, Union, Callable, Optional, List, Tuple, Dict, Any, Iterable
 from urllib.parse import urlparse
 
 from pydantic import BaseModel
 from rdflib import URIRef
 
+from ._term_cache import get_term_cache
+
 T = TypeVar('T')
 
 __PARAM_REGEX__ = r"\${([a-zA-Z_][a-zA-Z0-9_]*)}"
@@ -19,14 +23,38 @@ def convert(v: str, t: inspect.Parameter):
         return v
 
 
+# converters of the template fields applied to the matched URI parts
+_CONVERTERS = [int, float, str]
+_MISSING = object()
+
+
+def _converter(t: inspect.Parameter) -> Optional[Callable[[str], Any]]:
+    """
+    :return: converter of the field (see `convert`), None - the matched string is passed to the class
+    """
+    return t.annotation if t.annotation in _CONVERTERS else None
+
+
 class UriTemplate(Generic[T]):
+    """
+    URI template compiled once per class: regex matching the URIs, converters of the template fields and the parts
+    of the built URI. Parsed objects can be cached in a bounded LRU cache (`cache_size`), cached objects are shared
+    by all `parse` calls of the same URI.
+    """
+
     def __init__(self, uri_template: str, t: Type[T],
                  allowed_partial: bool = False, allowed_none: bool = False,
-                 allowed_extra: bool = False) -> None:
+                 allowed_extra: bool = False, cache_size: int = 0) -> None:
+        """
+        :param cache_size: max. number of cached parsed objects, 0 - cache disabled
+        """
+        if cache_size < 0:
+            raise ValueError(f"Invalid URI template cache size: {cache_size}")
         self.uri_template = uri_template
         # self.uri_pattern = re.sub(r"\${(\w+)}", r"(?P<\1>[^/]+)", uri_template)
         self.__uri_pattern__ = re.sub(__PARAM_REGEX__, r"(?P<\1>[^/]+)", uri_template)
-        self.__uri_keys__ = [*re.compile(self.__uri_pattern__).groupindex]
+        self.__uri_regex__ = re.compile(self.__uri_pattern__)
+        self.__uri_keys__ = [*self.__uri_regex__.groupindex]
         self.__obj_attr__ = inspect.signature(t).parameters
         self.__obj_attr_keys__ = inspect.signature(t).parameters.keys()
         for param_key in self.__obj_attr_keys__:
@@ -46,6 +74,41 @@ class UriTemplate(Generic[T]):
         self.__allowed_none__ = allowed_none
         str_template = Template(uri_template)
         self.__uri_builder__: Callable[[dict], str] = lambda d: str_template.safe_substitute(d)
+        # region compiled
+        # (index in `match.groups()`, field, converter) of the class fields set from the URI. Index of the named
+        # group, the template may contain other groups (e.g. literal parentheses)
+        groupindex = self.__uri_regex__.groupindex
+        self._fields_: List[Tuple[int, str, Optional[Callable[[str], Any]]]] = [
+            (groupindex[k] - 1, k, _converter(self.__obj_attr__[k])) for k in self.__uri_keys__
+            if k in self.__obj_attr_keys__]
+        self._split_uri_ = issubclass(t, SplitURIBase)
+        # objects are built without pydantic validation: fields converted by the template, see `_constructible`
+        self._construct_ = self._split_uri_ and _constructible(t, self._fields_)
+        # parts of the built URI: (text before the field, field, template text of the field), text after the last field
+        self._segments_: List[Tuple[str, str, str]] = []
+        literal: List[str] = []
+        pos = 0
+        for m in Template.pattern.finditer(uri_template):
+            literal.append(uri_template[pos:m.start()])
+            pos = m.end()
+            key = m.group("named") or m.group("braced")
+            if key is not None and key in self.__partial_uri_keys__:
+                self._segments_.append(("".join(literal), key, m.group(0)))
+                literal = []
+            elif m.group("escaped") is not None:
+                literal.append("$")
+            else:
+                literal.append(m.group(0))
+        literal.append(uri_template[pos:])
+        self._tail_ = "".join(literal)
+        # endregion
+        # region cache
+        self.cache_size = cache_size
+        self._cache_: OrderedDict[Tuple[str, str], T] = OrderedDict()
+        self._lock = Lock()
+        self._hits = 0
+        self._misses = 0
+        # endregion
 
     # def __setattr__(self, name: str, value):
     #     raise Exception('immutable object')
@@ -54,44 +117,134 @@ class UriTemplate(Generic[T]):
     def __str__(self):
         return f"UriTemplate parser for: {self.__uri_obj_class__} ({self.uri_template}) "
 
-    def parse(self, uri: [str, URIRef], prefix: str = "") -> T:
-        if prefix and not prefix.endswith("/"):
-            prefix = prefix + "/"
-        uri = str(uri)[len(prefix):]
-        matched_args = re.match(self.__uri_pattern__, uri)
+    def _parse_(self, uri: str, prefix: str) -> T:
+        uri = uri[len(prefix):]
+        matched_args = self.__uri_regex__.match(uri)
         if matched_args is None:
             raise ValueError(f"URI {uri} does not match the pattern: {self.__uri_pattern__} (prefix: '{prefix}')")
-        kwargs = {k: convert(v, self.__obj_attr__[k])
-                  for k, v in matched_args.groupdict().items()
-                  if k in self.__obj_attr_keys__}
+        return self._from_match_(matched_args, uri, prefix)
 
-        if issubclass(self.__uri_obj_class__, SplitURIBase):
+    def _from_match_(self, matched_args: re.Match, uri: str, prefix: str) -> T:
+        """
+        :param matched_args: match of the template regex on the `uri` (without prefix)
+        """
+        groups = matched_args.groups()
+        kwargs = {k: groups[i] if to is None else to(groups[i]) for i, k, to in self._fields_}
+
+        if self._construct_:
+            obj = self.__uri_obj_class__.model_construct(**kwargs)
+            obj.__prefix__ = prefix
+            return obj
+        if self._split_uri_:
             return self.__uri_obj_class__(uri=uri, uri_template=self.uri_template, prefix=prefix, **kwargs)
         else:
             return self.__uri_obj_class__(prefix=prefix, **kwargs)
         # return self.uri_type(**kwargs)
 
+    def parse(self, uri: [str, URIRef], prefix: str = "") -> T:
+        if prefix and not prefix.endswith("/"):
+            prefix = prefix + "/"
+        uri = uri if type(uri) is str else str(uri)
+        if self.cache_size == 0:
+            return self._parse_(uri, prefix)
+        key = (uri, prefix)
+        cache = self._cache_
+        with self._lock:
+            obj = cache.get(key)
+            if obj is not None:
+                cache.move_to_end(key)
+                self._hits += 1
+                return obj
+            self._misses += 1
+        obj = self._parse_(uri, prefix)
+        with self._lock:
+            cache[key] = obj
+            if len(cache) > self.cache_size:
+                cache.popitem(last=False)
+        return obj
+
+    def parse_many(self, uris: Iterable[Union[str, URIRef]], prefix: str = "") -> List[T]:
+        """
+        :param uris: list, numpy array or other iterable of URIs
+        :return: parsed objects in the order of `uris`
+        """
+        if self.cache_size > 0:
+            parse = self.parse
+            return [parse(uri, prefix) for uri in uris]
+        if prefix and not prefix.endswith("/"):
+            prefix = prefix + "/"
+        parse = self._parse_
+        return [parse(uri if type(uri) is str else str(uri), prefix) for uri in uris]
+
     def build(self, t: T, prefix: str = "") -> str:
-        uri_dict = {k: v for k, v in vars(t).items()
-                    if k in self.__partial_uri_keys__}
-        if not self.__allowed_none__:
-            for k, v in uri_dict.items():
-                if v is None:
-                    raise Exception(
-                        f"None value({k})   not allowed in: {self.uri_template} : {self.__uri_obj_class__}")
-        for k, v in uri_dict.items():
-            if "/" in str(v):
+        values = vars(t)
+        parts = [prefix]
+        append = parts.append
+        for literal, k, field_template in self._segments_:
+            append(literal)
+            v = values.get(k, _MISSING)
+            if v is _MISSING:
+                # not substituted
+                append(field_template)
+                continue
+            if v is None and not self.__allowed_none__:
+                raise Exception(
+                    f"None value({k})   not allowed in: {self.uri_template} : {self.__uri_obj_class__}")
+            v = v if type(v) is str else str(v)
+            if "/" in v:
                 raise ValueError(
                     f"Separator '/' not allowed for {k}  : {self.uri_template} : {self.__uri_obj_class__}")
+            append(v)
+        append(self._tail_)
+        return "".join(parts)
 
-        return prefix + self.__uri_builder__(uri_dict)
+    def build_many(self, objs: Iterable[T], prefix: str = "") -> List[str]:
+        """
+        :return: URIs in the order of `objs`
+        """
+        build = self.build
+        return [build(t, prefix) for t in objs]
 
     def uri_ref(self, t: T, prefix: str = "") -> URIRef:
-        return URIRef(self.build(t, prefix=prefix))
+        return get_term_cache().uri_ref(self.build(t, prefix=prefix))
 
     def n3(self, t: T, prefix=""):
         return self.uri_ref(t, prefix=prefix).n3()
 
+    def clear_cache(self):
+        with self._lock:
+            self._cache_.clear()
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """
+        :return: number of cached objects, hits, misses and hit rate of the parse cache
+        """
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {"size": len(self._cache_), "maxsize": self.cache_size, "hits": self._hits,
+                    "misses": self._misses, "hit_rate": self._hits / lookups if lookups > 0 else 0.0}
+
+
+def _constructible(t: Type['SplitURIBase'], fields: List[Tuple[int, str, Optional[Callable[[str], Any]]]]) -> bool:
+    """
+    :return: True if the parsed objects are valid without pydantic validation: all fields set from the URI are
+     converted to their type, other fields have defaults, no validators, field constraints or `__init__` override
+    """
+    if t.__init__ is not SplitURIBase.__init__:
+        # the constructor may transform the values
+        return False
+    if any(f.metadata for f in t.model_fields.values()):
+        # constraints (e.g. `Field(min_length=...)`) are checked by the validation only
+        return False
+    decorators = t.__pydantic_decorators__
+    if decorators.validators or decorators.field_validators or decorators.root_validators \
+            or decorators.model_validators:
+        return False
+    if any(to is None for _, _, to in fields):
+        return False
+    uri_fields = {k for _, k, _ in fields}
+    return all(k in uri_fields or not f.is_required() for k, f in t.model_fields.items())
+
 
 U = TypeVar("U", bound="SplitURIBase")
 
@@ -180,12 +333,37 @@ class SplitURIBase(BaseModel):
         raise NotImplementedError(
             "Class is not decorated with '@ki_split_uri', decorate class or override 'parse' class method ")
 
+    @classmethod
+    def _uri_parser_(cls) -> UriTemplate:
+        uri_parser = getattr(cls, "__uri_template_parser__", None)
+        if not isinstance(uri_parser, UriTemplate):
+            raise NotImplementedError(f"Class {cls.__name__} is not decorated with '@ki_split_uri'")
+        return uri_parser
+
+    @classmethod
+    def parse_many(cls: Type[U], uris: Iterable[Union[str, URIRef]], prefix: str = "") -> List[U]:
+        """
+        :param uris: list, numpy array or other iterable of URIs
+        :return: parsed objects in the order of `uris`
+        """
+        return cls._uri_parser_().parse_many(uris, prefix=prefix)
+
+    @classmethod
+    def build_many(cls: Type[U], objs: Iterable[U]) -> List[str]:
+        """
+        :return: URIs of the objects (with their prefixes) in the order of `objs`
+        """
+        build = cls._uri_parser_().build
+        return [build(obj, prefix=obj.__prefix__) for obj in objs]
+
 
-def ki_split_uri(uri_template: str):
+def ki_split_uri(uri_template: str, cache_size: int = 0):
     """
     URI decorator
     :param uri_template:
-    :return:
+    :param cache_size: max. number of parsed objects kept in the LRU cache of the class, 0 - cache disabled.
+     Cached objects are shared, don't modify them.
+    :return: decorated class, registered in the `get_split_uri_router()` router
     """
 
     # uri_pattern = re.sub(__PARAM_REGEX__, r"(?P<\1>[^/]+)", uri_template)
@@ -194,10 +372,12 @@ def ki_split_uri(uri_template: str):
         if not issubclass(cls, SplitURIBase):
             # is splituribase type required ?
             raise Exception("Invalid class")
-        uri_parser = UriTemplate(uri_template=uri_template, t=cls)
+        uri_parser = UriTemplate(uri_template=uri_template, t=cls, cache_size=cache_size)
         setattr(cls, "__uri_template_parser__", uri_parser)
         cls.__uri_template_parser__ = uri_parser
         cls.parse = lambda uri, prefix="": uri_parser.parse(uri=uri, prefix=prefix)
+        from ._uri_router import get_split_uri_router
+        get_split_uri_router().register(cls)
 
         return cls
 
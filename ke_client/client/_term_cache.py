@@ -0,0 +1,98 @@
+from collections import OrderedDict
+from threading import Lock
+from typing import Dict, Any, Optional
+
+from rdflib import URIRef
+from rdflib.term import Node
+
+from ._n3 import parse_n3
+
+
+class N3TermCache:
+    """
+    Bounded LRU cache of parsed N3 terms. Repeated binding values (market URIs, usage URIs, units, ...) are parsed once
+    and share a single `URIRef`/`Literal` object (rdflib terms are immutable).
+    """
+    maxsize: int
+
+    def __init__(self, maxsize: int = 65536):
+        """
+
+        :param maxsize: max. number of cached terms, 0 - cache disabled
+        """
+        if maxsize < 0:
+            raise ValueError(f"Invalid term cache size: {maxsize}")
+        self.maxsize = maxsize
+        self._terms_: OrderedDict[str, Node] = OrderedDict()
+        self._lock = Lock()
+        # region stats
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        # endregion
+
+    def term(self, n3: str) -> Node:
+        """
+        :param n3: N3 term (`<iri>`, `"lex"`, `"lex"^^<dt>`, `"lex"@lang`)
+        :return: interned rdflib term
+        """
+        if self.maxsize == 0:
+            return parse_n3(n3)
+        terms = self._terms_
+        with self._lock:
+            node = terms.get(n3)
+            if node is not None:
+                terms.move_to_end(n3)
+                self._hits += 1
+                return node
+            self._misses += 1
+        # parse outside the lock, concurrent misses of the same term are resolved below
+        node = parse_n3(n3)
+        with self._lock:
+            cached = terms.get(n3)
+            if cached is not None:
+                return cached
+            terms[n3] = node
+            if len(terms) > self.maxsize:
+                terms.popitem(last=False)
+                self._evictions += 1
+        return node
+
+    def uri_ref(self, uri: str) -> URIRef:
+        """
+        :return: interned `URIRef` of the uri
+        """
+        return self.term(f"<{uri}>")
+
+    def clear(self):
+        with self._lock:
+            self._terms_.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        :return: number of cached terms, hits, misses, evictions and hit rate
+        """
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {"size": len(self._terms_), "maxsize": self.maxsize, "hits": self._hits, "misses": self._misses,
+                    "evictions": self._evictions, "hit_rate": self._hits / lookups if lookups > 0 else 0.0}
+
+
+_term_cache: Optional[N3TermCache] = None
+_term_cache_lock = Lock()
+
+
+def get_term_cache() -> N3TermCache:
+    """
+    :return: term cache shared by the bindings objects, configured with `ke_settings`
+    """
+    global _term_cache
+    term_cache = _term_cache
+    if term_cache is None:
+        with _term_cache_lock:
+            # bindings are parsed concurrently (handle workers, batch calls), all threads share one cache
+            if _term_cache is None:
+                from ke_client import ke_settings
+                _term_cache = N3TermCache(maxsize=ke_settings.term_cache_size)
+            term_cache = _term_cache
+    return term_cache
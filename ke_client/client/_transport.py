@@ -0,0 +1,311 @@
+from abc import abstractmethod
+from threading import Lock
+from typing import Dict, Optional, Any, Tuple, Type
+
+import orjson
+
+from ke_client.client._http_pool import KEHttpPool, get_http_pool, pool_manager_stats
+
+HttpTimeout = Tuple[float, float]
+
+
+class KEResponse:
+    """
+    minimal response object returned by transports without own response type (same attributes as
+    `requests.Response`)
+    """
+    __slots__ = ("status_code", "content", "url", "headers")
+
+    def __init__(self, status_code: int, content: bytes, url: str, headers: Optional[Dict[str, str]] = None):
+        self.status_code = status_code
+        self.content = content
+        self.url = url
+        self.headers = headers if headers is not None else {}
+
+    @property
+    def ok(self) -> bool:
+        return self.status_code < 400
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self) -> Any:
+        return orjson.loads(self.content)
+
+
+def httpx_connection_errors() -> Tuple[Type[BaseException], ...]:
+    """
+    httpx exceptions of failed or dropped connections (KE server restart, proxy closing the keep-alive connection),
+    shared by `HttpxTransport` and `AsyncKEClient`
+    """
+    import httpx
+    return httpx.ConnectError, httpx.ConnectTimeout, httpx.RemoteProtocolError, httpx.ReadError
+
+
+class KETransport:
+    """
+    HTTP backend of the KE clients. Returned responses provide `status_code`, `content`, `text`, `url` and `json()`.
+    """
+    # exceptions of failed connections (retried, counted by the circuit breaker)
+    connection_errors: Tuple[Type[BaseException], ...] = ()
+    # exceptions of timed-out responses
+    timeout_errors: Tuple[Type[BaseException], ...] = ()
+
+    @abstractmethod
+    def request(self, method: str, url: str, headers: Optional[Dict[str, str]] = None, json: Any = None,
+                timeout: Optional[HttpTimeout] = None, verify: bool = True, long_poll: bool = False,
+                content: Optional[bytes] = None) -> Any:
+        """
+        send HTTP request
+        :param method: HTTP method
+        :param url:
+        :param headers:
+        :param json: JSON body
+        :param content: encoded JSON body (sent as is instead of `json`)
+        :param timeout: (connect, read) timeout in seconds
+        :param verify: verify server certificate
+        :param long_poll: True for the `sc/handle` long-poll request, sent over connections reserved for the long-poll
+        :return: response
+        """
+        pass
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        :return: connection reuse counters
+        """
+        return {}
+
+    def close(self):
+        pass
+
+
+class RequestsTransport(KETransport):
+    """
+    default `requests` backend using the pooled keep-alive sessions of `KEHttpPool`
+    """
+    http_pool: KEHttpPool
+
+    def __init__(self, http_pool: Optional[KEHttpPool] = None, pool_size: Optional[int] = None,
+                 handle_pool_size: int = 2):
+        """
+        :param http_pool: pooled HTTP sessions, shared pool (`get_http_pool()`) is used if None
+        :param pool_size: create own pool with `pool_size` keep-alive connections instead of the shared pool
+        :param handle_pool_size: keep-alive connections of the own pool for the `sc/handle` long-poll
+        """
+        import requests
+        if http_pool is not None:
+            self.http_pool = http_pool
+        elif pool_size is not None:
+            self.http_pool = KEHttpPool(pool_size=pool_size, handle_pool_size=handle_pool_size)
+        else:
+            self.http_pool = get_http_pool()
+        # only the own pool is closed, shared and passed pools are used by other clients
+        self._owns_pool_ = http_pool is None and pool_size is not None
+        self.connection_errors = (requests.ConnectionError,)
+        self.timeout_errors = (requests.Timeout,)
+
+    def request(self, method: str, url: str, headers: Optional[Dict[str, str]] = None, json: Any = None,
+                timeout: Optional[HttpTimeout] = None, verify: bool = True, long_poll: bool = False,
+                content: Optional[bytes] = None):
+        if content is not None:
+            headers = {**headers, "Content-Type": "application/json"} if headers is not None \
+                else {"Content-Type": "application/json"}
+        return self.http_pool.session(long_poll=long_poll).request(method, url, headers=headers, json=json,
+                                                                   data=content, timeout=timeout, verify=verify)
+
+    def stats(self) -> Dict[str, Any]:
+        return self.http_pool.stats()
+
+    def close(self):
+        if self._owns_pool_:
+            self.http_pool.close()
+
+
+class Urllib3Transport(KETransport):
+    """
+    `urllib3` backend, sends requests without the `requests` session layer (lower per-request overhead)
+    """
+    pool_size: int
+    handle_pool_size: int
+
+    def __init__(self, pool_size: int = 10, handle_pool_size: int = 2, max_hosts: int = 4):
+        """
+        :param pool_size: max. number of keep-alive connections per host for the request/response traffic
+        :param handle_pool_size: max. number of keep-alive connections per host for the `sc/handle` long-poll
+        :param max_hosts: number of hosts (KE servers) with cached connection pools
+        """
+        if pool_size < 1 or handle_pool_size < 1:
+            raise ValueError(f"Invalid pool size: {pool_size}/{handle_pool_size}. Pool size must be >= 1")
+        import urllib3
+        from urllib3.exceptions import NewConnectionError, ConnectTimeoutError, ProtocolError, ReadTimeoutError
+        self._urllib3 = urllib3
+        self.pool_size = pool_size
+        self.handle_pool_size = handle_pool_size
+        self.max_hosts = max_hosts
+        self.connection_errors = (NewConnectionError, ConnectTimeoutError, ProtocolError)
+        self.timeout_errors = (ReadTimeoutError,)
+        # (long_poll, verify) -> urllib3.PoolManager
+        self._pool_managers_: Dict[Tuple[bool, bool], Any] = {}
+        self._lock = Lock()
+        # url -> (url without credentials, Authorization header)
+        self._auth_cache_: Dict[str, Tuple[str, Optional[str]]] = {}
+
+    def _pool_manager(self, long_poll: bool, verify: bool):
+        key = (long_poll, verify)
+        pool_manager = self._pool_managers_.get(key)
+        if pool_manager is None:
+            with self._lock:
+                pool_manager = self._pool_managers_.get(key)
+                if pool_manager is None:
+                    pool_manager = self._urllib3.PoolManager(
+                        num_pools=self.max_hosts, maxsize=self.handle_pool_size if long_poll else self.pool_size,
+                        cert_reqs="CERT_REQUIRED" if verify else "CERT_NONE", retries=False)
+                    self._pool_managers_[key] = pool_manager
+        return pool_manager
+
+    def _split_auth(self, url: str) -> Tuple[str, Optional[str]]:
+        """
+        move basic auth credentials (`{protocol}://{user}:{password}@{host}`) from the url to the header
+        """
+        cached = self._auth_cache_.get(url)
+        if cached is not None:
+            return cached
+        parsed = self._urllib3.util.parse_url(url)
+        if parsed.auth is None:
+            result = (url, None)
+        else:
+            result = (parsed._replace(auth=None).url,
+                      self._urllib3.util.make_headers(basic_auth=parsed.auth)["authorization"])
+        if len(self._auth_cache_) < 1024:
+            self._auth_cache_[url] = result
+        return result
+
+    def request(self, method: str, url: str, headers: Optional[Dict[str, str]] = None, json: Any = None,
+                timeout: Optional[HttpTimeout] = None, verify: bool = True, long_poll: bool = False,
+                content: Optional[bytes] = None):
+        request_headers = dict(headers) if headers is not None else {}
+        url, authorization = self._split_auth(url)
+        if authorization is not None:
+            request_headers["Authorization"] = authorization
+        body = content
+        if body is None and json is not None:
+            body = orjson.dumps(json)
+        if body is not None:
+            request_headers["Content-Type"] = "application/json"
+        urllib3_timeout = self._urllib3.Timeout(connect=timeout[0], read=timeout[1]) if timeout is not None else None
+        response = self._pool_manager(long_poll=long_poll, verify=verify).request(
+            method, url, body=body, headers=request_headers, timeout=urllib3_timeout, retries=False, redirect=False)
+        return KEResponse(status_code=response.status, content=response.data, url=url, headers=response.headers)
+
+    def stats(self) -> Dict[str, Any]:
+        stats = {"request": {"requests": 0, "connections": 0, "reused": 0},
+                 "handle": {"requests": 0, "connections": 0, "reused": 0}}
+        for (long_poll, _), pool_manager in list(self._pool_managers_.items()):
+            for k, v in pool_manager_stats(pool_manager).items():
+                stats["handle" if long_poll else "request"][k] += v
+        return stats
+
+    def close(self):
+        with self._lock:
+            for pool_manager in self._pool_managers_.values():
+                pool_manager.clear()
+            self._pool_managers_ = {}
+
+
+class HttpxTransport(KETransport):
+    """
+    `httpx` backend (`pip install ke_client[async]`), with `http2=True` requests to the KE server are multiplexed over
+    a single connection (`pip install ke_client[http2]`)
+    """
+    http2: bool
+
+    def __init__(self, pool_size: int = 10, handle_pool_size: int = 2, http2: bool = False):
+        """
+        :param pool_size: max. number of keep-alive connections for the request/response traffic
+        :param handle_pool_size: max. number of keep-alive connections for the `sc/handle` long-poll
+        :param http2: use HTTP/2 (requires `h2`)
+        """
+        try:
+            import httpx
+        except ImportError as err:
+            raise ImportError("HttpxTransport requires 'httpx', install: `pip install ke_client[async]`") from err
+        if http2:
+            try:
+                import h2  # noqa: F401
+            except ImportError as err:
+                raise ImportError("HTTP/2 requires 'h2', install: `pip install ke_client[http2]`") from err
+        self._httpx = httpx
+        self.pool_size = pool_size
+        self.handle_pool_size = handle_pool_size
+        self.http2 = http2
+        self.connection_errors = httpx_connection_errors()
+        self.timeout_errors = (httpx.ReadTimeout, httpx.WriteTimeout, httpx.PoolTimeout)
+        # (long_poll, verify) -> httpx.Client
+        self._clients_: Dict[Tuple[bool, bool], Any] = {}
+        self._lock = Lock()
+        # region stats
+        self._stats_lock = Lock()
+        self._requests = 0
+        # endregion
+
+    def _client(self, long_poll: bool, verify: bool):
+        key = (long_poll, verify)
+        client = self._clients_.get(key)
+        if client is None:
+            with self._lock:
+                client = self._clients_.get(key)
+                if client is None:
+                    client = self._httpx.Client(
+                        verify=verify, http2=self.http2,
+                        limits=self._httpx.Limits(
+                            max_connections=None,
+                            max_keepalive_connections=self.handle_pool_size if long_poll else self.pool_size))
+                    self._clients_[key] = client
+        return client
+
+    def request(self, method: str, url: str, headers: Optional[Dict[str, str]] = None, json: Any = None,
+                timeout: Optional[HttpTimeout] = None, verify: bool = True, long_poll: bool = False,
+                content: Optional[bytes] = None):
+        httpx_timeout = self._httpx.Timeout(timeout[1], connect=timeout[0]) if timeout is not None else None
+        request_headers = headers
+        if content is None and json is not None:
+            content = orjson.dumps(json)
+        if content is not None:
+            request_headers = {**headers, "Content-Type": "application/json"} if headers is not None \
+                else {"Content-Type": "application/json"}
+        with self._stats_lock:
+            self._requests += 1
+        return self._client(long_poll=long_poll, verify=verify).request(method, url, headers=request_headers,
+                                                                        content=content, timeout=httpx_timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            return {"requests": self._requests, "http2": self.http2}
+
+    def close(self):
+        with self._lock:
+            for client in self._clients_.values():
+                client.close()
+            self._clients_ = {}
+
+
+TRANSPORTS = ["requests", "urllib3", "httpx", "httpx-http2"]
+
+
+def build_transport(name: str, pool_size: int = 10, handle_pool_size: int = 2) -> KETransport:
+    """
+    :param name: one of: `requests`, `urllib3`, `httpx`, `httpx-http2`
+    :param pool_size: keep-alive connections for the request/response traffic
+    :param handle_pool_size: keep-alive connections for the `sc/handle` long-poll
+    :return: transport instance
+    """
+    if name == "requests":
+        return RequestsTransport(pool_size=pool_size, handle_pool_size=handle_pool_size)
+    if name == "urllib3":
+        return Urllib3Transport(pool_size=pool_size, handle_pool_size=handle_pool_size)
+    if name == "httpx":
+        return HttpxTransport(pool_size=pool_size, handle_pool_size=handle_pool_size)
+    if name == "httpx-http2":
+        return HttpxTransport(pool_size=pool_size, handle_pool_size=handle_pool_size, http2=True)
+    raise ValueError(f"Unknown HTTP transport: '{name}'. Valid options: {', '.join(TRANSPORTS)}")
@@ -0,0 +1,146 @@
+import re
+from threading import Lock
+from typing import Dict, Iterable, List, Optional, Tuple, Type, Union
+
+from rdflib import URIRef
+
+from ._split_uri import SplitURIBase, UriTemplate, __PARAM_REGEX__
+
+_REGEX_SPECIAL = re.compile(r"[.^$*+?{}\[\]\\|()]")
+
+# (literal length, template, class) of the templates sharing the literal head, most specific first
+_Candidates = List[Tuple[int, UriTemplate, Type[SplitURIBase]]]
+
+
+class SplitURIRouter:
+    """
+    Registry of `@ki_split_uri` classes dispatching a URI to the class of the matching template. Templates are indexed
+    by their literal head (text before the first field): a URI is checked only against the templates whose head it
+    starts with (one dict lookup per distinct head length), instead of trying `parse` of every class.
+
+    The whole URI (without prefix) has to match the template. If several templates match, the one with the longest
+    head and then the most literal characters wins.
+    """
+
+    def __init__(self, classes: Optional[Iterable[Type[SplitURIBase]]] = None):
+        self._classes_: List[Type[SplitURIBase]] = []
+        self._lock = Lock()
+        # compiled on the first route after a change: head lengths (longest first), candidates by head
+        self._index_: Optional[Tuple[List[int], Dict[str, _Candidates]]] = None
+        for cls in classes or []:
+            self.register(cls)
+
+    @property
+    def classes(self) -> List[Type[SplitURIBase]]:
+        return list(self._classes_)
+
+    def register(self, cls: Type[SplitURIBase]) -> Type[SplitURIBase]:
+        """
+        :param cls: class decorated with `@ki_split_uri`
+        """
+        if not isinstance(getattr(cls, "__uri_template_parser__", None), UriTemplate):
+            raise Exception(f"Class {cls} is not decorated with '@ki_split_uri'")
+        with self._lock:
+            # re-decorated class replaces its previous template
+            self._classes_ = [c for c in self._classes_ if c is not cls] + [cls]
+            self._index_ = None
+        return cls
+
+    def unregister(self, cls: Type[SplitURIBase]):
+        with self._lock:
+            self._classes_ = [c for c in self._classes_ if c is not cls]
+            self._index_ = None
+
+    def _compile_(self) -> Tuple[List[int], Dict[str, _Candidates]]:
+        with self._lock:
+            if self._index_ is not None:
+                return self._index_
+            by_head: Dict[str, _Candidates] = {}
+            for cls in self._classes_:
+                template: UriTemplate = cls.__uri_template_parser__
+                first_field = re.search(__PARAM_REGEX__, template.uri_template)
+                head = template.uri_template if first_field is None else template.uri_template[:first_field.start()]
+                # the template is a regex, the head ends before the first special character
+                head = _REGEX_SPECIAL.split(head, maxsplit=1)[0]
+                literal_len = len(re.sub(__PARAM_REGEX__, "", template.uri_template))
+                by_head.setdefault(head, []).append((literal_len, template, cls))
+            for candidates in by_head.values():
+                candidates.sort(key=lambda c: -c[0])
+            self._index_ = (sorted({len(head) for head in by_head}, reverse=True), by_head)
+            return self._index_
+
+    def _match_(self, uri: str) -> Optional[Tuple[re.Match, UriTemplate, Type[SplitURIBase]]]:
+        lengths, by_head = self._index_ or self._compile_()
+        for length in lengths:
+            candidates = by_head.get(uri[:length])
+            if candidates is None:
+                continue
+            for _, template, cls in candidates:
+                matched_args = template.__uri_regex__.fullmatch(uri)
+                if matched_args is not None:
+                    return matched_args, template, cls
+        return None
+
+    def resolve(self, uri: Union[str, URIRef], prefix: str = "") -> Optional[Type[SplitURIBase]]:
+        """
+        :return: class of the template matching the uri, None - no template matches
+        """
+        if prefix and not prefix.endswith("/"):
+            prefix = prefix + "/"
+        uri = uri if type(uri) is str else str(uri)
+        matched = self._match_(uri[len(prefix):])
+        return None if matched is None else matched[2]
+
+    def route(self, uri: Union[str, URIRef], prefix: str = "") -> SplitURIBase:
+        """
+        :return: uri parsed by the class of the matching template
+        :raises ValueError: no template matches the uri
+        """
+        if prefix and not prefix.endswith("/"):
+            prefix = prefix + "/"
+        uri = uri if type(uri) is str else str(uri)
+        path = uri[len(prefix):]
+        matched = self._match_(path)
+        if matched is None:
+            raise ValueError(f"URI {path} does not match any of {len(self._classes_)} templates (prefix: '{prefix}')")
+        matched_args, template, _ = matched
+        if template.cache_size > 0:
+            return template.parse(uri, prefix=prefix)
+        return template._from_match_(matched_args, path, prefix)
+
+    def route_many(self, uris: Iterable[Union[str, URIRef]], prefix: str = "",
+                   skip_unmatched: bool = False) -> List[Optional[SplitURIBase]]:
+        """
+        :param uris: list, numpy array or other iterable of URIs
+        :param skip_unmatched: True - None for URIs not matching any template, False - raise ValueError
+        :return: parsed objects in the order of `uris`
+        """
+        route = self.route
+        if not skip_unmatched:
+            return [route(uri, prefix) for uri in uris]
+        routed = []
+        for uri in uris:
+            try:
+                routed.append(route(uri, prefix))
+            except ValueError:
+                routed.append(None)
+        return routed
+
+
+_split_uri_router: Optional[SplitURIRouter] = None
+_split_uri_router_lock = Lock()
+
+
+def get_split_uri_router() -> SplitURIRouter:
+    """
+    :return: router of all classes decorated with `@ki_split_uri`
+    """
+    global _split_uri_router
+    router = _split_uri_router
+    if router is None:
+        with _split_uri_router_lock:
+            # modules with decorated classes can be imported concurrently
+            if _split_uri_router is None:
+                _split_uri_router = SplitURIRouter()
+            router = _split_uri_router
+    return router
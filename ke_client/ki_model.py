@@ -1,19 +1,33 @@
+import logging
 import re
-from typing import Optional, Union, Callable, List, Dict, Any, Type
+from datetime import datetime
+from functools import cached_property
+from typing import Optional, Union, Callable, List, Dict, Any, Type, Iterator, Tuple, FrozenSet, TYPE_CHECKING
 
 from pydantic import BaseModel, Field, ConfigDict
-from rdflib import Namespace
+from rdflib import Namespace, Node
 from rdflib.namespace import DefinedNamespace
 
 from ke_client.utils import time_utils
 from ke_client.utils.enum_utils import BaseEnum, EnumItem
 
+if TYPE_CHECKING:
+    from ke_client.client._ki_bindings import BindingSetView
+    from ke_client.client._ki_frame import BindingSetFrame
+    from ke_client.client._ki_validation import KIValidationPlan
+    from ke_client.client._ki_mismatch import BindingsMismatchCheck
+
 RDF_BINDING_REGEX = r"\?[A-Za-z_][A-Za-z0-9_]+"
 rdf_binding_pattern = re.compile(RDF_BINDING_REGEX)
 
 
 # YAML graph pattern definition
 class GraphPattern(BaseModel):
+    """
+    Graph pattern of the KI config. Frozen by `configure_ki` (see `freeze`): fields can't be assigned anymore and the
+    derived values (joined patterns, variables, prefixes, namespaces, parsed triples) are computed once.
+    `set_default_prefix` and `invalidate` drop the derived values.
+    """
     name: str = Field(...)
     prefixes: Optional[dict] = None
     description: Optional[str] = None
@@ -22,49 +36,142 @@ class GraphPattern(BaseModel):
     required_bindings: Optional[List[str]] = None
     _default_prefixes: Optional[dict] = None
     _dynamic_prefixes: Optional[dict] = None
+    _frozen_: bool = False
+    # derived values by name, computed on the first access
+    _derived_: Optional[Dict[str, Any]] = None
 
     #
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         if self.required_bindings is not None:
             for binding_key in self.required_bindings:
-                if binding_key not in self.pattern_vars:
+                if binding_key not in self.pattern_var_set:
                     raise KeyError(
                         f"Graph pattern's binding variables is missing required binding variable: {binding_key}")
 
+    def __setattr__(self, name: str, value: Any):
+        if name in GraphPattern.model_fields:
+            if self._frozen_:
+                raise AttributeError(f"Graph pattern '{self.name}' is frozen, can't set '{name}'")
+            self._derived_ = None
+        super().__setattr__(name, value)
+
+    def freeze(self):
+        """
+        make the graph pattern immutable, called when the KI configuration is loaded
+        """
+        self._frozen_ = True
+
+    @property
+    def frozen(self) -> bool:
+        return self._frozen_
+
+    def invalidate(self):
+        """
+        drop the derived values, e.g. after the default prefixes dict or `ke_settings.knowledge_base_id` was changed
+        """
+        self._derived_ = None
+
+    def compile(self) -> Dict[str, Any]:
+        """
+        compute all derived values (triples are skipped if the pattern can't be parsed)
+        :return: derived values by name, restored with `from_compiled`
+        """
+        for key in ["all_prefixes", "prefix_namespace", "pattern_value", "result_pattern_value", "pattern_vars",
+                    "result_pattern_vars", "pattern_var_set", "result_pattern_var_set"]:
+            getattr(self, key)
+        try:
+            _ = self.pattern_triples, self.result_pattern_triples
+        except Exception as ex:
+            logging.debug(f"Graph pattern '{self.name}' triples not compiled: {ex}")
+        return dict(self._derived_)
+
+    @classmethod
+    def from_compiled(cls, fields: Dict[str, Any], default_prefixes: Optional[Dict],
+                      derived: Dict[str, Any]) -> 'GraphPattern':
+        """
+        frozen graph pattern built without validation from the fields and the derived values (see `compile`)
+        """
+        gp = cls.model_construct(**fields)
+        gp._default_prefixes = default_prefixes
+        gp._derived_ = dict(derived)
+        gp.freeze()
+        return gp
+
+    def _derived(self, key: str, compute: Callable[[], Any]) -> Any:
+        derived = self._derived_
+        if derived is None:
+            derived = {}
+            self._derived_ = derived
+        if key not in derived:
+            derived[key] = compute()
+        return derived[key]
+
     @property
     def prefixes_safe(self) -> Dict:
         return self.prefixes if self.prefixes is not None else {}
 
     @property
     def all_prefixes(self) -> Dict:
-        default_prefixes = self._default_prefixes if self._default_prefixes is not None else {}
-        return {**default_prefixes, **self.prefixes_safe}
+        def compute():
+            default_prefixes = self._default_prefixes if self._default_prefixes is not None else {}
+            return {**default_prefixes, **self.prefixes_safe}
+
+        return self._derived("all_prefixes", compute)
 
     # get_prefix_namespace
     @property
     def prefix_namespace(self) \
             -> Dict[str, Union[Namespace, Type[DefinedNamespace]]]:
-        from ke_client.gp_ext._semantic_utils import init_prefix_namespace
-        from ke_client import ke_settings
-        kb_prefix, kb_uri = ke_settings.kb_prefix
-        return init_prefix_namespace(prefixes=self.prefixes_safe, default_prefixes=self._default_prefixes,
-                                     dynamic_prefixes={kb_prefix: kb_uri})
+        def compute():
+            from ke_client.gp_ext._semantic_utils import init_prefix_namespace
+            from ke_client import ke_settings
+            kb_prefix, kb_uri = ke_settings.kb_prefix
+            return init_prefix_namespace(prefixes=self.prefixes_safe, default_prefixes=self._default_prefixes,
+                                         dynamic_prefixes={kb_prefix: kb_uri})
+
+        return self._derived("prefix_namespace", compute)
 
     def set_default_prefix(self, default_prefixes: Dict):
 
         self._default_prefixes = default_prefixes
+        self.invalidate()
 
     @property
     def pattern_value(self) -> str:
-        return "\n ".join(self.pattern)
+        return self._derived("pattern_value", lambda: "\n ".join(self.pattern))
 
     @property
     def result_pattern_value(self) -> Optional[str]:
         if self.result_pattern is not None:
-            return "\n ".join(self.result_pattern)
+            return self._derived("result_pattern_value", lambda: "\n ".join(self.result_pattern))
         return None
 
+    @property
+    def pattern_triples(self) -> List[Tuple[Node, Node, Node]]:
+        """
+        triples of the pattern parsed with `prefix_namespace`
+        """
+        def compute():
+            from ke_client.gp_ext._sub_graph_utils import parse_turtle_pattern
+            return parse_turtle_pattern(self.pattern_value, prefixes=self.prefix_namespace)
+
+        return self._derived("pattern_triples", compute)
+
+    @property
+    def result_pattern_triples(self) -> Optional[List[Tuple[Node, Node, Node]]]:
+        """
+        triples of the result pattern parsed with `prefix_namespace`, None - no result pattern
+        """
+        if self.result_pattern is None:
+            return None
+
+        def compute():
+            from ke_client.gp_ext._sub_graph_utils import parse_turtle_pattern
+            return parse_turtle_pattern(self.result_pattern_value, prefixes=self.prefix_namespace)
+
+        return self._derived("result_pattern_triples", compute)
+
     def verify_required_bindings(self, bindings: Union[Dict[str, Any], Any]):
         from ke_client import BindingsBase
         if self.required_bindings is None:
@@ -81,24 +188,39 @@ class GraphPattern(BaseModel):
 
     @property
     def pattern_vars(self) -> List[str]:
+        """
+        variables of the pattern in order of appearance (shared list, don't modify it)
+        """
         # k[1:] -> skip sign '?'
-        return [k[1:] for k in rdf_binding_pattern.findall(self.pattern_value)]
+        return self._derived("pattern_vars", lambda: [k[1:] for k in rdf_binding_pattern.findall(self.pattern_value)])
 
     @property
     def result_pattern_vars(self) -> List[str]:
+        """
+        variables of the result pattern in order of appearance (shared list, don't modify it)
+        """
         if self.result_pattern_value is None:
             return []
         # k[1:] -> skip sign '?'
-        return [k[1:] for k in rdf_binding_pattern.findall(self.result_pattern_value)]
+        return self._derived("result_pattern_vars",
+                             lambda: [k[1:] for k in rdf_binding_pattern.findall(self.result_pattern_value)])
+
+    @property
+    def pattern_var_set(self) -> FrozenSet[str]:
+        return self._derived("pattern_var_set", lambda: frozenset(self.pattern_vars))
+
+    @property
+    def result_pattern_var_set(self) -> FrozenSet[str]:
+        return self._derived("result_pattern_var_set", lambda: frozenset(self.result_pattern_vars))
 
     def get_result_pattern_bindings(self, result_binding_set: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-        result_vars = self.result_pattern_vars
+        result_vars = self.result_pattern_var_set
         for v in result_vars:
             if v not in result_binding_set:
                 return None
         # all required variables are in the result set
         # TODO: verify if variables names can be switched in the result binding set
-        return {k: v for k, v in result_binding_set.items() if k in self.result_pattern_vars}
+        return {k: v for k, v in result_binding_set.items() if k in result_vars}
 
     def ki_name(self, ki_type):
         return f"{ki_type}-{self.name}"
@@ -146,8 +268,39 @@ class KnowledgeInteraction(BaseModel):
     ] = None
     ki_type: EnumItem
     graph_pattern: GraphPattern
+    # REACT/ANSWER: process handle requests in arrival order when dispatched to the worker pool,
+    # None - client's default
+    ordered: Optional[bool] = None
+    # REACT/ANSWER: input/output bindings mismatch check mode (full, sampled, off), None - client's default
+    mismatch_check: Optional[str] = None
     # _is_registered_: bool = False
     _ki_id_: Optional[str] = None
+    _validation_plan_: Optional[Any] = None
+    _mismatch_checker_: Optional[Any] = None
+
+    @property
+    def validation_plan(self) -> 'KIValidationPlan':
+        """
+        validation of the sent bindings, compiled from the graph pattern once (on KI declaration or first use)
+        """
+        if self._validation_plan_ is None:
+            from ke_client import ke_settings
+            from ke_client.client._ki_validation import KIValidationPlan
+            self._validation_plan_ = KIValidationPlan(graph_pattern=self.graph_pattern, ki_type=self.ki_type,
+                                                      trusted=ke_settings.trusted_bindings)
+        return self._validation_plan_
+
+    @property
+    def mismatch_checker(self) -> 'BindingsMismatchCheck':
+        """
+        REACT/ANSWER check of the output bindings against the input bindings, counts the detected mismatches
+        """
+        if self._mismatch_checker_ is None:
+            from ke_client import ke_settings
+            from ke_client.client._ki_mismatch import BindingsMismatchCheck
+            mode = self.mismatch_check if self.mismatch_check is not None else ke_settings.mismatch_check
+            self._mismatch_checker_ = BindingsMismatchCheck(mode=mode, sample_size=ke_settings.mismatch_check_sample)
+        return self._mismatch_checker_
 
     @property
     def ki_id(self):
@@ -163,16 +316,22 @@ class KnowledgeInteraction(BaseModel):
         del self._ki_id_
 
 
-class PostExchangeInfo(BaseModel):
-    argumentBindingSet: List[Dict[str, Any]]
-    resultBindingSet: List[Dict[str, Any]]
+class ExchangeInfoBase(BaseModel):
     initiator: Optional[str] = None
     knowledgeBaseId: str
     knowledgeInteractionId: str
     failedMessage: Optional[str] = None
     exchangeStart: str
+    exchangeEnd: Optional[str] = None
     status: str
 
+    @cached_property
+    def exchange_status(self) -> EnumItem:
+        """
+        parsed `status`
+        """
+        return ExchangeInfoStatus.parse(self.status)
+
     @property
     def exchange_start_ms(self):
         return time_utils.xsd_to_ts(self.exchangeStart)
@@ -182,47 +341,63 @@ class PostExchangeInfo(BaseModel):
         return time_utils.xsd_to_ts(self.exchangeEnd)
 
 
-class AskExchangeInfo(BaseModel):
-    bindingSet: List[Dict[str, Any]]
-    initiator: Optional[str] = None
-    knowledgeBaseId: str
-    knowledgeInteractionId: str
-    failedMessage: Optional[str] = None
-    exchangeStart: str
-    status: str
+class PostExchangeInfo(ExchangeInfoBase):
+    argumentBindingSet: List[Dict[str, Any]] = Field(default_factory=list)
+    resultBindingSet: List[Dict[str, Any]] = Field(default_factory=list)
 
-    @property
-    def exchange_start_ms(self):
-        return time_utils.xsd_to_ts(self.exchangeStart)
 
-    @property
-    def exchange_end_ms(self):
-        return time_utils.xsd_to_ts(self.exchangeEnd)
+class AskExchangeInfo(ExchangeInfoBase):
+    bindingSet: List[Dict[str, Any]] = Field(default_factory=list)
 
 
 class KIPostResponse(BaseModel):
     resultBindingSet: List[Dict[str, Any]]
     exchangeInfo: List[PostExchangeInfo]
 
-    @property
-    def result_binding_set(self):
+    @cached_property
+    def result_binding_set(self) -> List[Dict[str, Any]]:
+        """
+        result bindings merged from all exchanges, computed on the first access
+        """
         if len(self.resultBindingSet) > 0:
             return self.resultBindingSet
-        accu: List = []
-        for ei in self.exchangeInfo:
-            accu += ei.resultBindingSet
-        return accu
+        return [b for ei in self.exchangeInfo for b in ei.resultBindingSet]
+
+    def iter_result_binding_set(self) -> Iterator[Dict[str, Any]]:
+        """
+        iterate over the merged result bindings without building the merged list
+        """
+        if len(self.resultBindingSet) > 0:
+            yield from self.resultBindingSet
+        else:
+            for ei in self.exchangeInfo:
+                yield from ei.resultBindingSet
 
     def result_bindings(self, binding_obj_cls):
         from ke_client import BindingsBase
         if issubclass(binding_obj_cls, BindingsBase):
-            return [binding_obj_cls(**b) for b in self.resultBindingSet]
+            return binding_obj_cls.codec().from_wire_many(self.resultBindingSet)
         else:
             raise TypeError(
                 f"invalid deserialization type: {binding_obj_cls}, expected sublass of {BindingsBase.__name__}")
 
+    def result_frame(self, variables: Optional[List[str]] = None) -> 'BindingSetFrame':
+        """
+        :param variables: columns of the frame, default: all variables
+        :return: merged result bindings in columnar form
+        """
+        from ke_client import BindingSetFrame
+        return BindingSetFrame.from_binding_set(self.iter_result_binding_set(), variables=variables)
+
+    def result_bindings_view(self, binding_obj_cls) -> 'BindingSetView':
+        """
+        :return: lazy view of the merged result bindings, objects are built on access
+        """
+        from ke_client import BindingSetView
+        return BindingSetView(self.result_binding_set, binding_obj_cls)
+
     def get_ack(self) -> List[KIACK]:
-        return [KIACK(status=ei.status == ExchangeInfoStatus.SUCCEEDED, kb_id=ei.knowledgeBaseId)
+        return [KIACK(status=ei.exchange_status == ExchangeInfoStatus.SUCCEEDED, kb_id=ei.knowledgeBaseId)
                 for ei in self.exchangeInfo]
 
 
@@ -230,25 +405,62 @@ class KIAskResponse(BaseModel):
     bindingSet: List[Dict[str, Any]]
     exchangeInfo: List[AskExchangeInfo]
 
-    @property
+    @cached_property
     def binding_set(self) -> List[Dict[str, Any]]:
+        """
+        bindings merged from all exchanges, computed on the first access
+        """
         if len(self.bindingSet) > 0:
             return self.bindingSet
-        accu: List = []
-        for ei in self.exchangeInfo:
-            accu += ei.bindingSet
-        return accu
+        return [b for ei in self.exchangeInfo for b in ei.bindingSet]
+
+    def iter_binding_set(self) -> Iterator[Dict[str, Any]]:
+        """
+        iterate over the merged bindings without building the merged list
+        """
+        if len(self.bindingSet) > 0:
+            yield from self.bindingSet
+        else:
+            for ei in self.exchangeInfo:
+                yield from ei.bindingSet
 
     def bindings(self, binding_obj_cls):
         from ke_client import BindingsBase
         if issubclass(binding_obj_cls, BindingsBase):
-            return [binding_obj_cls(**b) for b in self.binding_set]
+            return binding_obj_cls.codec().from_wire_many(self.binding_set)
         else:
             raise TypeError(
                 f"invalid deserialization type: {binding_obj_cls}, expected sublass of {BindingsBase.__name__}")
 
+    def frame(self, variables: Optional[List[str]] = None) -> 'BindingSetFrame':
+        """
+        :param variables: columns of the frame, default: all variables
+        :return: merged bindings in columnar form
+        """
+        from ke_client import BindingSetFrame
+        return BindingSetFrame.from_binding_set(self.iter_binding_set(), variables=variables)
+
+    def bindings_view(self, binding_obj_cls) -> 'BindingSetView':
+        """
+        :return: lazy view of the merged bindings, objects are built on access,
+         e.g. `response.bindings_view(Offer).where(market_uri=market)[:100]`
+        """
+        from ke_client import BindingSetView
+        return BindingSetView(self.binding_set, binding_obj_cls)
+
+    def iter_bindings(self, binding_obj_cls):
+        """
+        iterate over the merged bindings as `binding_obj_cls` objects
+        """
+        from ke_client import BindingsBase
+        if not issubclass(binding_obj_cls, BindingsBase):
+            raise TypeError(
+                f"invalid deserialization type: {binding_obj_cls}, expected sublass of {BindingsBase.__name__}")
+        for b in self.iter_binding_set():
+            yield binding_obj_cls(b)
+
     def get_ack(self) -> List[KIACK]:
-        return [KIACK(status=ei.status == ExchangeInfoStatus.SUCCEEDED, kb_id=ei.knowledgeBaseId)
+        return [KIACK(status=ei.exchange_status == ExchangeInfoStatus.SUCCEEDED, kb_id=ei.knowledgeBaseId)
                 for ei in self.exchangeInfo]
 
         # [ {dict: 8} {'argumentBindingSet': [{'ts_date_from': '"1970-01-01T00:00:00.001000+00:00"', 'ts_date_to':
@@ -267,6 +479,24 @@ class KIAskResponse(BaseModel):
         # ]
 
 
+class KIHandleRequest(BaseModel):
+    """
+    REACT/ANSWER request received from `sc/handle`
+    """
+    knowledgeInteractionId: str
+    handleRequestId: int
+    bindingSet: List[Dict[str, Any]] = Field(default_factory=list)
+    requestingKnowledgeBaseId: Optional[str] = None
+
+
+class SmartConnectorLease(BaseModel):
+    """
+    lease of the smart connector returned by `sc/lease/renew`
+    """
+    knowledgeBaseId: str
+    expires: Optional[datetime] = None
+
+
 # @dataclass
 # class SmartClient:
 #     knowledgeBaseId: str
@@ -7,6 +7,9 @@ from pydantic import PrivateAttr
 
 from pydantic_settings import BaseSettings, InitSettingsSource, PydanticBaseSettingsSource, SettingsConfigDict
 
+# libyaml C loader, pure-Python loader if PyYAML is built without libyaml
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 
 class MergeConfigMixin:
     def __init_subclass__(cls, **kwargs):
@@ -101,9 +104,9 @@ def _load_yml(config_path, section, file_vars: Optional[Dict] = None):
                 from string import Template
                 template = Template(stream.read())
                 rendered = template.substitute(file_vars)
-                _config = yaml.safe_load(rendered, )
+                _config = yaml.load(rendered, Loader=_YAML_LOADER)
             else:
-                _config = yaml.safe_load(stream, )
+                _config = yaml.load(stream, Loader=_YAML_LOADER)
             if section is not None:
                 try:
                     _config = _config[section]
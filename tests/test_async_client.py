@@ -0,0 +1,39 @@
+import asyncio
+
+import pytest
+
+from ke_client import AsyncKEClient, CircuitBreaker, RetryPolicy
+
+httpx = pytest.importorskip("httpx")
+
+
+def async_client(handler, monkeypatch) -> AsyncKEClient:
+    client = AsyncKEClient(kb_id="http://a.example.org", kb_name="a", kb_description="",
+                           ke_rest_endpoint="http://ke.example.org/rest/",
+                           retry_policy=RetryPolicy(max_attempts=2, base_delay=0.01, jitter=0.0),
+                           circuit_breaker=CircuitBreaker(failure_threshold=0))
+    transport = httpx.MockTransport(handler)
+    client._http_client_ = httpx.AsyncClient(transport=transport)
+    client._handle_http_client_ = httpx.AsyncClient(transport=transport)
+    # registered and running client, no reconnect to a KE server
+    monkeypatch.setattr(AsyncKEClient, "_assert_client_state_", lambda self: None)
+    monkeypatch.setattr(AsyncKEClient, "reconnect", lambda self, *args, **kwargs: None)
+    return client
+
+
+@pytest.mark.parametrize("error", [httpx.RemoteProtocolError, httpx.ReadError, httpx.ConnectError])
+def test_handle_poll_dropped_connection_is_retried(error, monkeypatch):
+    polls = []
+
+    def handler(request):
+        polls.append(request.url.path)
+        if len(polls) <= 4:
+            raise error("connection dropped", request=request)
+        # KE stopped, ends the loop
+        return httpx.Response(410)
+
+    client = async_client(handler, monkeypatch)
+    asyncio.run(client._handler_loop_async_())
+    # 2 polls (attempts of the retry policy) failed twice, the loop backed off and polled again
+    assert len(polls) == 5
+    assert client._retry_policy_.stats()["retries"] == 2
@@ -0,0 +1,41 @@
+import threading
+import time
+
+from ke_client.client._batch import run_batch
+
+
+def test_results_in_call_order():
+    results = run_batch([lambda i=i: i * 2 for i in range(5)], max_concurrency=2)
+    assert [r.unwrap() for r in results] == [0, 2, 4, 6, 8]
+    assert [r.index for r in results] == list(range(5))
+
+
+def test_errors_captured_per_call():
+    def fail():
+        raise ConnectionError("down")
+
+    results = run_batch([lambda: 1, fail], timeout=1.0)
+    assert results[0].ok and results[0].response == 1
+    assert isinstance(results[1].error, ConnectionError)
+
+
+def test_queued_calls_within_timeout():
+    def call():
+        time.sleep(0.05)
+        return "ok"
+
+    results = run_batch([call] * 4, max_concurrency=1, timeout=0.5)
+    assert all(r.ok for r in results)
+
+
+def test_queued_call_behind_timed_out_call():
+    release = threading.Event()
+    started = time.monotonic()
+    try:
+        results = run_batch([lambda: release.wait(5), lambda: "queued"], max_concurrency=1, timeout=0.2)
+    finally:
+        release.set()
+    # the queued call isn't waited for until the hung call returns
+    assert time.monotonic() - started < 2.0
+    assert isinstance(results[0].error, TimeoutError)
+    assert isinstance(results[1].error, TimeoutError)
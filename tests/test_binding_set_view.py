@@ -0,0 +1,78 @@
+from typing import ClassVar, Optional
+
+import pytest
+from rdflib import URIRef, Literal
+
+from ke_client import BindingsBase, BindingSetView
+from ke_client.ki_model import KIAskResponse, KIPostResponse
+
+NIL = "<http://www.w3.org/1999/02/22-rdf-syntax-ns#nil>"
+
+
+class TsValue(BindingsBase):
+    built: ClassVar[int] = 0
+    ts: URIRef
+    value: Optional[Literal] = None
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        TsValue.built += 1
+
+
+def bindings(n: int):
+    return [{"ts": f"<http://example.org/ts/{i % 2}>", "value": f'"{i}"'} for i in range(n)]
+
+
+def exchange(binding_set, key: str = "bindingSet"):
+    return {"knowledgeBaseId": "http://b.example.org", "knowledgeInteractionId": "http://b.example.org/ki",
+            "exchangeStart": "2024-01-01T00:00:00Z", "status": "SUCCEEDED", key: binding_set}
+
+
+def ask_response() -> KIAskResponse:
+    # merged from the exchanges
+    return KIAskResponse(bindingSet=[], exchangeInfo=[exchange(bindings(3)), exchange(bindings(5)[3:])])
+
+
+def test_merged_binding_set_is_cached():
+    response = ask_response()
+    assert response.binding_set == bindings(3) + bindings(5)[3:]
+    assert response.binding_set is response.binding_set
+    assert list(response.iter_binding_set()) == response.binding_set
+
+
+def test_view_builds_objects_on_access():
+    TsValue.built = 0
+    view = ask_response().bindings_view(TsValue)
+    assert len(view) == 5
+    assert TsValue.built == 0
+    assert view[4].value == Literal("4")
+    assert TsValue.built == 1
+    page = view[1:3]
+    assert isinstance(page, BindingSetView)
+    assert [o.value for o in page] == [Literal("1"), Literal("2")]
+    assert TsValue.built == 3
+
+
+def test_view_filters():
+    view = BindingSetView(bindings(6) + [{"ts": "<http://example.org/ts/1>", "value": NIL}], TsValue)
+    ts_1 = view.where(ts=URIRef("http://example.org/ts/1"))
+    assert len(ts_1) == 4
+    assert len(view.where(ts="<http://example.org/ts/1>", value=Literal("3"))) == 1
+    assert len(ts_1.having("value")) == 3
+    assert len(view.filter(lambda b: b["value"] == '"0"')) == 1
+    assert list(view.values("value"))[:2] == [Literal("0"), Literal("1")]
+
+
+def test_invalid_view_class():
+    with pytest.raises(TypeError):
+        BindingSetView(bindings(1), dict)
+    with pytest.raises(TypeError):
+        list(ask_response().iter_bindings(dict))
+
+
+def test_post_result_view():
+    response = KIPostResponse(resultBindingSet=[], exchangeInfo=[exchange(bindings(2), key="resultBindingSet")])
+    assert list(response.iter_result_binding_set()) == bindings(2)
+    view = response.result_bindings_view(TsValue)
+    assert [o.ts for o in view] == [URIRef("http://example.org/ts/0"), URIRef("http://example.org/ts/1")]
+    assert [o.value for o in ask_response().iter_bindings(TsValue)][-1] == Literal("4")
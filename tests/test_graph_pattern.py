@@ -0,0 +1,68 @@
+import pytest
+from rdflib import URIRef, Variable
+
+from ke_client.ki_model import GraphPattern
+
+EX = "http://example.org/"
+
+
+def graph_pattern() -> GraphPattern:
+    return GraphPattern(name="ts-value", prefixes={"ex": EX},
+                        pattern=["?ts ex:hasValue ?value .", "?ts ex:unit ?unit ."],
+                        result_pattern=["?ts ex:ok ?ok ."], required_bindings=["ts"])
+
+
+def test_derived_values():
+    gp = graph_pattern()
+    assert gp.pattern_value == "?ts ex:hasValue ?value .\n ?ts ex:unit ?unit ."
+    assert gp.pattern_vars == ["ts", "value", "ts", "unit"]
+    assert gp.pattern_var_set == frozenset({"ts", "value", "unit"})
+    assert gp.result_pattern_var_set == frozenset({"ts", "ok"})
+    assert gp.pattern_triples[0] == (Variable("ts"), URIRef(f"{EX}hasValue"), Variable("value"))
+    assert gp.result_pattern_triples == [(Variable("ts"), URIRef(f"{EX}ok"), Variable("ok"))]
+    assert gp.get_result_pattern_bindings({"ts": "<a>", "ok": "<b>", "x": "<c>"}) == {"ts": "<a>", "ok": "<b>"}
+    assert gp.get_result_pattern_bindings({"ts": "<a>"}) is None
+
+
+def test_derived_values_are_cached():
+    gp = graph_pattern()
+    assert gp.pattern_vars is gp.pattern_vars
+    assert gp.pattern_var_set is gp.pattern_var_set
+    assert gp.pattern_triples is gp.pattern_triples
+    assert gp.all_prefixes is gp.all_prefixes
+
+
+def test_frozen_pattern():
+    gp = graph_pattern()
+    gp.freeze()
+    assert gp.frozen
+    with pytest.raises(AttributeError):
+        gp.pattern = ["?a ex:b ?c ."]
+    with pytest.raises(AttributeError):
+        gp.prefixes = {}
+    assert gp.pattern_var_set == frozenset({"ts", "value", "unit"})
+
+
+def test_assignment_drops_derived_values():
+    gp = graph_pattern()
+    assert "value" in gp.pattern_var_set
+    gp.pattern = ["?ts ex:hasOther ?other ."]
+    assert gp.pattern_var_set == frozenset({"ts", "other"})
+
+
+def test_default_prefixes():
+    gp = graph_pattern()
+    gp.freeze()
+    assert gp.all_prefixes == {"ex": EX}
+    gp.set_default_prefix({"ex": "http://other.example.org/", "rdf": "http://www.w3.org/1999/02/22-rdf-syntax-ns#"})
+    # pattern prefixes override the defaults
+    assert gp.all_prefixes == {"ex": EX, "rdf": "http://www.w3.org/1999/02/22-rdf-syntax-ns#"}
+    derived = gp.pattern_vars
+    gp.invalidate()
+    assert gp.pattern_vars is not derived
+    assert gp.pattern_vars == derived
+
+
+def test_missing_required_binding():
+    with pytest.raises(KeyError):
+        GraphPattern(name="ts", pattern=["?ts ex:hasValue ?value ."], required_bindings=["unit"])
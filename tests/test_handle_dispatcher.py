@@ -0,0 +1,69 @@
+import threading
+import time
+
+import pytest
+
+from ke_client.client._handle_dispatcher import KIHandleDispatcher
+
+
+def test_shutdown_finishes_running_drops_queued():
+    dispatcher = KIHandleDispatcher(workers=1, max_queue=4)
+    started, release = threading.Event(), threading.Event()
+    done = []
+
+    def slow():
+        started.set()
+        release.wait(5)
+        done.append("slow")
+
+    dispatcher.submit("ki-1", slow)
+    started.wait(5)
+    dispatcher.submit("ki-1", lambda: done.append("queued-ordered"))
+    dispatcher.submit("ki-2", lambda: done.append("queued-unordered"), ordered=False)
+    threading.Timer(0.1, release.set).start()
+    dispatcher.shutdown(wait=True)
+
+    assert done == ["slow"]
+    stats = dispatcher.stats()
+    assert stats["completed"] == 1
+    assert stats["dropped"] == 2
+    assert stats["in_flight"] == 0
+    assert dispatcher.closed
+    with pytest.raises(RuntimeError):
+        dispatcher.submit("ki-1", lambda: None)
+
+
+@pytest.mark.parametrize("ordered", [True, False])
+def test_shutdown_while_submit_waits_for_slot(ordered):
+    dispatcher = KIHandleDispatcher(workers=1, max_queue=1)
+    started, release = threading.Event(), threading.Event()
+    errors = []
+
+    def slow():
+        started.set()
+        release.wait(5)
+
+    def submit():
+        try:
+            dispatcher.submit("ki-2", lambda: None, ordered=ordered)
+        except Exception as ex:
+            errors.append(ex)
+
+    dispatcher.submit("ki-1", slow)
+    started.wait(5)
+    submitter = threading.Thread(target=submit)
+    submitter.start()
+    while dispatcher.stats()["saturated"] == 0:
+        time.sleep(0.01)
+    # the submitter gets the slot after shutdown, the executor rejects the request
+    dispatcher.shutdown(wait=False)
+    release.set()
+    submitter.join(5)
+
+    assert errors == []
+    stats = dispatcher.stats()
+    assert stats["dropped"] == 1
+    assert stats["in_flight"] == 0
+    assert "ki-2" not in dispatcher._ki_queues_
+    # the slot is released
+    assert dispatcher._slots_.acquire(blocking=False)
@@ -0,0 +1,29 @@
+import threading
+
+from ke_client.client import _http_pool
+
+
+def test_get_http_pool_single_instance(monkeypatch):
+    monkeypatch.setattr(_http_pool, "_http_pool", None)
+    created = []
+    init = _http_pool.KEHttpPool.__init__
+
+    def counting_init(self, *args, **kwargs):
+        created.append(self)
+        init(self, *args, **kwargs)
+
+    monkeypatch.setattr(_http_pool.KEHttpPool, "__init__", counting_init)
+    barrier = threading.Barrier(8)
+    pools = []
+
+    def get():
+        barrier.wait()
+        pools.append(_http_pool.get_http_pool())
+
+    threads = [threading.Thread(target=get) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(created) == 1
+    assert all(pool is created[0] for pool in pools)
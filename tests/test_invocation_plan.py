@@ -0,0 +1,57 @@
+import inspect
+from typing import Any, Dict, List, Optional
+
+from rdflib import URIRef, Literal
+
+from ke_client import BindingsBase
+from ke_client.client._ki_holder import _InvocationPlan
+
+TS = "<http://example.org/ts/1>"
+
+
+class TsValue(BindingsBase):
+    ts: URIRef
+    value: Optional[Literal] = None
+
+
+def plan(func) -> _InvocationPlan:
+    params = {k: param for k, param in inspect.signature(func).parameters.items()
+              if param.kind == inspect.Parameter.POSITIONAL_OR_KEYWORD}
+    return _InvocationPlan(params)
+
+
+def test_objects_handler():
+    def handler(ki_id: str, bindings: List[TsValue]) -> List[TsValue]:
+        return bindings
+
+    invocation_plan = plan(handler)
+    assert invocation_plan.pass_ki_id and invocation_plan.pass_bindings
+    assert invocation_plan.bindings_cls is TsValue
+    kwargs = invocation_plan.kwargs(("ki-1", [{"ts": TS, "value": '"1"'}]))
+    assert kwargs["ki_id"] == "ki-1"
+    assert kwargs["bindings"] == [TsValue(ts=URIRef("http://example.org/ts/1"), value=Literal("1"))]
+
+
+def test_dict_handler():
+    def handler(bindings: List[Dict[str, Any]]):
+        return bindings
+
+    invocation_plan = plan(handler)
+    assert not invocation_plan.pass_ki_id
+    assert invocation_plan.bindings_cls is None
+    assert invocation_plan.kwargs(("ki-1", [{"ts": TS}])) == {"bindings": [{"ts": TS}]}
+
+
+def test_handler_without_parameters():
+    def handler():
+        return []
+
+    assert plan(handler).kwargs(("ki-1", [{"ts": TS}])) == {}
+
+
+def test_empty_ke_binding_set():
+    def handler(ki_id, bindings: List[TsValue]):
+        return bindings
+
+    assert plan(handler).kwargs(("ki-1", [{}])) == {"ki_id": "ki-1", "bindings": []}
+    assert plan(handler).kwargs(("ki-1", [])) == {"ki_id": "ki-1", "bindings": []}
@@ -0,0 +1,85 @@
+from typing import Optional
+
+import orjson
+from rdflib import URIRef, Literal
+
+from ke_client import BindingsBase, CircuitBreaker, KEClient, RetryPolicy, TargetedBindings
+from ke_client.client._client_base import KEClientBase
+from ke_client.client._ki_utils import encode_ke_request, prepare_ke_request
+from ke_client.client._transport import KETransport, KEResponse
+from ke_client.ki_model import GraphPattern, KnowledgeInteraction, KnowledgeInteractionType
+
+NIL = "<http://www.w3.org/1999/02/22-rdf-syntax-ns#nil>"
+TS = "<http://example.org/ts/1>"
+
+
+class TsValue(BindingsBase):
+    ts: URIRef
+    value: Optional[Literal] = None
+
+
+def objects():
+    return [TsValue(ts=URIRef("http://example.org/ts/1"), value=Literal("1")),
+            TsValue(ts=URIRef("http://example.org/ts/1"))]
+
+
+def ki(ki_type) -> KnowledgeInteraction:
+    graph_pattern = GraphPattern(name="ts-value", pattern=["?ts <http://example.org/hasValue> ?value ."])
+    return KnowledgeInteraction(ki_name="ts-value", ki_type=ki_type, graph_pattern=graph_pattern)
+
+
+def test_encode_objects():
+    ask = orjson.loads(encode_ke_request(objects(), ki_type=KnowledgeInteractionType.ASK))
+    assert ask == [{"ts": TS, "value": '"1"'}, {"ts": TS}]
+    post = orjson.loads(encode_ke_request(objects(), ki_type=KnowledgeInteractionType.POST))
+    assert post == [{"ts": TS, "value": '"1"'}, {"ts": TS, "value": NIL}]
+    # N3 bindings are encoded as they are
+    assert orjson.loads(encode_ke_request([{"ts": TS}], ki_type=KnowledgeInteractionType.POST)) == [{"ts": TS}]
+
+
+def test_prepare_targeted_request():
+    targeted = TargetedBindings(objects(), knowledge_bases=["http://b.example.org"])
+    body = orjson.loads(prepare_ke_request(targeted, ki=ki(KnowledgeInteractionType.POST), call_ctx="test"))
+    assert body == {"recipientSelector": {"knowledgeBases": ["http://b.example.org"]},
+                    "bindingSet": [{"ts": TS, "value": '"1"'}, {"ts": TS, "value": NIL}]}
+
+
+def test_handle_request_body_embeds_encoded_binding_set():
+    binding_set = prepare_ke_request(objects(), ki=ki(KnowledgeInteractionType.POST), call_ctx="test")
+    react = orjson.loads(KEClientBase._handle_request_body_(binding_set, handle_request_id=7,
+                                                            ki_type=KnowledgeInteractionType.REACT))
+    assert react == {"handleRequestId": 7, "bindingSet": orjson.loads(binding_set),
+                     "resultBindingSet": orjson.loads(binding_set)}
+    answer = orjson.loads(KEClientBase._handle_request_body_([{"ts": TS}], handle_request_id=8,
+                                                             ki_type=KnowledgeInteractionType.ANSWER))
+    assert answer == {"handleRequestId": 8, "bindingSet": [{"ts": TS}]}
+
+
+class FlakyTransport(KETransport):
+    connection_errors = (ConnectionError,)
+
+    def __init__(self):
+        self.bodies = []
+
+    def request(self, method, url, headers=None, json=None, timeout=None, verify=True, long_poll=False,
+                content=None):
+        self.bodies.append((json, content))
+        if len(self.bodies) == 1:
+            raise ConnectionError("connection reset")
+        return KEResponse(200, b"{}", url)
+
+
+def test_retry_sends_same_bytes(monkeypatch):
+    transport = FlakyTransport()
+    client = KEClient(kb_id="http://a.example.org", kb_name="a", kb_description="",
+                      ke_rest_endpoint="http://ke.example.org/rest/", transport=transport,
+                      retry_policy=RetryPolicy(max_attempts=2, base_delay=0.01, jitter=0.0),
+                      circuit_breaker=CircuitBreaker(failure_threshold=0))
+    monkeypatch.setattr(KEClient, "_assert_client_state_", lambda self: None)
+    client._api_post_request_(endpoint="http://ke.example.org/rest/sc/post", headers={},
+                              ke_request=[{"ts": TS}])
+    assert len(transport.bodies) == 2
+    (json_1, content_1), (json_2, content_2) = transport.bodies
+    assert json_1 is None and json_2 is None
+    assert content_1 is content_2
+    assert orjson.loads(content_1) == [{"ts": TS}]
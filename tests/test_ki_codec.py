@@ -0,0 +1,67 @@
+from typing import Optional
+
+import pytest
+from rdflib import URIRef, Literal
+
+from ke_client import BindingsBase, BindingsCodec
+
+NIL = "<http://www.w3.org/1999/02/22-rdf-syntax-ns#nil>"
+TS = "<http://example.org/ts/1>"
+VALUE = '"1.5"^^<http://www.w3.org/2001/XMLSchema#double>'
+
+
+class Measurement(BindingsBase):
+    ts: URIRef
+    value: Literal
+    unit: Optional[URIRef] = None
+
+
+class UnitMeasurement(Measurement):
+    scale: Optional[Literal] = None
+
+
+def test_codec_is_compiled_once_per_class():
+    codec = Measurement.codec()
+    assert isinstance(codec, BindingsCodec)
+    assert Measurement.codec() is codec
+    # subclass has own fields
+    assert UnitMeasurement.codec() is not codec
+    assert "scale" in UnitMeasurement.codec().fields
+    assert "scale" not in codec.fields
+
+
+def test_field_classification():
+    fields = Measurement.codec().fields
+    assert fields["ts"].is_uri and not fields["ts"].is_optional
+    assert fields["value"].is_literal and not fields["value"].is_optional
+    assert fields["unit"].is_uri and fields["unit"].is_optional
+    assert Measurement.codec().defaults == {"unit": None}
+
+
+def test_decode():
+    decoded = Measurement.codec().decode({"ts": TS, "value": VALUE, "unit": NIL, "unknown": TS})
+    assert decoded == {"ts": URIRef("http://example.org/ts/1"), "value": Literal(1.5),
+                       "unit": URIRef("http://www.w3.org/1999/02/22-rdf-syntax-ns#nil")}
+    with pytest.raises(Exception, match="Nil node"):
+        Measurement.codec().decode({"ts": NIL, "value": VALUE})
+    with pytest.raises(Exception, match="Non nil URIRef"):
+        Measurement.codec().decode({"ts": TS, "value": TS})
+
+
+@pytest.mark.parametrize("validate", [True, False])
+def test_from_wire(validate):
+    codec = Measurement.codec()
+    objects = codec.from_wire_many([{"ts": TS, "value": VALUE}, {"ts": TS, "value": VALUE, "unit": TS}],
+                                   validate=validate)
+    assert all(type(o) is Measurement for o in objects)
+    assert objects[0] == Measurement(ts=URIRef("http://example.org/ts/1"), value=Literal(1.5))
+    assert objects[1].unit == URIRef("http://example.org/ts/1")
+    assert codec.from_wire({"ts": TS, "value": VALUE}, validate=validate) == objects[0]
+
+
+def test_to_wire():
+    obj = Measurement.codec().from_wire({"ts": TS, "value": VALUE})
+    assert BindingsCodec.to_wire(obj) == {"ts": TS, "value": VALUE}
+    assert BindingsCodec.to_wire(obj, skip_none=False) == {"ts": TS, "value": VALUE, "unit": NIL}
+    assert Measurement.codec().to_wire_many([obj, obj]) == [{"ts": TS, "value": VALUE}] * 2
+    assert obj.n3() == {"ts": TS, "value": VALUE}
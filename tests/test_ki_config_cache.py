@@ -0,0 +1,84 @@
+import os
+
+import pytest
+
+import ke_client
+
+MAIN_CONFIG = """knowledge_engine:
+  kb_name: "test"
+  kb_description: ""
+  prefixes:
+    kb: "${KB_ID}/"
+    saref: "https://saref.etsi.org/core/"
+  include:
+    - "%s"
+  graph_patterns:
+    dp:
+      name: "dp"
+      required_bindings: ["ts_uri"]
+      pattern:
+        - ' ?ts_uri saref:hasValue ?value ; saref:hasTimestamp ?timestamp . '
+"""
+
+INCLUDED_CONFIG = """knowledge_engine:
+  kb_name: "test"
+  kb_description: ""
+  prefixes:
+    s4ener: "https://saref.etsi.org/saref4ener/"
+  graph_patterns:
+    %s:
+      name: "%s"
+      pattern:
+        - ' ?ts_uri s4ener:hasUsage ?ts_usage ; s4ener:producedBy <${KB_ID}> . '
+"""
+
+
+@pytest.fixture
+def config_files(tmp_path, monkeypatch):
+    included = tmp_path / "included.yml"
+    included.write_text(INCLUDED_CONFIG % ("ts-usage", "ts-usage"))
+    main = tmp_path / "ke_config.yml"
+    main.write_text(MAIN_CONFIG % included)
+    settings = ke_client.ke_settings
+    monkeypatch.setattr(settings, "knowledge_base_id", "http://a.example.org")
+    monkeypatch.setattr(settings, "ki_config_path", str(main))
+    monkeypatch.setattr(settings, "ki_config_cache_dir", str(tmp_path / "cache"))
+    monkeypatch.setattr(ke_client, "ki_conf", None)
+    monkeypatch.setattr(ke_client, "ki_conf_load_timings", {})
+    return main, included
+
+
+def pattern_summary(ki_conf):
+    return {k: (gp.pattern_var_set, gp.pattern_triples) for k, gp in ki_conf.graph_patterns.items()}
+
+
+def test_snapshot_miss_then_hit(config_files):
+    main, included = config_files
+    loaded = ke_client.configure_ki()
+    # miss: both files read and the snapshot written
+    assert set(ke_client.ki_conf_load_timings) == {str(main), str(included)}
+    assert len(os.listdir(ke_client.ke_settings.ki_config_cache_dir)) == 1
+
+    cached = ke_client.configure_ki()
+    assert ke_client.ki_conf_load_timings == {}
+    assert cached is not loaded
+    assert cached.prefixes == loaded.prefixes
+    assert pattern_summary(cached) == pattern_summary(loaded)
+    assert cached.graph_patterns["dp"].required_bindings == ["ts_uri"]
+
+
+def test_snapshot_invalidated_by_included_file(config_files):
+    main, included = config_files
+    ke_client.configure_ki()
+    included.write_text(INCLUDED_CONFIG % ("ts-usage-v2", "ts-usage-v2"))
+    reloaded = ke_client.configure_ki()
+    assert str(included) in ke_client.ki_conf_load_timings
+    assert set(reloaded.graph_patterns) == {"dp", "ts-usage-v2"}
+
+
+def test_snapshot_invalidated_by_ki_vars(config_files, monkeypatch):
+    ke_client.configure_ki()
+    monkeypatch.setattr(ke_client.ke_settings, "knowledge_base_id", "http://b.example.org")
+    reloaded = ke_client.configure_ki()
+    assert ke_client.ki_conf_load_timings != {}
+    assert reloaded.prefixes["kb"] == "http://b.example.org/"
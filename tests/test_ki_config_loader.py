@@ -0,0 +1,74 @@
+import pytest
+
+from ke_client.client._ki_config_loader import KIConfigLoader
+
+MAIN_CONFIG = """knowledge_engine:
+  kb_name: "test"
+  kb_description: ""
+  prefixes:
+    kb: "${KB_ID}/"
+    saref: "https://saref.etsi.org/core/"
+  include:
+%s
+  graph_patterns:
+    dp:
+      name: "dp"
+      pattern:
+        - ' ?ts_uri saref:hasValue ?value . '
+"""
+
+INCLUDED_CONFIG = """knowledge_engine:
+  kb_name: "test"
+  kb_description: ""
+  prefixes:
+    saref: "http://example.org/saref/"
+    p%d: "http://example.org/%d/"
+    shared: "http://example.org/shared/%d/"
+  graph_patterns:
+    %s:
+      name: "%s"
+      pattern:
+        - ' ?ts_uri <http://example.org/producedBy> <${KB_ID}> . '
+"""
+
+FILE_VARS = {"KB_ID": "http://a.example.org"}
+
+
+def write_config(tmp_path, pattern_keys):
+    included = []
+    for i, key in enumerate(pattern_keys):
+        path = tmp_path / f"included_{i}.yml"
+        path.write_text(INCLUDED_CONFIG % (i, i, i, key, key))
+        included.append(str(path))
+    main = tmp_path / "ke_config.yml"
+    main.write_text(MAIN_CONFIG % "\n".join(f'    - "{path}"' for path in included))
+    return str(main), included
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_includes_are_merged_in_order(tmp_path, workers):
+    main, included = write_config(tmp_path, [f"gp-{i}" for i in range(6)])
+    loader = KIConfigLoader(file_vars=FILE_VARS, workers=workers)
+    ki_conf = loader.load(main)
+    assert loader.include_files == included
+    assert set(ki_conf.graph_patterns) == {"dp"} | {f"gp-{i}" for i in range(6)}
+    assert "<http://a.example.org>" in ki_conf.graph_patterns["gp-3"].pattern[0]
+    # later includes override the earlier ones, the main file overrides the includes
+    assert ki_conf.prefixes["shared"] == "http://example.org/shared/5/"
+    assert ki_conf.prefixes["saref"] == "https://saref.etsi.org/core/"
+    assert ki_conf.prefixes["kb"] == "http://a.example.org/"
+    assert ki_conf.prefixes["p0"] == "http://example.org/0/"
+    assert set(loader.timings) == {main, *included}
+    assert len(loader.slowest(3)) == 3
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_duplicate_graph_pattern_key(tmp_path, workers):
+    main, _ = write_config(tmp_path, ["gp-0", "gp-1", "gp-0"])
+    with pytest.raises(Exception, match="Duplicate graph pattern key: 'gp-0'"):
+        KIConfigLoader(file_vars=FILE_VARS, workers=workers).load(main)
+
+
+def test_invalid_workers():
+    with pytest.raises(ValueError):
+        KIConfigLoader(file_vars=FILE_VARS, workers=0)
@@ -0,0 +1,97 @@
+from datetime import timezone
+from decimal import Decimal
+
+import pytest
+from rdflib import Literal
+from rdflib.util import from_n3
+
+from ke_client import convert_literals, rdf_nil
+
+XSD = "http://www.w3.org/2001/XMLSchema#"
+
+
+def typed(lexical: str, datatype: str) -> str:
+    return f'"{lexical}"^^<{XSD}{datatype}>'
+
+
+# the same datatype repeated (suffix shortcut), switching datatypes and plain literals
+PYTHON_COLUMN = [
+    typed("1", "integer"), typed("-20", "integer"), typed("7", "int"),
+    typed("1.5", "double"), typed("1e3", "double"), typed("0.25", "float"),
+    typed("10.50", "decimal"), typed("0.1", "decimal"),
+    typed("2024-03-01T12:30:00", "dateTime"), typed("2024-03-01T12:30:00Z", "dateTime"),
+    typed("2024-03-01T12:30:00+02:00", "dateTime"), typed("2024-03-01", "date"),
+    typed("true", "boolean"), typed("0", "boolean"), typed("1", "boolean"),
+    typed("text", "string"), '"plain"', '"hallo"@nl',
+]
+
+
+def rdflib_values(column):
+    return [from_n3(v).toPython() for v in column]
+
+
+def test_python_matches_rdflib():
+    values = convert_literals(PYTHON_COLUMN, to="python")
+    expected = rdflib_values(PYTHON_COLUMN)
+    assert values == expected
+    assert [type(v) for v in values] == [type(v) for v in expected]
+
+
+def test_python_from_literal_objects():
+    literals = [from_n3(v) for v in PYTHON_COLUMN]
+    assert convert_literals(literals, to="python") == rdflib_values(PYTHON_COLUMN)
+
+
+def test_missing_values():
+    column = [typed("1", "integer"), None, rdf_nil.n3(), "rdf:nil", rdf_nil, typed("2", "integer")]
+    assert convert_literals(column, to="python") == [1, None, None, None, None, 2]
+    assert convert_literals(column, to="decimal") == [Decimal(1), None, None, None, None, Decimal(2)]
+
+
+def test_non_literal_rejected():
+    with pytest.raises(ValueError):
+        convert_literals(["<http://example.org/a>"], name="price")
+
+
+def test_unknown_conversion():
+    with pytest.raises(ValueError):
+        convert_literals([], to="int8")
+
+
+def test_decimal_matches_rdflib():
+    column = [typed("10.50", "decimal"), typed("0.1", "double"), typed("3", "integer"), typed("0.1", "decimal")]
+    values = convert_literals(column, to="decimal")
+    assert values == [Decimal(str(v)) for v in rdflib_values(column)]
+    assert all(type(v) is Decimal for v in values)
+    assert values[1] == Decimal("0.1")
+
+
+def test_float64_matches_rdflib():
+    np = pytest.importorskip("numpy")
+    column = [typed("1.5", "double"), typed("2", "integer"), None, typed("0.1", "decimal"), typed("-3.25", "float")]
+    values = convert_literals(column, to="float64")
+    expected = np.array([np.nan if v is None else float(v) for v in
+                         [None if v is None else from_n3(v).toPython() for v in column]])
+    assert values.dtype == np.float64
+    np.testing.assert_array_equal(values, expected)
+
+
+def test_datetime64_matches_rdflib():
+    np = pytest.importorskip("numpy")
+    column = [typed("2024-03-01T12:30:00", "dateTime"), typed("2024-03-01T12:30:00Z", "dateTime"),
+              typed("2024-03-01T12:30:00+00:00", "dateTime"), typed("2024-03-01T14:30:00+02:00", "dateTime"),
+              typed("2024-03-01T10:30:00.250-02:00", "dateTime"), None,
+              Literal("2024-03-01T12:30:00Z", datatype=f"{XSD}dateTime")]
+    values = convert_literals(column, to="datetime64")
+
+    def utc(n3):
+        if n3 is None:
+            return np.datetime64("NaT", "us")
+        value = (n3 if isinstance(n3, Literal) else from_n3(n3)).toPython()
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return np.datetime64(value, "us")
+
+    assert values.dtype == np.dtype("datetime64[us]")
+    np.testing.assert_array_equal(values, np.array([utc(v) for v in column], dtype="datetime64[us]"))
+    assert values[0] == values[1] == values[2] == values[3] == np.datetime64("2024-03-01T12:30:00")
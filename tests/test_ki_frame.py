@@ -0,0 +1,128 @@
+import json
+from datetime import datetime, timezone
+from typing import Optional
+
+import pytest
+from rdflib import URIRef, Literal
+
+from ke_client import BindingSetFrame, BindingsBase
+from ke_client.client._ki_convert import XSD, _NIL_N3
+from ke_client.client._ki_utils import prepare_ke_request
+from ke_client.ki_model import GraphPattern, KIAskResponse, KnowledgeInteraction, KnowledgeInteractionType
+
+TS_1 = "<http://example.org/ts/1>"
+TS_2 = "<http://example.org/ts/2>"
+
+
+class TsValue(BindingsBase):
+    ts: URIRef
+    value: Optional[Literal] = None
+
+
+def binding_set():
+    return [{"ts": TS_1, "value": f'"1.5"^^<{XSD}double>'},
+            {"ts": TS_2},
+            {"ts": TS_1, "value": f'"3"^^<{XSD}integer>', "unit": "<http://example.org/unit/kW>"}]
+
+
+def test_from_binding_set_pads_missing_variables():
+    frame = BindingSetFrame.from_binding_set(binding_set())
+    assert len(frame) == 3
+    assert frame.variables == ["ts", "value", "unit"]
+    assert frame["value"] == [f'"1.5"^^<{XSD}double>', None, f'"3"^^<{XSD}integer>']
+    assert frame["unit"] == [None, None, "<http://example.org/unit/kW>"]
+    # repeated values are stored once
+    assert frame["ts"][0] is frame["ts"][2]
+
+
+def test_from_binding_set_variables():
+    frame = BindingSetFrame.from_binding_set(binding_set(), variables=["ts", "unit"])
+    assert frame.variables == ["ts", "unit"]
+    assert "value" not in frame
+    assert frame["unit"] == [None, None, "<http://example.org/unit/kW>"]
+
+
+def test_from_columns():
+    ts = datetime(2024, 1, 1, 12, tzinfo=timezone.utc)
+    frame = BindingSetFrame.from_columns(uri=[URIRef("http://example.org/ts/1")], float=[2.5], int=[3], bool=[True],
+                                         ts=[ts], n3=[TS_2], none=[None])
+    assert frame["uri"] == [TS_1]
+    assert frame["float"] == [f'"2.5"^^<{XSD}double>']
+    assert frame["int"] == [f'"3"^^<{XSD}integer>']
+    assert frame["bool"] == [f'"true"^^<{XSD}boolean>']
+    assert frame["ts"] == [f'"{ts.isoformat()}"^^<{XSD}dateTime>']
+    assert frame["n3"] == [TS_2]
+    assert frame["none"] == [None]
+
+
+def test_columns_of_different_lengths():
+    with pytest.raises(ValueError):
+        BindingSetFrame({"ts": [TS_1], "value": []})
+    with pytest.raises(ValueError):
+        BindingSetFrame.from_columns(ts=[TS_1, TS_2], value=[1.0])
+
+
+def test_rows_and_binding_set():
+    frame = BindingSetFrame.from_binding_set(binding_set(), variables=["ts", "value"])
+    assert list(frame.rows()) == [{k: v for k, v in b.items() if k != "unit"} for b in binding_set()]
+    assert frame.to_binding_set() == list(frame.rows())
+    # unbound values are sent as rdf:nil
+    assert frame.to_binding_set(skip_none=False)[1] == {"ts": TS_2, "value": _NIL_N3}
+
+
+def test_select_take_head():
+    frame = BindingSetFrame.from_binding_set(binding_set())
+    assert frame.select("ts").variables == ["ts"]
+    assert frame.take([2, 0])["ts"] == [TS_1, TS_1]
+    assert frame.take([2, 0])["unit"] == ["<http://example.org/unit/kW>", None]
+    assert len(frame.head(2)) == 2
+    assert len(frame.head(10)) == 3
+
+
+def test_values_and_nodes():
+    frame = BindingSetFrame.from_binding_set(binding_set() + [{"ts": _NIL_N3, "value": '"a"'}])
+    assert frame.values("value") == [1.5, None, 3, "a"]
+    assert frame.values("ts") == [URIRef("http://example.org/ts/1"), URIRef("http://example.org/ts/2"),
+                                  URIRef("http://example.org/ts/1"), None]
+    nodes = frame.nodes("ts")
+    assert nodes[0] == URIRef("http://example.org/ts/1")
+    assert nodes[0] is nodes[2]
+    assert frame.nodes("unit")[:2] == [None, None]
+
+
+def test_to_numpy():
+    np = pytest.importorskip("numpy")
+    frame = BindingSetFrame.from_binding_set(binding_set())
+    values = frame.to_numpy("value")
+    assert values.dtype == np.float64
+    assert values[0] == 1.5 and np.isnan(values[1]) and values[2] == 3.0
+    ts = datetime(2024, 1, 1, 12, tzinfo=timezone.utc)
+    times = BindingSetFrame.from_columns(ts=[ts, None]).to_numpy("ts")
+    assert times[0] == np.datetime64("2024-01-01T12:00:00", "us")
+    assert np.isnat(times[1])
+
+
+def test_objects_and_view():
+    frame = BindingSetFrame.from_binding_set(binding_set(), variables=["ts", "value"])
+    objects = frame.to_objects(TsValue)
+    assert [o.ts for o in objects] == [URIRef("http://example.org/ts/1"), URIRef("http://example.org/ts/2"),
+                                       URIRef("http://example.org/ts/1")]
+    assert objects[1].value is None
+    view = frame.view(TsValue)
+    assert len(view) == 3
+    assert view[2].value.toPython() == 3
+
+
+def test_ask_response_frame():
+    response = KIAskResponse(bindingSet=binding_set(), exchangeInfo=[])
+    frame = response.frame(variables=["ts"])
+    assert frame["ts"] == [TS_1, TS_2, TS_1]
+
+
+def test_frame_as_post_bindings():
+    graph_pattern = GraphPattern(name="ts-value", pattern=["?ts <http://example.org/hasValue> ?value ."])
+    ki = KnowledgeInteraction(ki_name="ts-value", ki_type=KnowledgeInteractionType.POST, graph_pattern=graph_pattern)
+    frame = BindingSetFrame.from_columns(ts=[URIRef("http://example.org/ts/1"), URIRef("http://example.org/ts/2")],
+                                         value=[1.5, None])
+    body = json.loads(prepare_ke_request(frame, ki=ki, call_ctx="test"))
+    assert body == [{"ts": TS_1, "value": f'"1.5"^^<{XSD}double>'}, {"ts": TS_2, "value": _NIL_N3}]
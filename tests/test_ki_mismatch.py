@@ -0,0 +1,82 @@
+from typing import Optional
+
+import pytest
+from rdflib import URIRef, Literal
+
+from ke_client import BindingsBase, BindingsMismatchCheck, BindingSetFrame
+from ke_client.ki_model import GraphPattern, KnowledgeInteraction, KnowledgeInteractionType
+
+TS_1 = "<http://example.org/ts/1>"
+TS_2 = "<http://example.org/ts/2>"
+
+
+class TsValue(BindingsBase):
+    ts: URIRef
+    value: Optional[Literal] = None
+
+
+def inputs():
+    return [{"ts": TS_1}, {"ts": TS_2}]
+
+
+@pytest.mark.parametrize("mode", ["full", "sampled"])
+def test_matching_outputs(mode):
+    check = BindingsMismatchCheck(mode=mode)
+    check.check("ki", inputs(), [{"ts": TS_1, "value": '"1"'}, {"ts": TS_2, "value": '"2"'}])
+    # rdflib nodes are compared by N3
+    check.check("ki", inputs(), [TsValue(ts=URIRef("http://example.org/ts/2"), value=Literal("2"))])
+    check.check("ki", [TsValue(ts=URIRef("http://example.org/ts/1"))], [{"ts": TS_1, "value": '"1"'}])
+    assert check.stats() == {"mode": mode, "checks": 3, "verified_bindings": 4, "mismatches": 0}
+
+
+def test_mismatched_outputs():
+    check = BindingsMismatchCheck()
+    with pytest.raises(Exception, match="<http://example.org/ts/3>"):
+        check.check("ki", inputs(), [{"ts": TS_1}, {"ts": "<http://example.org/ts/3>"}])
+    with pytest.raises(Exception, match="ts:"):
+        check.check("ki", inputs(), [TsValue(ts=URIRef("http://example.org/ts/3"))])
+    assert check.stats()["mismatches"] == 2
+
+
+def test_frame_outputs():
+    check = BindingsMismatchCheck()
+    check.check("ki", inputs(), BindingSetFrame.from_binding_set([{"ts": TS_2}, {"value": '"1"'}]))
+    with pytest.raises(Exception):
+        check.check("ki", inputs(), BindingSetFrame.from_binding_set([{"ts": "<http://example.org/ts/3>"}]))
+
+
+def test_off_and_empty_bindings():
+    check = BindingsMismatchCheck(mode="off")
+    check.check("ki", inputs(), [{"ts": "<http://example.org/ts/3>"}])
+    assert check.stats()["checks"] == 0
+    check = BindingsMismatchCheck()
+    check.check("ki", [], [{"ts": "<http://example.org/ts/3>"}])
+    check.check("ki", inputs(), None)
+    assert check.stats()["checks"] == 0
+
+
+def test_sampled_mode_verifies_evenly_spaced_outputs():
+    check = BindingsMismatchCheck(mode="sampled", sample_size=10)
+    outputs = [{"ts": TS_1} for _ in range(100)]
+    check.check("ki", inputs(), outputs)
+    assert check.stats()["verified_bindings"] == 10
+    # mismatch outside of the sample isn't detected
+    outputs[1] = {"ts": "<http://example.org/ts/3>"}
+    check.check("ki", inputs(), outputs)
+    outputs[10] = {"ts": "<http://example.org/ts/3>"}
+    with pytest.raises(Exception):
+        check.check("ki", inputs(), outputs)
+
+
+@pytest.mark.parametrize("kwargs", [{"mode": "partial"}, {"sample_size": 0}])
+def test_invalid_settings(kwargs):
+    with pytest.raises(ValueError):
+        BindingsMismatchCheck(**kwargs)
+
+
+def test_ki_mismatch_check_mode():
+    graph_pattern = GraphPattern(name="ts", pattern=["?ts <http://example.org/hasValue> ?value ."])
+    ki = KnowledgeInteraction(ki_name="ts", ki_type=KnowledgeInteractionType.ANSWER, graph_pattern=graph_pattern,
+                              mismatch_check="off")
+    assert ki.mismatch_checker.mode == "off"
+    assert ki.mismatch_checker is ki.mismatch_checker
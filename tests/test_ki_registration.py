@@ -0,0 +1,100 @@
+from threading import Lock
+
+import orjson
+import pytest
+
+from ke_client import KEClient
+from ke_client.client._transport import KETransport, KEResponse
+from ke_client.ki_model import GraphPattern, KnowledgeInteraction, KnowledgeInteractionType
+
+ENDPOINT = "http://ke.example.org/rest/"
+KB_ID = "http://a.example.org"
+
+
+class RegistryTransport(KETransport):
+    """
+    records the registration calls, `GET sc/ki` lists `registered`
+    """
+
+    def __init__(self, registered, fail_registration: bool = False):
+        self.registered = registered
+        self.fail_registration = fail_registration
+        self.deleted = []
+        self.posted = []
+        self._lock = Lock()
+
+    def request(self, method, url, headers=None, json=None, timeout=None, verify=True, long_poll=False,
+                content=None):
+        if method == "GET":
+            return KEResponse(200, orjson.dumps(self.registered), url)
+        with self._lock:
+            if method == "DELETE":
+                self.deleted.append(headers["Knowledge-Interaction-Id"])
+                return KEResponse(200, b"", url)
+            self.posted.append(json["knowledgeInteractionName"])
+        if self.fail_registration:
+            return KEResponse(500, orjson.dumps({"message": "failed"}), url)
+        ki_id = f"{KB_ID}/new/{json['knowledgeInteractionName']}"
+        return KEResponse(200, orjson.dumps({"knowledgeInteractionId": ki_id}), url)
+
+
+def ask_ki(name: str, pattern: str = "?ts <http://example.org/hasValue> ?value .") -> KnowledgeInteraction:
+    return KnowledgeInteraction(ki_name=name, ki_type=KnowledgeInteractionType.ASK,
+                                graph_pattern=GraphPattern(name=name, pattern=[pattern]))
+
+
+def client(transport: RegistryTransport, *kis: KnowledgeInteraction) -> KEClient:
+    c = KEClient(kb_id=KB_ID, kb_name="a", kb_description="", ke_rest_endpoint=ENDPOINT, transport=transport,
+                 registration_workers=2)
+    c._is_registered = True
+    for ki in kis:
+        c._client_ki[ki.ki_name] = ki
+    return c
+
+
+def registered(c: KEClient, ki: KnowledgeInteraction, ki_id: str, **changes):
+    body = c._ki_registration_body_(ki)
+    body.update(changes)
+    return {**body, "knowledgeInteractionId": ki_id}
+
+
+def test_reconcile_keeps_unchanged_ki():
+    unchanged, changed, new = ask_ki("unchanged"), ask_ki("changed"), ask_ki("new")
+    transport = RegistryTransport([])
+    c = client(transport, unchanged, changed, new)
+    transport.registered = [
+        # whitespace differences are ignored
+        registered(c, unchanged, "ki-1", graphPattern="?ts  <http://example.org/hasValue>\n?value ."),
+        registered(c, unchanged, "ki-dup"),
+        registered(c, changed, "ki-2", graphPattern="?ts <http://example.org/hasOther> ?value ."),
+        registered(c, ask_ki("removed"), "ki-3"),
+    ]
+    c._reconcile_registered_ki_()
+    assert sorted(transport.deleted) == ["ki-2", "ki-3", "ki-dup"]
+    assert sorted(transport.posted) == ["changed", "new"]
+    assert unchanged.ki_id == "ki-1"
+    assert changed.ki_id == f"{KB_ID}/new/changed"
+    assert set(c._registered_ki_) == {"ki-1", f"{KB_ID}/new/changed", f"{KB_ID}/new/new"}
+
+
+def test_reconcile_changed_prefixes():
+    ki = ask_ki("ki")
+    transport = RegistryTransport([])
+    c = client(transport, ki)
+    transport.registered = [registered(c, ki, "ki-1", prefixes={"ex": "http://example.org/"})]
+    c._reconcile_registered_ki_()
+    assert transport.deleted == ["ki-1"]
+    assert transport.posted == ["ki"]
+
+
+def test_failed_registration_is_repeated_from_scratch():
+    transport = RegistryTransport([], fail_registration=True)
+    c = client(transport, ask_ki("new"))
+    with pytest.raises(Exception, match="Registration failed"):
+        c._reconcile_registered_ki_()
+    assert c._registered_ki_ is None
+
+
+def test_invalid_registration_workers():
+    with pytest.raises(ValueError):
+        KEClient(kb_id=KB_ID, kb_name="a", kb_description="", ke_rest_endpoint=ENDPOINT, registration_workers=0)
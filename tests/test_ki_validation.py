@@ -0,0 +1,64 @@
+from typing import Optional
+
+import pytest
+from rdflib import URIRef
+
+from ke_client import BindingsBase, KIError, KIValidationPlan
+from ke_client.ki_model import GraphPattern, KnowledgeInteractionType
+
+
+class RequiredTs(BindingsBase):
+    ts: URIRef
+    value: Optional[URIRef] = None
+
+
+class OptionalTs(BindingsBase):
+    # required field which accepts None
+    ts: Optional[URIRef]
+    value: Optional[URIRef] = None
+
+
+class UnionTs(BindingsBase):
+    ts: URIRef | None
+    value: Optional[URIRef] = None
+
+
+def ask_plan() -> KIValidationPlan:
+    graph_pattern = GraphPattern(name="ts-value", pattern=["?ts <http://example.org/hasValue> ?value ."],
+                                 required_bindings=["ts"])
+    return KIValidationPlan(graph_pattern=graph_pattern, ki_type=KnowledgeInteractionType.ASK, trusted=True)
+
+
+def test_trusted_ask_class_with_required_field():
+    plan = ask_plan()
+    assert plan.matches_class(RequiredTs)
+    assert plan.is_trusted([RequiredTs(ts=URIRef("http://example.org/ts/1"))])
+
+
+@pytest.mark.parametrize("binding_cls", [OptionalTs, UnionTs])
+def test_trusted_ask_class_with_optional_field(binding_cls):
+    plan = ask_plan()
+    assert not plan.matches_class(binding_cls)
+    with pytest.raises(KIError):
+        plan.verify([binding_cls(ts=None)], call_ctx="test")
+    plan.verify([binding_cls(ts=URIRef("http://example.org/ts/1"))], call_ctx="test")
+
+
+def test_trusted_requires_single_class():
+    plan = ask_plan()
+    trusted = RequiredTs(ts=URIRef("http://example.org/ts/1"))
+    assert not plan.is_trusted([trusted, {"value": "<http://example.org/v>"}])
+    assert not plan.is_trusted([trusted, OptionalTs(ts=None)])
+    with pytest.raises(KIError):
+        plan.verify([trusted, {"value": "<http://example.org/v>"}], call_ctx="test")
+    with pytest.raises(KIError):
+        plan.verify([trusted, OptionalTs(ts=None)], call_ctx="test")
+
+
+def test_trusted_post_mixed_bindings_verified():
+    graph_pattern = GraphPattern(name="ts-value", pattern=["?ts <http://example.org/hasValue> ?value ."])
+    plan = KIValidationPlan(graph_pattern=graph_pattern, ki_type=KnowledgeInteractionType.POST, trusted=True)
+    trusted = RequiredTs(ts=URIRef("http://example.org/ts/1"))
+    assert plan.is_trusted([trusted, trusted])
+    with pytest.raises(KIError):
+        plan.verify([trusted, {"ts": "<http://example.org/ts/2>", "other": '"1"'}], call_ctx="test")
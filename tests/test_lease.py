@@ -0,0 +1,37 @@
+import pytest
+from pydantic import ValidationError
+
+from ke_client import KELeaseRenewer
+from ke_client.client._ke_properties import KESettings
+
+
+def renewer(lease_time: float) -> KELeaseRenewer:
+    return KELeaseRenewer(renew=lambda: None, lease_time=lease_time, on_lost=lambda reason: None)
+
+
+@pytest.mark.parametrize("lease_time", [29, 3601, 0])
+def test_lease_time_out_of_range(lease_time):
+    with pytest.raises(ValueError):
+        renewer(lease_time)
+
+
+@pytest.mark.parametrize("lease_time", [30, 3600])
+def test_lease_time_range_bounds(lease_time):
+    assert renewer(lease_time).lease_time == lease_time
+
+
+def test_lease_renewal_time_setting_range():
+    with pytest.raises(ValidationError):
+        KESettings(knowledge_base_id="http://a.example.org", lease_renewal_time=10)
+
+
+def test_stop_ends_renewal_thread():
+    r = renewer(30)
+    r.start()
+    assert r.is_running
+    r.stop()
+    assert not r.is_running
+    # restart after stop
+    r.start()
+    assert r.is_running
+    r.stop(wait=False)
@@ -0,0 +1,67 @@
+import pytest
+from rdflib import BNode, Literal, URIRef, XSD
+from rdflib.util import from_n3
+
+from ke_client import format_n3, parse_n3, rdf_nil
+
+N3_VALUES = [
+    "<http://example.org/ts/1>",
+    '"plain"',
+    '""',
+    '"42"^^<http://www.w3.org/2001/XMLSchema#integer>',
+    '"2024-01-01T00:00:00Z"^^<http://www.w3.org/2001/XMLSchema#dateTime>',
+    '"hallo"@nl',
+    '"with \\"quotes\\""',
+    '"line\\nbreak"@en',
+    '"""multi\nline"""',
+    '"back\\\\slash"^^<http://www.w3.org/2001/XMLSchema#string>',
+    "42",
+    "true",
+]
+
+
+@pytest.mark.parametrize("value", N3_VALUES)
+def test_parse_matches_rdflib(value):
+    node, expected = parse_n3(value), from_n3(value)
+    assert type(node) is type(expected)
+    assert node == expected
+    if isinstance(expected, Literal):
+        assert (node.datatype, node.language) == (expected.datatype, expected.language)
+
+
+def test_parse_rdf_nil():
+    assert parse_n3("rdf:nil") == rdf_nil
+
+
+NODES = [
+    URIRef("http://example.org/ts/1"),
+    Literal("plain"),
+    Literal(""),
+    Literal(42),
+    Literal(1.5),
+    Literal(True),
+    Literal("2024-01-01", datatype=XSD.date),
+    Literal("hallo", lang="nl"),
+    Literal('with "quotes"'),
+    Literal("line\nbreak", lang="en"),
+    Literal("back\\slash"),
+    BNode("b1"),
+]
+
+
+@pytest.mark.parametrize("node", NODES, ids=repr)
+def test_format_matches_rdflib(node):
+    assert format_n3(node) == node.n3()
+
+
+def test_format_invalid_iri_like_rdflib():
+    node = URIRef("http://example.org/a b")
+    with pytest.raises(Exception) as expected:
+        node.n3()
+    with pytest.raises(type(expected.value)):
+        format_n3(node)
+
+
+@pytest.mark.parametrize("node", [n for n in NODES if not isinstance(n, BNode)], ids=repr)
+def test_round_trip(node):
+    assert parse_n3(format_n3(node)) == node
@@ -0,0 +1,67 @@
+import json
+
+import pytest
+
+from ke_client import KIBatchResult, KIChunkedPostResponse, PostChunking
+from ke_client.client._post_chunks import merge_chunk_results
+from ke_client.ki_model import GraphPattern, KIPostResponse, KnowledgeInteraction, KnowledgeInteractionType
+
+
+def post_ki() -> KnowledgeInteraction:
+    graph_pattern = GraphPattern(name="ts-value", pattern=["?ts <http://example.org/hasValue> ?value ."])
+    return KnowledgeInteraction(ki_name="ts-value", ki_type=KnowledgeInteractionType.POST,
+                                graph_pattern=graph_pattern)
+
+
+def bindings(n: int):
+    return [{"ts": f"<http://example.org/ts/{i}>", "value": f'"{i}"'} for i in range(n)]
+
+
+def binding_sets(bodies):
+    return [json.loads(body) for body in bodies]
+
+
+def test_split_by_bindings():
+    bodies = PostChunking(max_bindings=4).prepare(bindings(10), ki=post_ki(), call_ctx="test")
+    chunks = binding_sets(bodies)
+    assert [len(chunk) for chunk in chunks] == [4, 4, 2]
+    assert [b for chunk in chunks for b in chunk] == bindings(10)
+
+
+def test_split_by_bytes():
+    max_bytes = 400
+    bodies = PostChunking(max_bytes=max_bytes).prepare(bindings(50), ki=post_ki(), call_ctx="test")
+    assert len(bodies) > 1
+    assert all(len(body) <= max_bytes for body in bodies)
+    assert [b for chunk in binding_sets(bodies) for b in chunk] == bindings(50)
+
+
+def test_no_split():
+    bodies = PostChunking(max_bindings=100, max_bytes=100000).prepare(bindings(10), ki=post_ki(), call_ctx="test")
+    assert len(bodies) == 1
+
+
+def chunk_response(values):
+    return KIPostResponse(resultBindingSet=[{"value": v} for v in values], exchangeInfo=[])
+
+
+def test_merge_and_serialize():
+    error = ConnectionError("chunk failed")
+    results = [KIBatchResult(0, response=chunk_response(["1", "2"])), KIBatchResult(1, error=error),
+               KIBatchResult(2, response=chunk_response(["3"]))]
+    merged = merge_chunk_results(results, ki_name="ts-value")
+    assert isinstance(merged, KIChunkedPostResponse)
+    assert [b["value"] for b in merged.result_binding_set] == ["1", "2", "3"]
+    assert not merged.ok
+    assert [chunk.index for chunk in merged.failed_chunks] == [1]
+    with pytest.raises(ConnectionError):
+        merged.raise_for_errors()
+    # chunk results aren't serialized
+    dumped = json.loads(merged.model_dump_json())
+    assert dumped == {"resultBindingSet": [{"value": "1"}, {"value": "2"}, {"value": "3"}], "exchangeInfo": []}
+    assert "chunks" not in merged.model_dump()
+
+
+def test_merge_all_failed():
+    with pytest.raises(ConnectionError):
+        merge_chunk_results([KIBatchResult(0, error=ConnectionError("down"))], ki_name="ts-value")
@@ -0,0 +1,76 @@
+import orjson
+import pytest
+
+from ke_client import KEClient
+from ke_client.client._transport import KEResponse
+from ke_client.ki_model import KIAskResponse, KIHandleRequest, KIPostResponse
+
+ENDPOINT = "http://ke.example.org/rest/"
+
+
+def ke_client() -> KEClient:
+    return KEClient(kb_id="http://a.example.org", kb_name="a", kb_description="", ke_rest_endpoint=ENDPOINT)
+
+
+def exchange(status: str, kb_id: str = "http://b.example.org", **kwargs):
+    return {"knowledgeBaseId": kb_id, "knowledgeInteractionId": f"{kb_id}/ki", "exchangeStart": "2024-01-01T00:00:00Z",
+            "status": status, **kwargs}
+
+
+def response(body, status_code: int = 200, url: str = f"{ENDPOINT}sc/ask") -> KEResponse:
+    return KEResponse(status_code=status_code, content=orjson.dumps(body), url=url)
+
+
+class NoJsonResponse(KEResponse):
+    def json(self):
+        raise AssertionError("body must be decoded by the client, not by the response")
+
+
+def test_response_model_is_validated_from_raw_body():
+    body = {"bindingSet": [{"ts": "<http://example.org/ts/1>"}], "exchangeInfo": [exchange("SUCCEEDED")]}
+    parsed = ke_client()._assert_response_(
+        NoJsonResponse(status_code=200, content=orjson.dumps(body), url=f"{ENDPOINT}sc/ask"),
+        ki_name="ask", response_model=KIAskResponse)
+    assert isinstance(parsed, KIAskResponse)
+    assert parsed.binding_set == [{"ts": "<http://example.org/ts/1>"}]
+    assert parsed.exchangeInfo[0].exchange_status is parsed.exchangeInfo[0].exchange_status
+
+
+def test_response_without_model_returns_parsed_body():
+    body = [{"knowledgeInteractionId": "http://a.example.org/ki"}]
+    assert ke_client()._assert_response_(response(body), ki_name="register") == body
+
+
+def test_failed_exchanges():
+    client = ke_client()
+    body = {"resultBindingSet": [], "exchangeInfo": [exchange("SUCCEEDED"),
+                                                     exchange("FAILED", kb_id="http://c.example.org",
+                                                              failedMessage="timeout")]}
+    with pytest.raises(Exception, match="timeout"):
+        client._assert_response_(response(body), ki_name="post", response_model=KIPostResponse)
+    # partial KI: failed exchanges are logged
+    client._partial_ki = True
+    parsed = client._assert_response_(response(body), ki_name="post", response_model=KIPostResponse)
+    assert len(parsed.exchangeInfo) == 2
+    # all exchanges failed
+    body["exchangeInfo"] = body["exchangeInfo"][1:]
+    with pytest.raises(Exception, match="all exchanges"):
+        client._assert_response_(response(body), ki_name="post", response_model=KIPostResponse)
+    # exchange info checked without model
+    with pytest.raises(Exception, match="all exchanges"):
+        client._assert_response_(response(body), ki_name="post")
+
+
+def test_error_response():
+    with pytest.raises(AssertionError):
+        ke_client()._assert_response_(response({"message": "bad request"}, status_code=400), ki_name="ask",
+                                      response_model=KIAskResponse)
+
+
+def test_parse_handle_request():
+    body = {"knowledgeInteractionId": "http://a.example.org/ki", "handleRequestId": 3,
+            "bindingSet": [{"ts": "<http://example.org/ts/1>"}], "requestingKnowledgeBaseId": "http://b.example.org"}
+    handle_request = KEClient._parse_handle_request_(response(body, url=f"{ENDPOINT}sc/handle"))
+    assert isinstance(handle_request, KIHandleRequest)
+    assert handle_request.handleRequestId == 3
+    assert handle_request.bindingSet == body["bindingSet"]
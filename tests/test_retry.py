@@ -0,0 +1,72 @@
+import asyncio
+
+import pytest
+
+from ke_client import CircuitBreaker, CircuitOpenError, RetryPolicy
+
+
+def open_breaker() -> CircuitBreaker:
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.0)
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    return breaker
+
+
+def test_probe_success_closes_circuit():
+    breaker = open_breaker()
+    assert RetryPolicy(max_attempts=1).run(lambda: "ok", retry_on=(ConnectionError,), breaker=breaker) == "ok"
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_probe_non_retryable_error_reopens_circuit():
+    breaker = open_breaker()
+
+    def read_timeout():
+        raise TimeoutError("read timeout")
+
+    with pytest.raises(TimeoutError):
+        RetryPolicy(max_attempts=3).run(read_timeout, retry_on=(ConnectionError,), breaker=breaker)
+    assert breaker.state == CircuitBreaker.OPEN
+    # next probe is let through and resolves the circuit
+    assert RetryPolicy(max_attempts=1).run(lambda: "ok", retry_on=(ConnectionError,), breaker=breaker) == "ok"
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_probe_cancelled_reopens_circuit():
+    breaker = open_breaker()
+
+    async def cancelled():
+        raise asyncio.CancelledError()
+
+    async def ok():
+        return "ok"
+
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(RetryPolicy().run_async(cancelled, retry_on=(ConnectionError,), breaker=breaker))
+    assert breaker.state == CircuitBreaker.OPEN
+    assert asyncio.run(RetryPolicy().run_async(ok, retry_on=(ConnectionError,), breaker=breaker)) == "ok"
+
+
+def test_single_probe_while_half_open():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.0)
+    breaker.record_failure()
+    assert breaker.before_call() is True
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    breaker.abort_probe()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.before_call() is True
+
+
+def test_retry_budget():
+    calls = []
+
+    def unreachable():
+        calls.append(1)
+        raise ConnectionError("unreachable")
+
+    policy = RetryPolicy(max_attempts=3, base_delay=0.0, jitter=0.0)
+    with pytest.raises(ConnectionError):
+        policy.run(unreachable, retry_on=(ConnectionError,))
+    assert len(calls) == 3
+    assert policy.stats()["retries"] == 2
@@ -0,0 +1,100 @@
+import pytest
+from pydantic import Field, ValidationError
+
+from ke_client import SplitURIBase, SplitURIRouter, ki_split_uri
+from ke_client.client._split_uri import UriTemplate
+
+
+@ki_split_uri("m(x)/${a}/${b}")
+class GroupedURI(SplitURIBase):
+    a: str
+    b: int
+
+
+@ki_split_uri("device/${device_id}")
+class DeviceURI(SplitURIBase):
+    device_id: str
+
+
+@ki_split_uri("device/${device_id}/meter/${meter}", cache_size=8)
+class MeterURI(SplitURIBase):
+    device_id: str
+    meter: int
+
+
+class UndecoratedURI(SplitURIBase):
+    pass
+
+
+def test_template_with_literal_parentheses():
+    obj = GroupedURI.parse("mx/foo/3")
+    assert (obj.a, obj.b) == ("foo", 3)
+
+
+def test_template_fields_by_group_name():
+    template = UriTemplate("(p|q)/${b}/(r)/${a}", t=GroupedURI)
+    obj = template.parse("q/7/r/bar")
+    assert (obj.a, obj.b) == ("bar", 7)
+
+
+def test_parse_build_round_trip():
+    uris = ["http://a.example.org/device/d1/meter/1", "http://a.example.org/device/d2/meter/2"]
+    objs = MeterURI.parse_many(uris, prefix="http://a.example.org")
+    assert [(o.device_id, o.meter) for o in objs] == [("d1", 1), ("d2", 2)]
+    assert MeterURI.build_many(objs) == uris
+
+
+def test_undecorated_class():
+    with pytest.raises(NotImplementedError):
+        UndecoratedURI.parse_many(["x"])
+    with pytest.raises(NotImplementedError):
+        UndecoratedURI.build_many([])
+
+
+def test_router_dispatch():
+    router = SplitURIRouter([DeviceURI, MeterURI, GroupedURI])
+    prefix = "http://a.example.org"
+    routed = router.route_many([f"{prefix}/device/d1", f"{prefix}/device/d1/meter/4", f"{prefix}/mx/foo/3"],
+                               prefix=prefix)
+    assert [type(o) for o in routed] == [DeviceURI, MeterURI, GroupedURI]
+    assert (routed[1].device_id, routed[1].meter) == ("d1", 4)
+    assert (routed[2].a, routed[2].b) == ("foo", 3)
+    assert router.resolve(f"{prefix}/device/d1/meter/4", prefix=prefix) is MeterURI
+
+
+def test_router_unmatched():
+    router = SplitURIRouter([DeviceURI])
+    assert router.resolve("other/d1") is None
+    with pytest.raises(ValueError):
+        router.route("device/d1/extra")
+    assert router.route_many(["device/d1", "other"], skip_unmatched=True)[1] is None
+
+
+@ki_split_uri("lower/${a}")
+class LowerURI(SplitURIBase):
+    a: str
+
+    def __init__(self, a: str, prefix=None, **kwargs):
+        super().__init__(a=a.lower(), prefix=prefix, **kwargs)
+
+
+@ki_split_uri("short/${a}")
+class ConstrainedURI(SplitURIBase):
+    a: str = Field(max_length=3)
+
+
+def test_init_override_is_called():
+    assert LowerURI.parse("http://y/lower/ABC", prefix="http://y").a == "abc"
+    assert LowerURI.parse_many(["lower/XY"])[0].a == "xy"
+
+
+def test_field_constraints_validated():
+    assert ConstrainedURI.parse("short/abc").a == "abc"
+    with pytest.raises(ValidationError):
+        ConstrainedURI.parse("short/abcd")
+
+
+def test_plain_class_constructed_without_validation():
+    assert MeterURI.__uri_template_parser__._construct_
+    assert not LowerURI.__uri_template_parser__._construct_
+    assert not ConstrainedURI.__uri_template_parser__._construct_
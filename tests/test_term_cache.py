@@ -0,0 +1,65 @@
+import threading
+
+from rdflib import Literal, URIRef
+
+from ke_client import N3TermCache
+from ke_client.client import _term_cache
+
+
+def test_cached_terms_shared():
+    cache = N3TermCache(maxsize=4)
+    a = cache.term("<http://example.org/a>")
+    assert a == URIRef("http://example.org/a")
+    assert cache.term("<http://example.org/a>") is a
+    assert cache.uri_ref("http://example.org/a") is a
+    assert cache.term('"5"^^<http://www.w3.org/2001/XMLSchema#integer>') == Literal(5)
+    stats = cache.stats()
+    assert (stats["size"], stats["hits"], stats["misses"]) == (2, 2, 2)
+
+
+def test_lru_eviction():
+    cache = N3TermCache(maxsize=2)
+    a = cache.term("<http://example.org/a>")
+    cache.term("<http://example.org/b>")
+    # a is the most recently used, b is evicted
+    cache.term("<http://example.org/a>")
+    cache.term("<http://example.org/c>")
+    assert cache.stats()["evictions"] == 1
+    assert list(cache._terms_) == ["<http://example.org/a>", "<http://example.org/c>"]
+    assert cache.term("<http://example.org/a>") is a
+    assert cache.stats()["misses"] == 3
+    cache.term("<http://example.org/b>")
+    assert cache.stats()["misses"] == 4
+
+
+def test_cache_disabled():
+    cache = N3TermCache(maxsize=0)
+    a = cache.term("<http://example.org/a>")
+    b = cache.term("<http://example.org/a>")
+    assert a == b and a is not b
+    stats = cache.stats()
+    assert (stats["size"], stats["hits"], stats["misses"]) == (0, 0, 0)
+
+
+def test_term_cache_size_setting(monkeypatch):
+    import ke_client
+    monkeypatch.setattr(_term_cache, "_term_cache", None)
+    monkeypatch.setattr(ke_client.ke_settings, "term_cache_size", 0)
+    assert _term_cache.get_term_cache().maxsize == 0
+
+
+def test_get_term_cache_single_instance(monkeypatch):
+    monkeypatch.setattr(_term_cache, "_term_cache", None)
+    barrier = threading.Barrier(8)
+    caches = []
+
+    def get():
+        barrier.wait()
+        caches.append(_term_cache.get_term_cache())
+
+    threads = [threading.Thread(target=get) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(caches) == 8 and all(c is caches[0] for c in caches)
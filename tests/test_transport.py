@@ -0,0 +1,56 @@
+import threading
+
+import pytest
+
+from ke_client import HttpxTransport, RequestsTransport, Urllib3Transport, build_transport
+from ke_client.client._http_pool import KEHttpPool, get_http_pool
+
+
+def closed_pools(monkeypatch):
+    closed = []
+    monkeypatch.setattr(KEHttpPool, "close", lambda self: closed.append(self))
+    return closed
+
+
+def test_requests_transport_keeps_shared_pool_open(monkeypatch):
+    closed = closed_pools(monkeypatch)
+    shared = RequestsTransport()
+    assert shared.http_pool is get_http_pool()
+    shared.close()
+    passed = RequestsTransport(http_pool=KEHttpPool())
+    passed.close()
+    assert closed == []
+
+
+def test_requests_transport_closes_own_pool(monkeypatch):
+    closed = closed_pools(monkeypatch)
+    transport = build_transport("requests", pool_size=3, handle_pool_size=1)
+    assert transport.http_pool is not get_http_pool()
+    assert transport.http_pool.pool_size == 3
+    transport.close()
+    assert closed == [transport.http_pool]
+
+
+@pytest.mark.parametrize("pool_size, handle_pool_size", [(0, 2), (10, 0)])
+def test_urllib3_invalid_pool_size(pool_size, handle_pool_size):
+    with pytest.raises(ValueError):
+        Urllib3Transport(pool_size=pool_size, handle_pool_size=handle_pool_size)
+
+
+def test_httpx_request_counter_concurrent():
+    httpx = pytest.importorskip("httpx")
+    transport = HttpxTransport()
+    transport._clients_[(False, True)] = httpx.Client(transport=httpx.MockTransport(lambda r: httpx.Response(200)))
+    threads, requests_per_thread = 8, 200
+
+    def send():
+        for _ in range(requests_per_thread):
+            assert transport.request("GET", "http://ke.example.org/rest/sc").status_code == 200
+
+    workers = [threading.Thread(target=send) for _ in range(threads)]
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    assert transport.stats()["requests"] == threads * requests_per_thread
+    transport.close()
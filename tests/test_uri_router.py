@@ -0,0 +1,119 @@
+import threading
+
+import pytest
+
+from ke_client import SplitURIBase, SplitURIRouter, ki_split_uri
+from ke_client.client import _uri_router
+
+
+@ki_split_uri("data/${kind}/${value}")
+class DataURI(SplitURIBase):
+    kind: str
+    value: str
+
+
+@ki_split_uri("data/meter/${value}")
+class MeterDataURI(SplitURIBase):
+    value: int
+
+
+@ki_split_uri("dev/${device_id}/${part}")
+class DevicePartURI(SplitURIBase):
+    device_id: str
+    part: str
+
+
+@ki_split_uri("dev/${device_id}/status")
+class DeviceStatusURI(SplitURIBase):
+    device_id: str
+
+
+@ki_split_uri("device/${device_id}")
+class DeviceURI(SplitURIBase):
+    device_id: str
+
+
+def test_longest_head_wins():
+    router = SplitURIRouter([DataURI, MeterDataURI])
+    meter = router.route("data/meter/5")
+    assert type(meter) is MeterDataURI and meter.value == 5
+    other = router.route("data/price/5")
+    assert type(other) is DataURI and (other.kind, other.value) == ("price", "5")
+
+
+def test_most_literal_template_wins():
+    # same head, registration order doesn't matter
+    for classes in ([DevicePartURI, DeviceStatusURI], [DeviceStatusURI, DevicePartURI]):
+        router = SplitURIRouter(classes)
+        assert router.resolve("dev/d1/status") is DeviceStatusURI
+        assert router.resolve("dev/d1/battery") is DevicePartURI
+
+
+def test_route_requires_full_match():
+    router = SplitURIRouter([DeviceURI])
+    # parse matches the template at the start of the uri, the router the whole uri
+    assert DeviceURI.parse("device/d1/extra").device_id == "d1"
+    assert router.resolve("device/d1/extra") is None
+    with pytest.raises(ValueError):
+        router.route("device/d1/extra")
+    assert router.route("http://a.example.org/device/d1", prefix="http://a.example.org").device_id == "d1"
+
+
+def test_register_again():
+    router = SplitURIRouter([DeviceURI, DataURI])
+    router.register(DeviceURI)
+    assert router.classes == [DataURI, DeviceURI]
+    router.unregister(DataURI)
+    assert router.resolve("data/price/5") is None
+
+
+def test_register_redecorated_class():
+    @ki_split_uri("v1/${item}")
+    class ItemURI(SplitURIBase):
+        item: str
+
+    router = SplitURIRouter([ItemURI])
+    assert router.resolve("v1/a") is ItemURI
+    ki_split_uri("v2/${item}")(ItemURI)
+    router.register(ItemURI)
+    assert router.classes == [ItemURI]
+    assert router.resolve("v1/a") is None
+    assert router.route("v2/a").item == "a"
+
+
+def test_register_undecorated_class():
+    class PlainURI(SplitURIBase):
+        pass
+
+    with pytest.raises(Exception):
+        SplitURIRouter().register(PlainURI)
+
+
+def test_route_many_skip_unmatched():
+    router = SplitURIRouter([DeviceURI, MeterDataURI])
+    routed = router.route_many(["device/d1", "unknown/x", "data/meter/3", "device/d1/extra"], skip_unmatched=True)
+    assert [type(o) if o is not None else None for o in routed] == [DeviceURI, None, MeterDataURI, None]
+    with pytest.raises(ValueError):
+        router.route_many(["device/d1", "unknown/x"])
+
+
+def test_decorated_classes_registered_in_global_router():
+    router = _uri_router.get_split_uri_router()
+    assert {DataURI, MeterDataURI, DeviceURI}.issubset(router.classes)
+
+
+def test_global_router_single_instance(monkeypatch):
+    monkeypatch.setattr(_uri_router, "_split_uri_router", None)
+    barrier = threading.Barrier(8)
+    routers = []
+
+    def get():
+        barrier.wait()
+        routers.append(_uri_router.get_split_uri_router())
+
+    threads = [threading.Thread(target=get) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(routers) == 8 and all(r is routers[0] for r in routers)